@@ -0,0 +1,234 @@
+from abc import ABC
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from fleet import Fleet
+from planet_catalog import PlanetCatalog
+
+Columns = Union[Mapping[str, Any], pd.DataFrame]
+
+PLANET_COLUMNS = ("name", "station_boost_for_thrust_power_launch", "atmosphere_altitude", "distance_from_the_sun", "surface_gravety_g")
+SHIP_COLUMNS = ("name", "mass", "engine_thrust_power")
+
+
+@dataclass(frozen=True)
+class ValidationIssue:
+    column: str
+    message: str
+    rows: np.ndarray
+    """
+    offending row positions in the input, empty when the whole column is at fault
+    """
+
+
+@dataclass
+class ValidationReport:
+    total_rows: int
+    valid: np.ndarray
+    """
+    boolean mask of the input rows that made it into the result
+    """
+    issues: List[ValidationIssue] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.issues
+
+    @property
+    def invalid_rows(self) -> np.ndarray:
+        return np.flatnonzero(~self.valid)
+
+    def add(self, column: str, message: str, bad: np.ndarray) -> None:
+        """
+        Records an issue for the rows where `bad` is True and drops them from `valid`.
+        """
+        rows = np.flatnonzero(bad)
+        if len(rows):
+            self.issues.append(ValidationIssue(column=column, message=message, rows=rows))
+            self.valid &= ~bad
+
+    def add_column_issue(self, column: str, message: str) -> None:
+        self.issues.append(ValidationIssue(column=column, message=message, rows=np.empty(0, dtype=np.intp)))
+        self.valid[:] = False
+
+    def extend(self, other: "ValidationReport") -> None:
+        """
+        Appends the report of the next chunk; its row numbers are shifted past this one's.
+        """
+        for issue in other.issues:
+            rows = issue.rows + self.total_rows if len(issue.rows) else issue.rows
+            self.issues.append(ValidationIssue(column=issue.column, message=issue.message, rows=rows))
+        self.valid = np.concatenate((self.valid, other.valid))
+        self.total_rows += other.total_rows
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        One line per (row, column, message); row is -1 for column-level issues.
+        """
+        frames = [
+            pd.DataFrame({"row": issue.rows if len(issue.rows) else [-1], "column": issue.column, "message": issue.message})
+            for issue in self.issues
+        ]
+        if not frames:
+            return pd.DataFrame(columns=["row", "column", "message"])
+        return pd.concat(frames, ignore_index=True)
+
+    def __str__(self) -> str:
+        lines = [f"{int(self.valid.sum())}/{self.total_rows} rows valid"]
+        for issue in self.issues:
+            where = f"{len(issue.rows)} rows, first {issue.rows[:5].tolist()}" if len(issue.rows) else "whole column"
+            lines.append(f"  {issue.column}: {issue.message} ({where})")
+        return "\n".join(lines)
+
+
+class BulkConstructor(ABC):
+    """_summary_
+    Builds PlanetCatalog and Fleet objects from columns (dict of lists / NumPy arrays or a
+    DataFrame) in a few vectorised passes instead of one validated object per row.
+    Bad rows are dropped and described in a ValidationReport instead of being printed,
+    so a million-row design sweep loads in well under a second.
+    """
+
+    @staticmethod
+    def _column_length(columns: Columns) -> int:
+        if isinstance(columns, pd.DataFrame):
+            return len(columns)
+        return max((len(values) for values in columns.values()), default=0)
+
+    @staticmethod
+    def _names(values: Any, column: str, report: ValidationReport) -> Tuple[np.ndarray, Optional[Dict[str, int]]]:
+        """
+        Returns the names and, when every name is a unique string, the name -> row map.
+        """
+        names = np.asarray(values, dtype=object).ravel()
+        if pd.api.types.infer_dtype(names, skipna=False) == "string":
+            is_string = np.ones(len(names), dtype=bool)
+        else:
+            is_string = np.fromiter((isinstance(name, str) for name in names), dtype=bool, count=len(names))
+            report.add(column, "expected a string", ~is_string)
+        report.add(column, "empty name", is_string & (names == ""))
+        index = dict(zip(names[is_string].tolist(), range(len(names)))) if is_string.all() else None
+        if index is None or len(index) != len(names):
+            report.add(column, "duplicate name", is_string & pd.Series(names).duplicated(keep="first").to_numpy())
+            index = None
+        return names, index
+
+    @staticmethod
+    def _numbers(values: Any, column: str, report: ValidationReport, minimum: float, strict: bool = False) -> np.ndarray:
+        """
+        float64 column; non-numbers, non-finite values and values below `minimum`
+        (or equal to it when `strict`) are reported.
+        """
+        raw = np.asarray(values)
+        is_number = np.ones(raw.shape, dtype=bool)
+        if raw.dtype.kind in "fiu":
+            numbers = raw.astype(np.float64, copy=False)
+        else:
+            # same rule as validator_decorators.is_float: int or float, not bool or str
+            is_number = np.fromiter(
+                (isinstance(value, (int, float, np.integer, np.floating)) and not isinstance(value, (bool, np.bool_)) for value in raw.ravel()),
+                dtype=bool,
+                count=raw.size,
+            ).reshape(raw.shape)
+            report.add(column, "expected a float", ~is_number)
+            numbers = np.where(is_number, pd.to_numeric(pd.Series(raw.ravel()), errors="coerce").to_numpy(dtype=np.float64).reshape(raw.shape), np.nan)
+        finite = np.isfinite(numbers)
+        report.add(column, "not a finite number", ~finite & is_number)
+        below = numbers <= minimum if strict else numbers < minimum
+        report.add(column, f"must be {'>' if strict else '>='} {minimum}", finite & below)
+        return numbers
+
+    @staticmethod
+    def planet_catalog(columns: Columns) -> Tuple[PlanetCatalog, ValidationReport]:
+        """
+        Args:
+            columns: `PLANET_COLUMNS` as lists, arrays or DataFrame columns.
+
+        Returns:
+            Tuple[PlanetCatalog, ValidationReport]: the catalogue of the valid rows, in input order.
+        """
+        n = BulkConstructor._column_length(columns)
+        report = ValidationReport(total_rows=n, valid=np.ones(n, dtype=bool))
+        missing = [column for column in PLANET_COLUMNS if column not in columns]
+        for column in missing:
+            report.add_column_issue(column, "missing column")
+        if missing:
+            return PlanetCatalog._trusted([], [np.empty(0)] * 4), report
+        for column in PLANET_COLUMNS:
+            if len(columns[column]) != n:
+                report.add_column_issue(column, f"has {len(columns[column])} rows, expected {n}")
+        if not report.ok:
+            return PlanetCatalog._trusted([], [np.empty(0)] * 4), report
+
+        names, index = BulkConstructor._names(columns["name"], "name", report)
+        numbers = [BulkConstructor._numbers(columns[column], column, report, minimum=0.0) for column in PLANET_COLUMNS[1:]]
+        keep = report.valid
+        if keep.all():
+            return PlanetCatalog._trusted(names.tolist(), numbers, index=index), report
+        return PlanetCatalog._trusted(names[keep].tolist(), [column[keep] for column in numbers]), report
+
+    @staticmethod
+    def fleet(
+        columns: Columns,
+        planet_names: Optional[Sequence[str]] = None,
+        friction: Optional[np.ndarray] = None,
+    ) -> Tuple[Fleet, ValidationReport]:
+        """
+        Args:
+            columns: `SHIP_COLUMNS`, plus one air friction column per planet name unless
+                `friction` is given.
+            planet_names (Sequence[str]): the bodies the ships fly to, e.g. `PlanetCatalog.names`.
+                Every one needs a friction value; friction columns for other names are reported.
+                Defaults to every column that is not in `SHIP_COLUMNS`.
+            friction (np.ndarray): (ships, planets) matrix ordered like `planet_names`.
+
+        Returns:
+            Tuple[Fleet, ValidationReport]: the fleet of the valid rows, in input order.
+        """
+        n = BulkConstructor._column_length(columns)
+        report = ValidationReport(total_rows=n, valid=np.ones(n, dtype=bool))
+        extra = [column for column in columns if column not in SHIP_COLUMNS]
+        planet_names = list(planet_names) if planet_names is not None else extra
+
+        def empty_fleet() -> Fleet:
+            return Fleet([], [], [], planet_names, np.empty((0, len(planet_names))))
+
+        for column in SHIP_COLUMNS:
+            if column not in columns:
+                report.add_column_issue(column, "missing column")
+        if friction is None:
+            for name in planet_names:
+                if name not in columns:
+                    report.add_column_issue(name, "missing air friction column")
+            for name in set(extra) - set(planet_names):
+                report.add_column_issue(name, "air friction for an unknown planet")
+        elif np.shape(friction) != (n, len(planet_names)):
+            report.add_column_issue("friction", f"has shape {np.shape(friction)}, expected {(n, len(planet_names))}")
+        for column in list(SHIP_COLUMNS) + (planet_names if friction is None else []):
+            if column in columns and len(columns[column]) != n:
+                report.add_column_issue(column, f"has {len(columns[column])} rows, expected {n}")
+        if not report.ok:
+            return empty_fleet(), report
+
+        names, index = BulkConstructor._names(columns["name"], "name", report)
+        mass = BulkConstructor._numbers(columns["mass"], "mass", report, minimum=0.0, strict=True)
+        thrust = BulkConstructor._numbers(columns["engine_thrust_power"], "engine_thrust_power", report, minimum=0.0, strict=True)
+        if friction is None:
+            friction_columns = [BulkConstructor._numbers(columns[name], name, report, minimum=0.0) for name in planet_names]
+            friction = np.column_stack(friction_columns) if friction_columns else np.empty((n, 0))
+        else:
+            try:
+                friction = np.asarray(friction, dtype=np.float64)
+            except (TypeError, ValueError):
+                report.add_column_issue("friction", "expected a numeric matrix")
+                return empty_fleet(), report
+            report.add("friction", "not a finite number", ~np.all(np.isfinite(friction), axis=1))
+            report.add("friction", "must be >= 0.0", np.any(friction < 0, axis=1))
+
+        keep = report.valid
+        if keep.all():
+            return Fleet._trusted(names.tolist(), mass, thrust, planet_names, friction, index=index), report
+        return Fleet._trusted(names[keep].tolist(), mass[keep], thrust[keep], planet_names, friction[keep]), report
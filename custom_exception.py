@@ -4,4 +4,10 @@ class MechanicalError(Exception):
     """
     def __init__(self, message: str = "A mechanical error occurred."):
         self.message = message
-        super().__init__(self.message)
\ No newline at end of file
+        super().__init__(self.message)
+
+
+class NoTourError(ValueError):
+    """
+    No Hamiltonian cycle exists: every tour through the time matrix uses a forbidden (np.inf) leg.
+    """
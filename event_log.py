@@ -0,0 +1,244 @@
+"""
+Structured event logging for the library code.
+
+Call sites emit named events with fields instead of printing:
+
+    event(logger, "physics.landing_failed", "cannot land", ship=name, planet=planet.name)
+
+Nothing is printed unless `configure_logging` is called (tsp_final and tsp_cli do it):
+the package logger only has a NullHandler, so library use stays silent. Once configured,
+records go through a QueueHandler, which applies `RateLimitFilter` in the calling thread,
+and a QueueListener thread writes them to stderr and, optionally, a JSON Lines file.
+Events over the rate limit are counted instead of written and reported as one summary
+record, e.g. "312 physics.landing_failed events for planet Venus, 9 distinct ships".
+"""
+import atexit
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+LOGGER_NAME = "space_travel_tsp"
+LOG_LEVEL_ENV_VAR = "TSP_LOG_LEVEL"
+LOG_JSONL_ENV_VAR = "TSP_LOG_JSONL"
+
+logging.getLogger(LOGGER_NAME).addHandler(logging.NullHandler())
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    Logger of one module, under the package logger.
+    """
+    return logging.getLogger(f"{LOGGER_NAME}.{name}")
+
+
+def event(logger: logging.Logger, event_type: str, message: str, level: int = logging.INFO, **fields: Any) -> None:
+    """
+    Logs one structured event. Returns at once when `level` is disabled, so hot loops only
+    pay for the level check.
+    """
+    if logger.isEnabledFor(level):
+        logger.log(level, message, extra={"event": event_type, "fields": fields})
+
+
+@dataclass
+class _EventWindow:
+    started: float
+    emitted: int = 0
+    level: int = logging.NOTSET
+    """
+    highest level of the suppressed records, given to their summaries
+    """
+    suppressed: Dict[Any, List] = field(default_factory=dict)
+    """
+    group value -> [count, set of distinct values]
+    """
+
+
+class RateLimitFilter(logging.Filter):
+    """_summary_
+    Lets through at most `burst` records per event type every `interval_s` seconds.
+    The others are dropped and aggregated per `group_by` field value, counting the distinct
+    `distinct` field values, and reported as summary records when the window of that event
+    type ends or on `flush()`. Records without an event type always pass.
+    """
+
+    def __init__(self, burst: int = 5, interval_s: float = 10.0, group_by: str = "planet", distinct: str = "ship"):
+        super().__init__()
+        self.burst = burst
+        self.interval_s = interval_s
+        self.group_by = group_by
+        self.distinct = distinct
+        self._windows: Dict[Tuple[str, str], _EventWindow] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        event_type = getattr(record, "event", None)
+        if event_type is None or getattr(record, "summary", False):
+            return True
+        now = time.monotonic()
+        key = (record.name, event_type)
+        with self._lock:
+            window = self._windows.get(key)
+            summaries = []
+            if window is None or now - window.started >= self.interval_s:
+                if window is not None:
+                    summaries = self._summaries(record.name, event_type, window)
+                window = self._windows[key] = _EventWindow(started=now)
+            allowed = window.emitted < self.burst
+            if allowed:
+                window.emitted += 1
+            else:
+                fields = getattr(record, "fields", {})
+                entry = window.suppressed.setdefault(fields.get(self.group_by), [0, set()])
+                entry[0] += 1
+                window.level = max(window.level, record.levelno)
+                if self.distinct in fields:
+                    entry[1].add(fields[self.distinct])
+        for summary in summaries:
+            logging.getLogger(summary.name).handle(summary)
+        return allowed
+
+    def _summaries(self, logger_name: str, event_type: str, window: _EventWindow) -> List[logging.LogRecord]:
+        records = []
+        for group, (count, distinct) in window.suppressed.items():
+            where = f" for {self.group_by} {group}" if group is not None else ""
+            also = f", {len(distinct)} distinct {self.distinct}s" if distinct else ""
+            record = logging.LogRecord(logger_name, window.level, __file__, 0, f"{count} {event_type} events{where}{also} (rate limited)", None, None)
+            record.event = f"{event_type}.summary"
+            record.summary = True
+            record.fields = {"suppressed": count, self.group_by: group, f"distinct_{self.distinct}s": len(distinct)}
+            records.append(record)
+        return records
+
+    def flush(self) -> None:
+        """
+        Emits the summaries of every open window and starts over.
+        """
+        with self._lock:
+            summaries = [summary for (name, event_type), window in self._windows.items() for summary in self._summaries(name, event_type, window)]
+            self._windows.clear()
+        for summary in summaries:
+            logging.getLogger(summary.name).handle(summary)
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """
+    One JSON object per record: time, level, logger, event, message and the event fields.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        document = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "event": getattr(record, "event", None),
+            "message": record.getMessage(),
+            **getattr(record, "fields", {}),
+        }
+        if record.exc_info:
+            document["exception"] = self.formatException(record.exc_info)
+        return json.dumps(document, default=str, ensure_ascii=False)
+
+
+@dataclass
+class LoggingSetup:
+    listener: logging.handlers.QueueListener
+    queue_handler: logging.handlers.QueueHandler
+    rate_limit: RateLimitFilter
+    handlers: List[logging.Handler]
+
+    def stop(self) -> None:
+        """
+        Writes the pending summaries, drains the queue and closes the sinks.
+        """
+        self.rate_limit.flush()
+        self.listener.stop()
+        logging.getLogger(LOGGER_NAME).removeHandler(self.queue_handler)
+        for handler in self.handlers:
+            handler.close()
+
+
+_setup: Optional[LoggingSetup] = None
+_setup_lock = threading.Lock()
+
+
+def configure_logging(
+    level: Optional[str] = None,
+    jsonl_path: Optional[str] = None,
+    console_level: str = "WARNING",
+    burst: int = 5,
+    interval_s: float = 10.0,
+) -> LoggingSetup:
+    """
+    Routes the package logger through a rate-limited queue to stderr (at `console_level`
+    and above) and, when `jsonl_path` is given, to a JSON Lines file (at `level` and above).
+    `level` and `jsonl_path` default to `TSP_LOG_LEVEL` (INFO) and `TSP_LOG_JSONL`.
+    Calling it again replaces the previous setup.
+
+    Raises:
+        ValueError: for an unknown level name.
+    """
+    global _setup
+    level = (level or os.environ.get(LOG_LEVEL_ENV_VAR) or "INFO").upper()
+    for name in (level, console_level.upper()):
+        if not isinstance(logging.getLevelName(name), int):
+            raise ValueError(f"unknown log level {name}")
+    jsonl_path = jsonl_path or os.environ.get(LOG_JSONL_ENV_VAR)
+
+    console = logging.StreamHandler()
+    console.setLevel(console_level.upper())
+    console.setFormatter(logging.Formatter("%(levelname)s %(name)s: %(message)s"))
+    handlers: List[logging.Handler] = [console]
+    if jsonl_path:
+        directory = os.path.dirname(jsonl_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        sink = logging.FileHandler(jsonl_path, mode="a", encoding="utf-8")
+        sink.setLevel(level)
+        sink.setFormatter(JsonLinesFormatter())
+        handlers.append(sink)
+
+    rate_limit = RateLimitFilter(burst=burst, interval_s=interval_s)
+    queue_handler = logging.handlers.QueueHandler(queue.SimpleQueue())
+    queue_handler.addFilter(rate_limit)
+    listener = logging.handlers.QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+
+    with _setup_lock:
+        if _setup is not None:
+            _setup.stop()
+        logger = logging.getLogger(LOGGER_NAME)
+        # records no sink wants are dropped by the level check in `event`, before the queue
+        logger.setLevel(min(handler.level for handler in handlers))
+        logger.addHandler(queue_handler)
+        logger.propagate = False
+        listener.start()
+        _setup = LoggingSetup(listener=listener, queue_handler=queue_handler, rate_limit=rate_limit, handlers=handlers)
+    return _setup
+
+
+def shutdown_logging() -> None:
+    global _setup
+    with _setup_lock:
+        if _setup is not None:
+            _setup.stop()
+            _setup = None
+
+
+def _drop_setup_in_child() -> None:
+    # a forked pool worker has the queue but not the listener thread: keep it silent
+    global _setup
+    if _setup is not None:
+        logging.getLogger(LOGGER_NAME).removeHandler(_setup.queue_handler)
+        _setup = None
+
+
+atexit.register(shutdown_logging)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_drop_setup_in_child)
@@ -0,0 +1,153 @@
+from abc import ABC
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import TYPE_CHECKING, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from fleet import Fleet
+from instrumentation import INSTRUMENTATION, count, instrumented
+from node import BasePlanetNode
+from physics_kernel import PhysicsKernel
+from spaceship_node import SpaceshipNode
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class FeasibilityReason(IntEnum):
+    """
+    Why a ship cannot operate on a planet, checked in the same order as the journey:
+    the atmosphere exit first, then the landing. MISSING_DATA comes before both: the ship
+    has no friction value for the planet (NaN in a `Fleet`), so neither can be decided.
+    """
+    FEASIBLE = 0
+    ATMOSPHERE_EXIT = 1
+    LANDING = 2
+    MISSING_DATA = 3
+
+
+@dataclass(frozen=True)
+class FeasibilityReport:
+    ship_names: Tuple[str, ...]
+    planet_names: Tuple[str, ...]
+    scenario_names: Tuple[str, ...]
+    feasible: np.ndarray
+    """
+    (ships, planets, scenarios) boolean cube
+    """
+    reason: np.ndarray
+    """
+    (ships, planets, scenarios) int8 cube of FeasibilityReason codes
+    """
+    margin: np.ndarray
+    """
+    (ships, planets, scenarios) net force in Newtons of the deciding check:
+    the failing one, or the smaller of the two when the ship is feasible; NaN for MISSING_DATA
+    """
+
+    def scenario_index(self, scenario: str) -> int:
+        return self.scenario_names.index(scenario)
+
+    def to_dataframe(self, scenario: str) -> "pd.DataFrame":
+        """
+        Ships x planets boolean DataFrame, the shape `spaceship_capability_comparaison` prints.
+        """
+        import pandas as pd
+
+        return pd.DataFrame(
+            self.feasible[:, :, self.scenario_index(scenario)],
+            index=list(self.ship_names),
+            columns=list(self.planet_names),
+        )
+
+    def reliable_ships(self, scenario: str) -> List[str]:
+        """
+        Names of the ships that can exit and land on every planet in the scenario.
+        """
+        mask = self.feasible[:, :, self.scenario_index(scenario)].all(axis=1)
+        return [name for name, ok in zip(self.ship_names, mask) if ok]
+
+
+class FeasibilityEngine(ABC):
+    """_summary_
+    Exception-free feasibility checks for ships x planets x booster scenarios,
+    evaluated as one NumPy computation.
+    """
+
+    @staticmethod
+    @instrumented("feasibility")
+    def evaluate(
+        spaceships: Sequence[SpaceshipNode],
+        planet_list: List[BasePlanetNode],
+        booster_profiles: Dict[str, Dict[str, float]],
+    ) -> FeasibilityReport:
+        """
+        Evaluates the exit and landing net-force inequalities for every ship, planet and
+        booster profile.
+
+        Args:
+            spaceships (Sequence[SpaceshipNode]): the fleet, a list or a `Fleet`.
+            planet_list (List[BasePlanetNode]): the planets, their own station boost is ignored.
+            booster_profiles (Dict[str, Dict[str, float]]): scenario name -> booster power (N)
+                per planet name, e.g. {"extreme": Scenarios.super_boosters_extreme()}.
+
+        Returns:
+            FeasibilityReport: the feasibility cube, reason codes and margins.
+
+        Raises:
+            ValueError: when a booster profile has no entry for some planets.
+        """
+        for scenario, profile in booster_profiles.items():
+            missing = [planet.name for planet in planet_list if planet.name not in profile]
+            if missing:
+                raise ValueError(f"booster profile {scenario} has no boost for {', '.join(missing)}")
+        _, _, _, gravity = PhysicsKernel.planet_columns(planet_list)
+        mass, thrust, friction = PhysicsKernel.fleet_columns(spaceships, planet_list)
+        boosts = np.array(
+            [[profile[planet.name] for planet in planet_list] for profile in booster_profiles.values()],
+            dtype=np.float64,
+        ).reshape(len(booster_profiles), len(planet_list))
+
+        # (ships, planets, scenarios)
+        exit_margin = PhysicsKernel.exit_net_force(
+            thrust[:, None, None], boosts.T[None, :, :], friction[:, :, None], mass[:, None, None], gravity[None, :, None],
+        )
+        landing_margin = np.broadcast_to(
+            PhysicsKernel.landing_net_force(thrust[:, None], friction, mass[:, None], gravity[None, :])[:, :, None],
+            exit_margin.shape,
+        )
+
+        # NaN margins compare False with <= 0, they must not pass as feasible
+        missing = ~(np.isfinite(exit_margin) & np.isfinite(landing_margin))
+        exit_fails = exit_margin <= 0
+        landing_fails = landing_margin <= 0
+        reason = np.select(
+            [missing, exit_fails, landing_fails],
+            [FeasibilityReason.MISSING_DATA, FeasibilityReason.ATMOSPHERE_EXIT, FeasibilityReason.LANDING],
+            FeasibilityReason.FEASIBLE,
+        ).astype(np.int8)
+        margin = np.where(exit_fails, exit_margin, np.where(landing_fails, landing_margin, np.minimum(exit_margin, landing_margin)))
+        if INSTRUMENTATION.enabled:
+            count("feasibility_cells", reason.size)
+            count("infeasible_ship_planet_pairs", int(np.count_nonzero(reason)))
+
+        return FeasibilityReport(
+            ship_names=tuple(spaceships.names) if isinstance(spaceships, Fleet) else tuple(ship.name for ship in spaceships),
+            planet_names=tuple(planet.name for planet in planet_list),
+            scenario_names=tuple(booster_profiles.keys()),
+            feasible=reason == FeasibilityReason.FEASIBLE,
+            reason=reason,
+            margin=margin,
+        )
+
+    @staticmethod
+    def evaluate_planet_list(spaceships: Sequence[SpaceshipNode], planet_list: List[BasePlanetNode], scenario: str = "default") -> FeasibilityReport:
+        """
+        Single-scenario evaluation using each planet's own station boost.
+        """
+        return FeasibilityEngine.evaluate(
+            spaceships=spaceships,
+            planet_list=planet_list,
+            booster_profiles={scenario: {planet.name: planet.station_boost_for_thrust_power_launch for planet in planet_list}},
+        )
@@ -0,0 +1,155 @@
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from node import BasePlanetNode
+from planet_catalog import PlanetCatalog
+from spaceship_node import SpaceshipNode
+
+
+class Fleet:
+    """_summary_
+    Columnar store for many spaceships, e.g. engine configurations from a design-space sweep.
+    Mass (kg) and thrust (N) are float64 columns, air friction (N) is a (ships, planets)
+    matrix whose columns follow `planet_names`, and a name -> row dict gives O(1) lookup.
+    A ship costs its name, two floats and its friction row; SpaceshipNode objects are only
+    built on access. NaN friction marks a body the ship has no value for.
+    """
+
+    def __init__(
+        self,
+        names: Sequence[str],
+        mass: Sequence[float],
+        engine_thrust_power: Sequence[float],
+        planet_names: Sequence[str],
+        friction: np.ndarray,
+    ):
+        """
+        Raises:
+            ValueError: on duplicate ship or planet names, or columns of the wrong shape.
+        """
+        self.names: List[str] = list(names)
+        self.index: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+        if len(self.index) != len(self.names):
+            raise ValueError("ship names must be unique")
+        self.planet_names: List[str] = list(planet_names)
+        self.planet_index: Dict[str, int] = {name: i for i, name in enumerate(self.planet_names)}
+        if len(self.planet_index) != len(self.planet_names):
+            raise ValueError("planet names must be unique")
+
+        self.mass = np.ascontiguousarray(mass, dtype=np.float64)
+        self.engine_thrust_power = np.ascontiguousarray(engine_thrust_power, dtype=np.float64)
+        self.friction = np.ascontiguousarray(friction, dtype=np.float64)
+        for column_name, column, shape in (
+            ("mass", self.mass, (len(self.names),)),
+            ("engine_thrust_power", self.engine_thrust_power, (len(self.names),)),
+            ("friction", self.friction, (len(self.names), len(self.planet_names))),
+        ):
+            if column.shape != shape:
+                raise ValueError(f"column {column_name} has shape {column.shape}, expected {shape}")
+            column.setflags(write=False)
+
+    @staticmethod
+    def _trusted(
+        names: List[str],
+        mass: np.ndarray,
+        engine_thrust_power: np.ndarray,
+        planet_names: List[str],
+        friction: np.ndarray,
+        index: Optional[Dict[str, int]] = None,
+    ) -> "Fleet":
+        """
+        Skips validation, for callers that already checked every row (see `BulkConstructor`).
+        """
+        fleet = Fleet.__new__(Fleet)
+        fleet.names = names
+        fleet.index = index if index is not None else dict(zip(names, range(len(names))))
+        fleet.planet_names = list(planet_names)
+        fleet.planet_index = {name: i for i, name in enumerate(fleet.planet_names)}
+        for column_name, column in (("mass", mass), ("engine_thrust_power", engine_thrust_power), ("friction", friction)):
+            column = np.ascontiguousarray(column, dtype=np.float64)
+            column.setflags(write=False)
+            setattr(fleet, column_name, column)
+        return fleet
+
+    @staticmethod
+    def from_spaceships(spaceships: Sequence[SpaceshipNode], planet_names: Optional[Sequence[str]] = None) -> "Fleet":
+        """
+        Args:
+            spaceships (Sequence[SpaceshipNode]): ships with unique names.
+            planet_names (Sequence[str]): friction columns, every planet any ship knows when omitted.
+        """
+        if planet_names is None:
+            planet_names = list(dict.fromkeys(name for ship in spaceships for name in ship.air_friction_on_each_planet))
+        friction = np.array(
+            [[ship.air_friction_on_each_planet.get(name, np.nan) for name in planet_names] for ship in spaceships],
+            dtype=np.float64,
+        ).reshape(len(spaceships), len(planet_names))
+        return Fleet(
+            names=[ship.name for ship in spaceships],
+            mass=[ship.mass for ship in spaceships],
+            engine_thrust_power=[ship.engine_thrust_power for ship in spaceships],
+            planet_names=planet_names,
+            friction=friction,
+        )
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.index
+
+    def __iter__(self) -> Iterator[SpaceshipNode]:
+        return (self[i] for i in range(len(self.names)))
+
+    def __getitem__(self, key: Union[int, str]) -> SpaceshipNode:
+        """
+        SpaceshipNode for a row, by position or by name.
+        """
+        row = self.index_of(key) if isinstance(key, str) else range(len(self.names))[key]
+        friction = {
+            planet: float(value)
+            for planet, value in zip(self.planet_names, self.friction[row].tolist())
+            if not np.isnan(value)
+        }
+        return SpaceshipNode(
+            name=self.names[row],
+            mass=float(self.mass[row]),
+            engine_thrust_power=float(self.engine_thrust_power[row]),
+            air_friction_on_each_planet=friction,
+        )
+
+    def index_of(self, name: str) -> int:
+        """
+        Raises:
+            KeyError: if no ship has this name.
+        """
+        try:
+            return self.index[name]
+        except KeyError:
+            raise KeyError(f"unknown ship {name}") from None
+
+    def columns(self, formatted_planet_list: Union[Sequence[BasePlanetNode], PlanetCatalog]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        (mass, thrust, friction) with friction columns ordered like `formatted_planet_list`,
+        as returned by `PhysicsKernel.fleet_columns`.
+
+        Raises:
+            KeyError: if a planet has no friction column.
+        """
+        names = formatted_planet_list.names if isinstance(formatted_planet_list, PlanetCatalog) else [planet.name for planet in formatted_planet_list]
+        try:
+            columns = [self.planet_index[name] for name in names]
+        except KeyError as e:
+            raise KeyError(f"no air friction for planet {e.args[0]}") from None
+        return self.mass, self.engine_thrust_power, self.friction[:, columns]
+
+    def subset(self, rows: Sequence[int]) -> "Fleet":
+        rows = np.asarray(rows, dtype=np.intp)
+        return Fleet(
+            names=[self.names[row] for row in rows],
+            mass=self.mass[rows],
+            engine_thrust_power=self.engine_thrust_power[rows],
+            planet_names=self.planet_names,
+            friction=self.friction[rows],
+        )
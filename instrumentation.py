@@ -0,0 +1,270 @@
+from contextlib import contextmanager, nullcontext
+import cProfile
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+import functools
+import io
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from typing import Any, Dict, Iterator, List, Optional
+
+ENV_VAR = "TSP_INSTRUMENT"
+"""
+phases to instrument: "all", or a comma separated list such as
+"build_time_matrix,solve:profile,feasibility:memory" (mode time by default)
+"""
+REPORT_ENV_VAR = "TSP_INSTRUMENT_REPORT"
+"""
+where `Instrumentation.write_report` goes: a .jsonl file gets one line appended per run,
+any other path is overwritten with one JSON document
+"""
+MODES = ("time", "profile", "memory")
+PHASES = ("planets", "feasibility", "build_time_matrix", "solve", "render", "cache")
+"""
+phases the code base reports; any other name works too
+"""
+PROFILE_TOP = 25
+
+_OFF = nullcontext()
+
+
+@dataclass
+class PhaseStats:
+    calls: int = 0
+    total_s: float = 0.0
+    min_s: float = float("inf")
+    max_s: float = 0.0
+    peak_bytes: Optional[int] = None
+    """
+    largest tracemalloc peak of one call, memory mode only
+    """
+    profile: List[Dict[str, Any]] = field(default_factory=list)
+    """
+    top functions by cumulative time over all calls, profile mode only
+    """
+
+    def add(self, elapsed: float) -> None:
+        self.calls += 1
+        self.total_s += elapsed
+        self.min_s = min(self.min_s, elapsed)
+        self.max_s = max(self.max_s, elapsed)
+
+    def merge(self, other: "PhaseStats") -> None:
+        self.calls += other.calls
+        self.total_s += other.total_s
+        self.min_s = min(self.min_s, other.min_s)
+        self.max_s = max(self.max_s, other.max_s)
+        if other.peak_bytes is not None:
+            self.peak_bytes = max(self.peak_bytes or 0, other.peak_bytes)
+        if other.profile and not self.profile:
+            self.profile = other.profile
+
+
+class Instrumentation:
+    """_summary_
+    Per-phase timers and counters for the hot paths, off unless `TSP_INSTRUMENT` (or
+    `configure`) turns phases on.
+
+    When off, `phase()` returns one shared no-op context manager and `count()` returns at
+    once, so the call sites cost a bool check. An enabled phase records calls and wall
+    time; "profile" mode also runs it under cProfile and "memory" mode under tracemalloc.
+    Counters (permutations scored, matrix cells, infeasible pairs, cache hits ...) are only
+    kept while at least one phase is on.
+    """
+
+    def __init__(self, spec: Optional[str] = None):
+        self._lock = threading.Lock()
+        self._active = threading.local()
+        self._profiling = False
+        self.configure(spec)
+
+    @staticmethod
+    def from_environment() -> "Instrumentation":
+        return Instrumentation(os.environ.get(ENV_VAR))
+
+    def configure(self, spec: Optional[str]) -> None:
+        """
+        Sets the instrumented phases from a spec such as "all", "all:profile" or
+        "solve:profile,build_time_matrix"; None or "" turns everything off and clears the data.
+
+        Raises:
+            ValueError: for an unknown mode.
+        """
+        modes: Dict[str, str] = {}
+        for item in (spec or "").split(","):
+            item = item.strip()
+            if not item:
+                continue
+            name, _, mode = item.partition(":")
+            mode = mode or "time"
+            if mode not in MODES:
+                raise ValueError(f"unknown instrumentation mode {mode} for {name}, expected one of {MODES}")
+            modes[name] = mode
+        self.modes = modes
+        self.enabled = bool(modes)
+        self.reset()
+
+    def reset(self) -> None:
+        self.phases: Dict[str, PhaseStats] = {}
+        self.counters: Dict[str, int] = {}
+        self._profiles: Dict[str, pstats.Stats] = {}
+        self.started = datetime.now(timezone.utc)
+
+    def mode(self, name: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+        return self.modes.get(name, self.modes.get("all"))
+
+    def phase(self, name: str):
+        """
+        Context manager timing one call of phase `name`; a shared no-op when `name` is off
+        or already running in this thread, so a solver delegating to another one (e.g.
+        `tsp_separable` falling back to Held-Karp) is one call of "solve".
+        """
+        if not self.enabled:
+            return _OFF
+        mode = self.mode(name)
+        if mode is None or name in getattr(self._active, "names", ()):
+            return _OFF
+        return self._measure(name, mode)
+
+    def count(self, name: str, amount: int = 1) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + int(amount)
+
+    @contextmanager
+    def _measure(self, name: str, mode: str) -> Iterator[None]:
+        profiler = None
+        tracing = False
+        if mode == "profile" and not self._profiling:
+            # cProfile cannot nest, an inner profiled phase is only timed
+            self._profiling = True
+            profiler = cProfile.Profile()
+            profiler.enable()
+        elif mode == "memory":
+            tracing = not tracemalloc.is_tracing()
+            if tracing:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+        active = self._active.__dict__.setdefault("names", set())
+        active.add(name)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            active.discard(name)
+            peak = None
+            if profiler is not None:
+                profiler.disable()
+                self._profiling = False
+            if mode == "memory":
+                _, peak = tracemalloc.get_traced_memory()
+                if tracing:
+                    tracemalloc.stop()
+            with self._lock:
+                stats = self.phases.setdefault(name, PhaseStats())
+                stats.add(elapsed)
+                if peak is not None:
+                    stats.peak_bytes = max(stats.peak_bytes or 0, peak)
+                if profiler is not None:
+                    if name in self._profiles:
+                        self._profiles[name].add(profiler)
+                    else:
+                        self._profiles[name] = pstats.Stats(profiler, stream=io.StringIO())
+
+    @staticmethod
+    def _top_functions(profile: pstats.Stats) -> List[Dict[str, Any]]:
+        rows = []
+        for (filename, line, function), (_, ncalls, tottime, cumtime, _) in profile.stats.items():
+            rows.append({"function": f"{os.path.basename(filename)}:{line}({function})", "ncalls": ncalls, "tottime_s": tottime, "cumtime_s": cumtime})
+        rows.sort(key=lambda row: row["cumtime_s"], reverse=True)
+        return rows[:PROFILE_TOP]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        The report as plain data: phases, counters and the instrumented spec.
+        """
+        with self._lock:
+            phases = {}
+            for name, stats in self.phases.items():
+                phase = asdict(stats)
+                if name in self._profiles:
+                    phase["profile"] = self._top_functions(self._profiles[name])
+                phases[name] = phase
+            return {
+                "started": self.started.isoformat(timespec="seconds"),
+                "spec": ",".join(f"{name}:{mode}" for name, mode in self.modes.items()),
+                "pid": os.getpid(),
+                "phases": phases,
+                "counters": dict(self.counters),
+            }
+
+    def merge(self, snapshot: Dict[str, Any]) -> None:
+        """
+        Adds the phases and counters of another process's `snapshot()`, e.g. a pool worker.
+        """
+        if not self.enabled or not snapshot:
+            return
+        with self._lock:
+            for name, phase in snapshot.get("phases", {}).items():
+                self.phases.setdefault(name, PhaseStats()).merge(PhaseStats(**phase))
+            for name, amount in snapshot.get("counters", {}).items():
+                self.counters[name] = self.counters.get(name, 0) + amount
+
+    def write_report(self, path: Optional[str] = None, **context: Any) -> Optional[str]:
+        """
+        Writes `snapshot()` plus `context` (e.g. command, scenario) to `path`, or to
+        `TSP_INSTRUMENT_REPORT`. Does nothing, and returns None, when off or without a path.
+        """
+        path = path or os.environ.get(REPORT_ENV_VAR)
+        if not self.enabled or not path:
+            return None
+        report = {**self.snapshot(), "finished": datetime.now(timezone.utc).isoformat(timespec="seconds"), **context}
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if path.endswith(".jsonl"):
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(report, default=str) + "\n")
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2, default=str)
+        return path
+
+
+INSTRUMENTATION = Instrumentation.from_environment()
+"""
+process-wide instance used by the instrumented call sites
+"""
+
+
+def phase(name: str):
+    return INSTRUMENTATION.phase(name)
+
+
+def count(name: str, amount: int = 1) -> None:
+    INSTRUMENTATION.count(name, amount)
+
+
+def instrumented(name: str):
+    """
+    Decorator running every call of the function as phase `name`.
+    Disabled instrumentation costs one attribute check per call.
+    """
+
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not INSTRUMENTATION.enabled:
+                return function(*args, **kwargs)
+            with INSTRUMENTATION.phase(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
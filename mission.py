@@ -0,0 +1,71 @@
+from dataclasses import dataclass, field
+import datetime
+from typing import Callable, List, Sequence, Union
+
+from node import BasePlanetNode
+from ship_physics import ShipPhysics
+from spaceship_node import SpaceshipNode
+
+
+@dataclass(frozen=True)
+class MissionLeg:
+    source: str
+    destination: str
+    seconds: float
+
+
+@dataclass
+class Mission:
+    """_summary_
+    Journey of one spaceship, leg by leg.
+    The spaceship physics is side-effect free, so the running time of a journey lives here
+    instead of on the ship: the same SpaceshipNode can fly any number of missions, scenarios
+    or time matrices, in any thread or process, without them seeing each other's time.
+    Legs are flown through `ShipPhysics.leg_seconds`, so a SpaceshipNode and its `physics`
+    snapshot fly the same mission; a subclass with its own cost model keeps its legs.
+    """
+
+    spaceship: Union[SpaceshipNode, ShipPhysics]
+    legs: List[MissionLeg] = field(default_factory=list)
+    _leg_seconds: Callable[[BasePlanetNode, BasePlanetNode], float] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        from tsp_utils import TspUtils
+
+        if isinstance(self.spaceship, ShipPhysics):
+            self._leg_seconds = self.spaceship.leg_seconds
+        elif TspUtils.has_separable_cost_model(self.spaceship):
+            self._leg_seconds = self.spaceship.physics.leg_seconds
+        else:
+            self._leg_seconds = self.spaceship.calculate_total_journey_seconds_from_planetA_to_planetB
+
+    def fly(self, planetA: BasePlanetNode, planetB: BasePlanetNode) -> datetime.timedelta:
+        """
+        Adds the leg planetA -> planetB to the mission and returns its duration.
+
+        Raises:
+            MechanicalError: if the ship cannot leave planetA or land on planetB.
+        """
+        seconds = self._leg_seconds(planetA, planetB)
+        self.legs.append(MissionLeg(source=planetA.name, destination=planetB.name, seconds=seconds))
+        return datetime.timedelta(seconds=seconds)
+
+    def fly_tour(self, formatted_planet_list: List[BasePlanetNode], tour_order: Sequence[int]) -> datetime.timedelta:
+        """
+        Flies every leg of a closed tour (indices into `formatted_planet_list`) and returns
+        the total mission time.
+        """
+        for i in range(len(tour_order) - 1):
+            self.fly(formatted_planet_list[tour_order[i]], formatted_planet_list[tour_order[i + 1]])
+        return self.journey_time
+
+    @property
+    def total_seconds(self) -> float:
+        return float(sum(leg.seconds for leg in self.legs))
+
+    @property
+    def journey_time(self) -> datetime.timedelta:
+        """
+        Returns the time spent in the journey so far.
+        """
+        return datetime.timedelta(seconds=self.total_seconds)
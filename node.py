@@ -1,10 +1,14 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
+import logging
 from typing import Dict, List, Optional, TypeVar
 
 
+from event_log import event, get_logger
 from validator_decorators import is_float, is_string
 
+logger = get_logger("planets")
+
 T = TypeVar('T', bound='BasePlanetNode')
 
 @dataclass(frozen=True)
@@ -90,7 +94,7 @@ class BasePlanetNode(ABC):
             object.__setattr__(new_instance, '_atmosphere_altitude', valid_atmosphere_altitude)        
             return new_instance
         except TypeError as e:
-            print(e)
+            event(logger, "planet.validation_failed", str(e), logging.WARNING, planet=name)
 
     def copy_with(
         self,
@@ -132,7 +136,7 @@ class BasePlanetNode(ABC):
            
             return new_instance
         except TypeError as e:
-            print(e)
+            event(logger, "planet.validation_failed", str(e), logging.WARNING, planet=name if name is not None else self.name)
     
     def __hash__(self):
         return hash((
@@ -0,0 +1,108 @@
+from abc import ABC
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from fleet import Fleet
+from node import BasePlanetNode
+from planet_catalog import PlanetCatalog
+from spaceship_node import SpaceshipNode
+
+
+class PhysicsKernel(ABC):
+    """_summary_
+    Vectorised version of the SpaceshipNode physics.
+    Every method works on NumPy arrays (or plain floats) and broadcasts, so a whole
+    fleet x planet list is evaluated in one call instead of one Python call per pair.
+    Infeasible cases come back as np.inf instead of raising MechanicalError.
+    """
+
+    @staticmethod
+    def exit_net_force(thrust, boost, friction, mass, gravity) -> np.ndarray:
+        """
+        Net force (N) while crossing the atmosphere: F_thrust + F_boost - F_friction - m * g.
+        """
+        return np.asarray(boost) + np.asarray(thrust) - np.asarray(friction) - np.asarray(mass) * np.asarray(gravity)
+
+    @staticmethod
+    def landing_net_force(thrust, friction, mass, gravity) -> np.ndarray:
+        """
+        Net force (N) while landing: F_thrust + F_friction - m * g.
+        """
+        return np.asarray(thrust) + np.asarray(friction) - np.asarray(mass) * np.asarray(gravity)
+
+    @staticmethod
+    def kinematic_time_seconds(atmosphere_altitude_km, net_force, mass) -> np.ndarray:
+        """
+        Time (s) to cover the atmosphere from rest: t = sqrt(2d / a) with a = F_net / m.
+        Entries with a net force <= 0 are np.inf.
+        """
+        net_force = np.asarray(net_force, dtype=np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            acceleration = net_force / np.asarray(mass, dtype=np.float64)
+            time_seconds = np.sqrt((2 * np.asarray(atmosphere_altitude_km, dtype=np.float64) * 1000) / acceleration)
+        return np.where(net_force > 0, time_seconds, np.inf)
+
+    @staticmethod
+    def travel_time_scale(mass, thrust) -> np.ndarray:
+        """
+        Seconds per sqrt(million km) of interplanetary travel, see SpaceshipNode.get_travel_time_scale.
+        """
+        return np.sqrt((2 * 1e9) / (np.asarray(thrust, dtype=np.float64) / np.asarray(mass, dtype=np.float64)))
+
+    @staticmethod
+    def planet_columns(formatted_planet_list: List[BasePlanetNode]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns (boost, atmosphere_altitude, distance_from_the_sun, surface_gravety_g) columns.
+        A PlanetCatalog hands out its own columns without copying.
+        """
+        if isinstance(formatted_planet_list, PlanetCatalog):
+            return formatted_planet_list.columns()
+        boost = np.array([planet.station_boost_for_thrust_power_launch for planet in formatted_planet_list], dtype=np.float64)
+        altitude = np.array([planet.atmosphere_altitude for planet in formatted_planet_list], dtype=np.float64)
+        distance = np.array([planet.distance_from_the_sun for planet in formatted_planet_list], dtype=np.float64)
+        gravity = np.array([planet.surface_gravety_g for planet in formatted_planet_list], dtype=np.float64)
+        return boost, altitude, distance, gravity
+
+    @staticmethod
+    def fleet_columns(spaceships: Sequence[SpaceshipNode], formatted_planet_list: List[BasePlanetNode]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns (mass, thrust, friction) where friction is a (ships, planets) matrix
+        ordered like `formatted_planet_list`. A Fleet hands out its own columns.
+        """
+        if isinstance(spaceships, Fleet):
+            return spaceships.columns(formatted_planet_list)
+        mass = np.array([ship.mass for ship in spaceships], dtype=np.float64)
+        thrust = np.array([ship.engine_thrust_power for ship in spaceships], dtype=np.float64)
+        names = formatted_planet_list.names if isinstance(formatted_planet_list, PlanetCatalog) else [planet.name for planet in formatted_planet_list]
+        friction = np.array(
+            [[ship.air_friction_on_each_planet[name] for name in names] for ship in spaceships],
+            dtype=np.float64,
+        ).reshape(len(spaceships), len(formatted_planet_list))
+        return mass, thrust, friction
+
+    @staticmethod
+    def exit_and_landing_seconds(
+        mass: np.ndarray,
+        thrust: np.ndarray,
+        friction: np.ndarray,
+        boost: np.ndarray,
+        altitude: np.ndarray,
+        gravity: np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (ships, planets) matrices of atmosphere exit and landing times in seconds, np.inf when infeasible.
+        """
+        mass_column = mass[:, None]
+        thrust_column = thrust[:, None]
+        exit_seconds = PhysicsKernel.kinematic_time_seconds(
+            altitude[None, :],
+            PhysicsKernel.exit_net_force(thrust_column, boost[None, :], friction, mass_column, gravity[None, :]),
+            mass_column,
+        )
+        landing_seconds = PhysicsKernel.kinematic_time_seconds(
+            altitude[None, :],
+            PhysicsKernel.landing_net_force(thrust_column, friction, mass_column, gravity[None, :]),
+            mass_column,
+        )
+        return exit_seconds, landing_seconds
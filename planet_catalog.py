@@ -0,0 +1,214 @@
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from node import BasePlanetNode
+
+
+class PlanetView(BasePlanetNode):
+    """_summary_
+    Lightweight BasePlanetNode backed by one row of a PlanetCatalog.
+    It only holds the catalogue and a row index; every attribute is read from the columns,
+    so creating views for 100k bodies costs no copies. Views compare and hash like any
+    other planet with the same values and pickle as a detached one-row catalogue.
+    """
+
+    def __init__(self, catalog: "PlanetCatalog", index: int):
+        object.__setattr__(self, "_catalog", catalog)
+        object.__setattr__(self, "_index", index)
+
+    def __reduce__(self):
+        return (
+            _detached_view,
+            (self.name, self.station_boost_for_thrust_power_launch, self.atmosphere_altitude, self.distance_from_the_sun, self.surface_gravety_g),
+        )
+
+    @property
+    def index(self) -> int:
+        """
+        Row of this body in its catalogue.
+        """
+        return self._index
+
+    @property
+    def name(self):
+        return self._catalog.names[self._index]
+
+    @property
+    def station_boost_for_thrust_power_launch(self):
+        return float(self._catalog.station_boost_for_thrust_power_launch[self._index])
+
+    @property
+    def atmosphere_altitude(self):
+        return float(self._catalog.atmosphere_altitude[self._index])
+
+    @property
+    def distance_from_the_sun(self):
+        return float(self._catalog.distance_from_the_sun[self._index])
+
+    @property
+    def surface_gravety_g(self):
+        return float(self._catalog.surface_gravety_g[self._index])
+
+    # BasePlanetNode's __eq__, __hash__ and __str__ read the private fields
+    _name = name
+    _station_boost_for_thrust_power_launch = station_boost_for_thrust_power_launch
+    _atmosphere_altitude = atmosphere_altitude
+    _distance_from_the_sun = distance_from_the_sun
+    _surface_gravety_g = surface_gravety_g
+
+
+def _detached_view(name: str, station_boost: float, atmosphere_altitude: float, distance_from_the_sun: float, surface_gravety_g: float) -> PlanetView:
+    return PlanetCatalog([name], [station_boost], [atmosphere_altitude], [distance_from_the_sun], [surface_gravety_g])[0]
+
+
+class PlanetCatalog:
+    """_summary_
+    Struct-of-arrays store for any number of bodies (planets, moons, asteroids ...).
+    Names, station boost (N), atmosphere altitude (km), distance from the sun (million km)
+    and surface gravity are contiguous float64 columns with an O(1) name -> row index.
+    It can be passed wherever a planet list is expected: indexing and iteration return
+    PlanetView objects, and `PhysicsKernel.planet_columns` reads the columns directly.
+    """
+
+    def __init__(
+        self,
+        names: Sequence[str],
+        station_boost_for_thrust_power_launch: Sequence[float],
+        atmosphere_altitude: Sequence[float],
+        distance_from_the_sun: Sequence[float],
+        surface_gravety_g: Sequence[float],
+    ):
+        """
+        Raises:
+            TypeError: if a name is not a string or a column is not numeric.
+            ValueError: on duplicate names, mismatched lengths or non-finite values.
+        """
+        self.names: List[str] = list(names)
+        for name in self.names:
+            if not isinstance(name, str):
+                raise TypeError(f"planet names must be strings but got {type(name).__name__}")
+        self.index: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+        if len(self.index) != len(self.names):
+            raise ValueError("planet names must be unique")
+
+        columns = {
+            "station_boost_for_thrust_power_launch": station_boost_for_thrust_power_launch,
+            "atmosphere_altitude": atmosphere_altitude,
+            "distance_from_the_sun": distance_from_the_sun,
+            "surface_gravety_g": surface_gravety_g,
+        }
+        for column_name, values in columns.items():
+            try:
+                column = np.ascontiguousarray(values, dtype=np.float64)
+            except (TypeError, ValueError) as e:
+                raise TypeError(f"column {column_name} must be numeric: {e}") from e
+            if column.shape != (len(self.names),):
+                raise ValueError(f"column {column_name} has shape {column.shape}, expected ({len(self.names)},)")
+            if not np.all(np.isfinite(column)):
+                raise ValueError(f"column {column_name} has non-finite values")
+            column.setflags(write=False)
+            setattr(self, column_name, column)
+
+    @staticmethod
+    def _trusted(
+        names: List[str],
+        columns: Sequence[np.ndarray],
+        index: Optional[Dict[str, int]] = None,
+    ) -> "PlanetCatalog":
+        """
+        Skips validation, for callers that already checked every row (see `BulkConstructor`).
+        `columns` are float64 arrays in `columns()` order.
+        """
+        catalog = PlanetCatalog.__new__(PlanetCatalog)
+        catalog.names = names
+        catalog.index = index if index is not None else dict(zip(names, range(len(names))))
+        for column_name, column in zip(
+            ("station_boost_for_thrust_power_launch", "atmosphere_altitude", "distance_from_the_sun", "surface_gravety_g"),
+            columns,
+        ):
+            column = np.ascontiguousarray(column, dtype=np.float64)
+            column.setflags(write=False)
+            setattr(catalog, column_name, column)
+        return catalog
+
+    @staticmethod
+    def from_planets(planets: Sequence[BasePlanetNode]) -> "PlanetCatalog":
+        return PlanetCatalog(
+            names=[planet.name for planet in planets],
+            station_boost_for_thrust_power_launch=[planet.station_boost_for_thrust_power_launch for planet in planets],
+            atmosphere_altitude=[planet.atmosphere_altitude for planet in planets],
+            distance_from_the_sun=[planet.distance_from_the_sun for planet in planets],
+            surface_gravety_g=[planet.surface_gravety_g for planet in planets],
+        )
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.index
+
+    def __iter__(self) -> Iterator[PlanetView]:
+        return (PlanetView(self, i) for i in range(len(self.names)))
+
+    def __getitem__(self, key: Union[int, str]) -> PlanetView:
+        """
+        Row by position (negative allowed) or by name.
+        """
+        if isinstance(key, str):
+            return PlanetView(self, self.index_of(key))
+        position = int(key)
+        if position < 0:
+            position += len(self.names)
+        if not 0 <= position < len(self.names):
+            raise IndexError(f"planet index {key} out of range for {len(self.names)} bodies")
+        return PlanetView(self, position)
+
+    def index_of(self, name: str) -> int:
+        """
+        Raises:
+            KeyError: if the body is not in the catalogue.
+        """
+        try:
+            return self.index[name]
+        except KeyError:
+            raise KeyError(f"unknown planet {name}") from None
+
+    def indices(self, names: Sequence[str]) -> np.ndarray:
+        return np.fromiter((self.index_of(name) for name in names), dtype=np.intp, count=len(names))
+
+    def columns(self, indices: Optional[Sequence[int]] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        (boost, atmosphere_altitude, distance_from_the_sun, surface_gravety_g), as returned by
+        `PhysicsKernel.planet_columns`, for all rows or only `indices`.
+        """
+        columns = (self.station_boost_for_thrust_power_launch, self.atmosphere_altitude, self.distance_from_the_sun, self.surface_gravety_g)
+        if indices is None:
+            return columns
+        indices = np.asarray(indices, dtype=np.intp)
+        return tuple(column[indices] for column in columns)
+
+    def subset(self, indices: Sequence[int]) -> "PlanetCatalog":
+        """
+        New catalogue with the rows in `indices`, in that order.
+        """
+        indices = np.asarray(indices, dtype=np.intp)
+        boost, altitude, distance, gravity = self.columns(indices)
+        return PlanetCatalog([self.names[i] for i in indices], boost, altitude, distance, gravity)
+
+    def starting_at(self, starting_node: str) -> "PlanetCatalog":
+        """
+        Catalogue version of `TspUtils.format_planet_list_from_starting_node`: `starting_node`
+        moves to row 0, the other rows keep their order.
+        """
+        start = self.index_of(starting_node)
+        order = np.concatenate(([start], np.delete(np.arange(len(self.names)), start)))
+        return self.subset(order)
+
+    def with_boosters(self, boosters: Mapping[str, float]) -> "PlanetCatalog":
+        """
+        Copy with the station boost replaced for every body named in `boosters`.
+        """
+        boost = self.station_boost_for_thrust_power_launch.copy()
+        boost[self.indices(list(boosters))] = np.fromiter(boosters.values(), dtype=np.float64, count=len(boosters))
+        return PlanetCatalog(self.names, boost, self.atmosphere_altitude, self.distance_from_the_sun, self.surface_gravety_g)
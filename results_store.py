@@ -0,0 +1,471 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from feasibility import FeasibilityReport
+
+SCHEMAS: Dict[str, Dict[str, str]] = {
+    "solves": {
+        "scenario": "string",
+        "ship": "string",
+        "solver": "string",
+        "total_s": "float64",
+        "runtime_s": "float64",
+        "tour": "list<string>",
+        "leg_s": "list<float64>",
+    },
+    "feasibility": {
+        "scenario": "string",
+        "ship": "string",
+        "planet": "string",
+        "feasible": "bool",
+        "reason": "int8",
+        "margin": "float64",
+    },
+}
+"""
+columns of each table: "string" columns are dictionary encoded (int32 codes + the distinct
+values), "list<...>" columns are flat values + int64 offsets, like Arrow lays them out
+"""
+BACKENDS = ("arrow", "numpy")
+
+
+def default_backend() -> str:
+    """
+    "arrow" when pyarrow is installed, "numpy" otherwise.
+    """
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return "numpy"
+    return "arrow"
+
+
+def _encode(values: Sequence[str]) -> Tuple[np.ndarray, List[str]]:
+    dictionary: Dict[str, int] = {}
+    codes = np.fromiter((dictionary.setdefault(value, len(dictionary)) for value in values), dtype=np.int32, count=len(values))
+    return codes, list(dictionary)
+
+
+def _merge_codes(chunks: Sequence[Tuple[np.ndarray, Sequence[str]]]) -> Tuple[np.ndarray, List[str]]:
+    """
+    Concatenates dictionary encoded chunks under one dictionary, without decoding them.
+    """
+    merged: Dict[str, int] = {}
+    parts = []
+    for codes, dictionary in chunks:
+        lookup = np.array([merged.setdefault(value, len(merged)) for value in dictionary], dtype=np.int32)
+        parts.append(lookup[codes] if len(codes) else np.empty(0, dtype=np.int32))
+    return (np.concatenate(parts) if parts else np.empty(0, dtype=np.int32)), list(merged)
+
+
+class _Column:
+    """
+    One stored column: `values` (codes for strings), `offsets` for list columns and
+    `dictionary` for string values. Arrays read back are views of the memory-mapped part.
+    The dictionary is a list while writing, and a memory-mapped fixed-width NumPy array
+    or an Arrow StringArray once read, so one name is looked up without loading them all.
+    """
+
+    def __init__(self, kind: str, values: np.ndarray, offsets: Optional[np.ndarray] = None, dictionary: Any = None):
+        self.kind = kind
+        self.values = values
+        self.offsets = offsets
+        self.dictionary = dictionary
+
+    def lookup(self, value: str) -> Optional[int]:
+        """
+        Code of `value`, None when the part does not contain it.
+        """
+        dictionary = self.dictionary
+        if isinstance(dictionary, list):
+            return dictionary.index(value) if value in dictionary else None
+        if isinstance(dictionary, np.ndarray):
+            hits = np.flatnonzero(dictionary == value)
+            return int(hits[0]) if len(hits) else None
+        import pyarrow.compute as pc
+
+        code = pc.index(dictionary, value).as_py()
+        return None if code < 0 else code
+
+    def names(self, codes: np.ndarray) -> np.ndarray:
+        dictionary = self.dictionary
+        if isinstance(dictionary, list):
+            return np.asarray(dictionary, dtype=object)[codes]
+        if isinstance(dictionary, np.ndarray):
+            return dictionary[codes].astype(object)
+        return dictionary.take(np.asarray(codes)).to_numpy(zero_copy_only=False).astype(object)
+
+    def decode(self, rows: Optional[np.ndarray]) -> np.ndarray:
+        """
+        The column as a NumPy array for `rows` (all rows when None). Numeric columns of all
+        rows are returned without copying; list columns become object arrays of per-row views.
+        """
+        if self.offsets is None:
+            values = self.values if rows is None else self.values[rows]
+            if self.dictionary is not None:
+                return self.names(values)
+            return values
+        starts, ends = (self.offsets[:-1], self.offsets[1:]) if rows is None else (self.offsets[rows], self.offsets[rows + 1])
+        out = np.empty(len(starts), dtype=object)
+        if self.dictionary is not None:
+            for i, (start, end) in enumerate(zip(starts.tolist(), ends.tolist())):
+                out[i] = self.names(self.values[start:end]).tolist()
+        else:
+            for i, (start, end) in enumerate(zip(starts.tolist(), ends.tolist())):
+                out[i] = self.values[start:end]
+        return out
+
+
+class ResultsStore:
+    """_summary_
+    Append-only columnar store of solve results and feasibility cubes, one directory per store.
+
+    Rows are buffered and written in batches of `batch_rows` as immutable part files:
+    Arrow IPC files when pyarrow is installed, otherwise one `.npy` file per column. Both
+    are read back memory-mapped, so numeric columns (total time, runtime, leg costs,
+    margins) are zero-copy views and a query only touches the columns it names; string
+    filters are checked against each part's dictionary first, so parts without a match
+    are skipped. Every process writes its own part names, so pool workers and nightly
+    sweeps can share a store. `export_parquet` produces one Parquet file per table.
+    """
+
+    def __init__(self, directory: str, backend: Optional[str] = None, batch_rows: int = 65_536):
+        """
+        Raises:
+            ValueError: for an unknown backend.
+        """
+        backend = backend or default_backend()
+        if backend not in BACKENDS:
+            raise ValueError(f"unknown results backend {backend}, expected one of {BACKENDS}")
+        self.directory = directory
+        self.backend = backend
+        self.batch_rows = batch_rows
+        self._lock = threading.Lock()
+        self._sequence = 0
+        self._solves: List[tuple] = []
+        self._feasibility: List[Dict[str, Any]] = []
+        self._feasibility_rows = 0
+        for table in SCHEMAS:
+            os.makedirs(os.path.join(directory, table), exist_ok=True)
+
+    def __enter__(self) -> "ResultsStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def append_solve(self, scenario: str, result: tuple, solver: str, runtime_s: float = float("nan")) -> None:
+        """
+        Buffers one `(shipName, legs, tour_time, summary)` result, as returned by the TspUtils
+        solvers and `TspCache.tsp`.
+        """
+        ship, legs, tour_time, _ = result
+        tour = [legs[0]["source"]] + [leg["destination"] for leg in legs] if legs else []
+        row = (scenario, ship, solver, tour_time.total_seconds(), float(runtime_s), tour, [leg["cost"].total_seconds() for leg in legs])
+        with self._lock:
+            self._solves.append(row)
+            full = len(self._solves) >= self.batch_rows
+        if full:
+            self.flush()
+
+    def append_feasibility(self, report: "FeasibilityReport", scenarios: Optional[Sequence[str]] = None) -> None:
+        """
+        Buffers a feasibility cube as one row per (ship, planet, scenario), without a Python
+        object per row. `scenarios` renames the report's scenarios, e.g. when it was built by
+        `evaluate_planet_list` under "default".
+        """
+        ships, planets, count = report.feasible.shape
+        scenario_names = list(scenarios) if scenarios is not None else list(report.scenario_names)
+        block = {
+            "scenario": (np.tile(np.arange(count, dtype=np.int32), ships * planets), scenario_names),
+            "ship": (np.repeat(np.arange(ships, dtype=np.int32), planets * count), list(report.ship_names)),
+            "planet": (np.tile(np.repeat(np.arange(planets, dtype=np.int32), count), ships), list(report.planet_names)),
+            "feasible": np.ascontiguousarray(report.feasible, dtype=bool).ravel(),
+            "reason": np.ascontiguousarray(report.reason, dtype=np.int8).ravel(),
+            "margin": np.ascontiguousarray(report.margin, dtype=np.float64).ravel(),
+        }
+        with self._lock:
+            self._feasibility.append(block)
+            self._feasibility_rows += ships * planets * count
+            full = self._feasibility_rows >= self.batch_rows
+        if full:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Writes the buffered rows as new part files.
+        """
+        with self._lock:
+            solves, self._solves = self._solves, []
+            blocks, self._feasibility = self._feasibility, []
+            self._feasibility_rows = 0
+            if solves:
+                self._write_part("solves", self._solve_columns(solves), len(solves))
+            if blocks:
+                self._write_part("feasibility", self._feasibility_columns(blocks), sum(len(block["feasible"]) for block in blocks))
+
+    def close(self) -> None:
+        self.flush()
+
+    @staticmethod
+    def _solve_columns(rows: List[tuple]) -> Dict[str, _Column]:
+        scenario, ship, solver, total_s, runtime_s, tours, legs = zip(*rows)
+        offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum([len(tour) for tour in tours], out=offsets[1:])
+        leg_offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum([len(leg) for leg in legs], out=leg_offsets[1:])
+        tour_codes, tour_names = _encode([name for tour in tours for name in tour])
+        columns = {}
+        for name, values in (("scenario", scenario), ("ship", ship), ("solver", solver)):
+            codes, dictionary = _encode(values)
+            columns[name] = _Column("string", codes, dictionary=dictionary)
+        columns["total_s"] = _Column("float64", np.asarray(total_s, dtype=np.float64))
+        columns["runtime_s"] = _Column("float64", np.asarray(runtime_s, dtype=np.float64))
+        columns["tour"] = _Column("list<string>", tour_codes, offsets, tour_names)
+        columns["leg_s"] = _Column("list<float64>", np.fromiter((cost for leg in legs for cost in leg), dtype=np.float64, count=int(leg_offsets[-1])), leg_offsets)
+        return columns
+
+    @staticmethod
+    def _feasibility_columns(blocks: List[Dict[str, Any]]) -> Dict[str, _Column]:
+        columns = {}
+        for name, kind in SCHEMAS["feasibility"].items():
+            if kind == "string":
+                codes, dictionary = _merge_codes([block[name] for block in blocks])
+                columns[name] = _Column(kind, codes, dictionary=dictionary)
+            else:
+                columns[name] = _Column(kind, np.concatenate([block[name] for block in blocks]))
+        return columns
+
+    def _part_name(self) -> str:
+        self._sequence += 1
+        return f"part-{time.time_ns():020d}-{os.getpid()}-{self._sequence:06d}"
+
+    def _write_part(self, table: str, columns: Dict[str, _Column], rows: int) -> str:
+        """
+        Writes one part under a temporary name and renames it into place, so readers never
+        see a partial part.
+        """
+        directory = os.path.join(self.directory, table)
+        name = self._part_name()
+        if self.backend == "arrow":
+            import pyarrow as pa
+
+            batch = pa.RecordBatch.from_arrays([self._arrow_array(column) for column in columns.values()], names=list(columns))
+            path = os.path.join(directory, name + ".arrow")
+            handle, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            os.close(handle)
+            try:
+                with pa.OSFile(temporary, "wb") as sink, pa.ipc.new_file(sink, batch.schema) as writer:
+                    writer.write_batch(batch)
+                os.replace(temporary, path)
+            except BaseException:
+                if os.path.exists(temporary):
+                    os.remove(temporary)
+                raise
+            return path
+
+        path = os.path.join(directory, name)
+        temporary = tempfile.mkdtemp(dir=directory, suffix=".tmp")
+        try:
+            schema = {"rows": rows, "columns": {}}
+            for column_name, column in columns.items():
+                np.save(os.path.join(temporary, f"{column_name}.npy"), column.values)
+                if column.offsets is not None:
+                    np.save(os.path.join(temporary, f"{column_name}.offsets.npy"), column.offsets)
+                if column.dictionary is not None:
+                    # fixed-width unicode, so the dictionary is memory-mapped too
+                    np.save(os.path.join(temporary, f"{column_name}.dictionary.npy"), np.asarray(column.dictionary, dtype=str))
+                schema["columns"][column_name] = {"type": column.kind}
+            with open(os.path.join(temporary, "schema.json"), "w", encoding="utf-8") as f:
+                json.dump(schema, f, ensure_ascii=False)
+            os.rename(temporary, path)
+        except BaseException:
+            shutil.rmtree(temporary, ignore_errors=True)
+            raise
+        return path
+
+    def parts(self, table: str) -> List[str]:
+        """
+        Finished part files of `table`, oldest first.
+
+        Raises:
+            KeyError: for an unknown table.
+        """
+        if table not in SCHEMAS:
+            raise KeyError(f"unknown results table {table}, expected one of {tuple(SCHEMAS)}")
+        directory = os.path.join(self.directory, table)
+        return [os.path.join(directory, name) for name in sorted(os.listdir(directory)) if name.startswith("part-") and not name.endswith(".tmp")]
+
+    @staticmethod
+    def _arrow_array(column: _Column):
+        import pyarrow as pa
+
+        values = np.asarray(column.values)
+        if column.dictionary is not None:
+            dictionary = column.dictionary if isinstance(column.dictionary, pa.Array) else pa.array(list(column.dictionary), type=pa.string())
+            array = pa.DictionaryArray.from_arrays(values, dictionary)
+        else:
+            array = pa.array(values)
+        if column.offsets is not None:
+            array = pa.LargeListArray.from_arrays(np.asarray(column.offsets), array)
+        return array
+
+    @staticmethod
+    def _read_part(path: str, table: str) -> Dict[str, _Column]:
+        """
+        Memory-maps one part. The NumPy views keep the mapping alive after the file is closed.
+        """
+        if path.endswith(".arrow"):
+            import pyarrow as pa
+
+            with pa.memory_map(path, "r") as source:
+                batch = pa.ipc.open_file(source).get_batch(0)
+            columns = {}
+            for name, kind in SCHEMAS[table].items():
+                array = batch.column(name)
+                offsets = None
+                if kind.startswith("list<"):
+                    offsets = array.offsets.to_numpy()
+                    array = array.values
+                if "string" in kind:
+                    columns[name] = _Column(kind, array.indices.to_numpy(), offsets, array.dictionary)
+                else:
+                    # Arrow packs booleans into bits, only those are copied
+                    columns[name] = _Column(kind, array.to_numpy(zero_copy_only=kind != "bool"), offsets)
+            return columns
+
+        with open(os.path.join(path, "schema.json"), encoding="utf-8") as f:
+            schema = json.load(f)
+        columns = {}
+        for name, description in schema["columns"].items():
+            offsets_path = os.path.join(path, f"{name}.offsets.npy")
+            dictionary_path = os.path.join(path, f"{name}.dictionary.npy")
+            columns[name] = _Column(
+                description["type"],
+                np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r"),
+                np.load(offsets_path, mmap_mode="r") if os.path.exists(offsets_path) else None,
+                np.load(dictionary_path, mmap_mode="r") if os.path.exists(dictionary_path) else None,
+            )
+        return columns
+
+    def scan(self, table: str, columns: Optional[Sequence[str]] = None, **equals: str) -> Iterator[Dict[str, np.ndarray]]:
+        """
+        Yields the rows of each part as column name -> NumPy array, keeping only the rows
+        whose string columns equal `equals` (e.g. scenario="minimal", ship="Ariane 5").
+        Unfiltered numeric columns are zero-copy views of the memory-mapped part.
+
+        Raises:
+            KeyError: for an unknown table, column or filter.
+        """
+        if table not in SCHEMAS:
+            raise KeyError(f"unknown results table {table}, expected one of {tuple(SCHEMAS)}")
+        schema = SCHEMAS[table]
+        wanted = list(columns) if columns is not None else list(schema)
+        for name in [*wanted, *equals]:
+            if name not in schema:
+                raise KeyError(f"unknown column {name} of {table}")
+        for name in equals:
+            if schema[name] != "string":
+                raise KeyError(f"{name} of {table} is not a string column, it cannot be filtered on")
+        self.flush()
+        for path in self.parts(table):
+            part = self._read_part(path, table)
+            rows = self._matching_rows(part, equals)
+            if rows is not None and len(rows) == 0:
+                continue
+            yield {name: part[name].decode(rows) for name in wanted}
+
+    @staticmethod
+    def _matching_rows(part: Dict[str, _Column], equals: Dict[str, str]) -> Optional[np.ndarray]:
+        """
+        Indices of the rows matching every filter, None for all rows. A value missing from
+        a part's dictionary rules the part out without reading its codes.
+        """
+        mask = None
+        for name, value in equals.items():
+            code = part[name].lookup(value)
+            if code is None:
+                return np.empty(0, dtype=np.int64)
+            match = np.asarray(part[name].values) == code
+            mask = match if mask is None else mask & match
+        return None if mask is None else np.flatnonzero(mask)
+
+    def read(self, table: str, columns: Optional[Sequence[str]] = None, **equals: str) -> "pd.DataFrame":
+        """
+        `scan` collected into one DataFrame; name the columns and filters to keep it small.
+        """
+        import pandas as pd
+
+        wanted = list(columns) if columns is not None else list(SCHEMAS.get(table, {}))
+        frames = [pd.DataFrame(batch) for batch in self.scan(table, columns, **equals)]
+        if not frames:
+            return pd.DataFrame(columns=wanted)
+        return pd.concat(frames, ignore_index=True)
+
+    def fastest(self, **equals: str) -> "pd.DataFrame":
+        """
+        Fastest stored solve per scenario. Only the scenario codes and total_s of each part
+        are scanned; ship and solver names are decoded for the winning rows alone.
+
+        Raises:
+            KeyError: for an unknown filter.
+        """
+        import pandas as pd
+
+        for name in equals:
+            if SCHEMAS["solves"].get(name) != "string":
+                raise KeyError(f"unknown string column {name} of solves")
+        self.flush()
+        best: Dict[str, tuple] = {}
+        for path in self.parts("solves"):
+            part = self._read_part(path, "solves")
+            rows = self._matching_rows(part, equals)
+            if rows is None:
+                rows = np.arange(len(part["total_s"].values))
+            codes, totals = part["scenario"].values[rows], part["total_s"].values[rows]
+            # sorted by scenario then total time: the first row of each scenario is its fastest
+            order = np.lexsort((totals, codes))
+            _, first = np.unique(codes[order], return_index=True)
+            for row in rows[order[first]].tolist():
+                candidate = tuple(part[name].decode(np.array([row]))[0] for name in ("scenario", "ship", "solver", "total_s"))
+                if candidate[0] not in best or candidate[3] < best[candidate[0]][3]:
+                    best[candidate[0]] = candidate
+        return pd.DataFrame(list(best.values()), columns=["scenario", "ship", "solver", "total_s"])
+
+    def export_parquet(self, table: str, path: str) -> str:
+        """
+        Streams every part of `table` into one Parquet file, one row group per part.
+        Needs pyarrow; works on stores written by either backend.
+
+        Raises:
+            ImportError: without pyarrow.
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("exporting results to Parquet needs the optional pyarrow package (pip install pyarrow)") from e
+
+        self.flush()
+        writer = None
+        try:
+            for part_path in self.parts(table):
+                part = self._read_part(part_path, table)
+                batch = pa.Table.from_arrays([self._arrow_array(column) for column in part.values()], names=list(part))
+                if writer is None:
+                    writer = pq.ParquetWriter(path, batch.schema)
+                writer.write_table(batch)
+        finally:
+            if writer is not None:
+                writer.close()
+        return path
@@ -0,0 +1,265 @@
+from abc import ABC
+from dataclasses import dataclass
+import os
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from bulk_construction import PLANET_COLUMNS
+from fleet import Fleet
+from planet_catalog import PlanetCatalog
+
+BOOSTER_MAXIMA: Dict[str, float] = {"minimal": 3_000.0, "realistic": 5_000.0, "extreme": 10_000.0}
+"""
+highest booster power (N) of each built-in `Scenarios` profile
+"""
+
+ROCKY, GAS_GIANT, DWARF = 0, 1, 2
+
+
+@dataclass
+class SyntheticBodies:
+    catalog: PlanetCatalog
+    air_density: np.ndarray
+    """
+    atmosphere density relative to Earth per body (Venus ~343, Mars ~0.016, 0 without air);
+    a ship's air friction on a body is its Earth friction times this factor
+    """
+    kind: np.ndarray
+    """
+    ROCKY, GAS_GIANT or DWARF per body
+    """
+
+
+class ScenarioGenerator(ABC):
+    """_summary_
+    Seeded generator of planet catalogues, booster profiles and fleets of any size.
+
+    The distributions follow the built-in data: distances are log-uniform between Mercury's
+    and Pluto's orbits; rocky bodies, gas giants and dwarfs get their own altitude, gravity
+    and air density ranges; ships have log-normal mass, thrust proportional to mass, and
+    friction = (Earth friction of the ship) x (air density of the body), which is the exact
+    structure of `Scenarios.spaceshipData`.
+
+    Everything is produced as NumPy columns, `chunk_rows` rows at a time, so multi-million
+    row scenarios never build one Python object per body or ship. Chunk i is drawn from
+    `default_rng([seed, i])`: the same seed and chunk size always give the same data.
+    """
+
+    @staticmethod
+    def planet_chunks(n: int, seed: int = 0, chunk_rows: int = 100_000, prefix: str = "Body", include_star: bool = False) -> Iterator[Dict[str, np.ndarray]]:
+        """
+        Yields `PLANET_COLUMNS` plus "air_density" and "kind" for `n` bodies, chunk by chunk.
+        With `include_star` the first body is a sun: distance 0, no atmosphere, gravity 274.
+        """
+        for chunk, start in enumerate(range(0, n, chunk_rows)):
+            rows = min(chunk_rows, n - start)
+            rng = np.random.default_rng([seed, chunk])
+            distance = 10 ** rng.uniform(np.log10(57.9), np.log10(5906.0), rows)
+
+            # gas giants live beyond the asteroid belt, dwarfs anywhere but mostly far out
+            outer = distance > 600.0
+            draw = rng.random(rows)
+            kind = np.where(draw < np.where(outer, 0.25, 0.10), DWARF, np.where(outer & (draw < 0.85), GAS_GIANT, ROCKY)).astype(np.int8)
+
+            altitude = np.select(
+                [kind == ROCKY, kind == GAS_GIANT],
+                [rng.lognormal(np.log(150.0), 0.4, rows), rng.lognormal(np.log(4_000.0), 0.25, rows)],
+                rng.lognormal(np.log(50.0), 0.3, rows),
+            )
+            gravity = np.select(
+                [kind == ROCKY, kind == GAS_GIANT],
+                [rng.uniform(3.0, 11.0, rows), rng.uniform(8.0, 25.0, rows)],
+                rng.uniform(0.1, 1.0, rows),
+            )
+            # a third of the rocky bodies have no air (Mercury), the rest from Mars to Venus
+            rocky_air = np.where(rng.random(rows) < 1 / 3, 0.0, np.exp(rng.normal(0.0, 2.5, rows)))
+            air_density = np.select(
+                [kind == ROCKY, kind == GAS_GIANT],
+                [rocky_air, rng.lognormal(np.log(0.2), 0.5, rows)],
+                0.0,
+            )
+            if include_star and start == 0:
+                distance[0], altitude[0], gravity[0], air_density[0], kind[0] = 0.0, 0.0, 274.0, 0.0, DWARF
+
+            yield {
+                "name": np.array([f"{prefix}-{i:07d}" for i in range(start, start + rows)], dtype=object),
+                "station_boost_for_thrust_power_launch": np.zeros(rows),
+                "atmosphere_altitude": altitude,
+                "distance_from_the_sun": distance,
+                "surface_gravety_g": gravity,
+                "air_density": air_density,
+                "kind": kind,
+            }
+
+    @staticmethod
+    def bodies(n: int, seed: int = 0, chunk_rows: int = 100_000, prefix: str = "Body", include_star: bool = False) -> SyntheticBodies:
+        """
+        The whole catalogue of `planet_chunks` in memory, with no station boost.
+        """
+        chunks = list(ScenarioGenerator.planet_chunks(n, seed, chunk_rows, prefix, include_star))
+
+        def column(name: str) -> np.ndarray:
+            return np.concatenate([chunk[name] for chunk in chunks]) if chunks else np.empty(0)
+
+        names = [name for chunk in chunks for name in chunk["name"].tolist()]
+        catalog = PlanetCatalog._trusted(names, [column(name) for name in PLANET_COLUMNS[1:]])
+        return SyntheticBodies(catalog=catalog, air_density=column("air_density"), kind=column("kind").astype(np.int8))
+
+    @staticmethod
+    def booster_profiles(
+        n: int,
+        seed: int = 0,
+        maxima: Mapping[str, float] = BOOSTER_MAXIMA,
+        unboosted_fraction: float = 0.25,
+    ) -> Dict[str, np.ndarray]:
+        """
+        scenario name -> booster power (N) per body, aligned with the catalogue rows.
+        Like the built-in profiles, a share of the bodies get no booster at all.
+        """
+        profiles = {}
+        for i, (name, maximum) in enumerate(maxima.items()):
+            rng = np.random.default_rng([seed, 1_000_003, i])
+            boost = rng.uniform(0.1, 1.0, n) * maximum
+            boost[rng.random(n) < unboosted_fraction] = 0.0
+            profiles[name] = boost
+        return profiles
+
+    @staticmethod
+    def with_boost(catalog: PlanetCatalog, boost: np.ndarray) -> PlanetCatalog:
+        """
+        Array version of `PlanetCatalog.with_boosters` for a profile from `booster_profiles`.
+        """
+        _, altitude, distance, gravity = catalog.columns()
+        return PlanetCatalog._trusted(catalog.names, [boost, altitude, distance, gravity], index=catalog.index)
+
+    @staticmethod
+    def ship_chunks(
+        n: int,
+        air_density: np.ndarray,
+        seed: int = 0,
+        chunk_rows: int = 100_000,
+        prefix: str = "Ship",
+        reliable_on: Optional[PlanetCatalog] = None,
+    ) -> Iterator[Dict[str, np.ndarray]]:
+        """
+        Yields "name", "mass", "engine_thrust_power" and a (rows, bodies) "friction" matrix.
+
+        Args:
+            air_density (np.ndarray): per body, from `SyntheticBodies.air_density`.
+            reliable_on (PlanetCatalog): when given, each ship's drag is capped so it can exit
+                and land on every body of this catalogue (same rows as `air_density`),
+                for benchmarks and tests that need feasible tours.
+        """
+        air_density = np.asarray(air_density, dtype=np.float64)
+        for chunk, start in enumerate(range(0, n, chunk_rows)):
+            rows = min(chunk_rows, n - start)
+            rng = np.random.default_rng([seed, 2_000_003, chunk])
+            # 2 kg (Draco) to 100 t (Millennium Falcon), thrust 400 to 1800 N per kg
+            mass = np.clip(rng.lognormal(np.log(2_000.0), 1.5, rows), 1.0, 1e6)
+            thrust = mass * rng.lognormal(np.log(900.0), 0.5, rows)
+            # Earth friction per kg: 0.4 (Millennium Falcon) to 3 (Draco)
+            drag = mass * rng.lognormal(np.log(1.5), 0.6, rows)
+            if reliable_on is not None:
+                _, _, _, gravity = reliable_on.columns()
+                with np.errstate(divide="ignore"):
+                    headroom = np.where(air_density > 0, (thrust[:, None] - mass[:, None] * gravity[None, :]) / air_density[None, :], np.inf)
+                drag = np.minimum(drag, 0.9 * headroom.min(axis=1, initial=np.inf))
+                thrust = np.maximum(thrust, 1.1 * mass * gravity.max(initial=0.0))
+            yield {
+                "name": np.array([f"{prefix}-{i:07d}" for i in range(start, start + rows)], dtype=object),
+                "mass": mass,
+                "engine_thrust_power": thrust,
+                "friction": drag[:, None] * air_density[None, :],
+            }
+
+    @staticmethod
+    def fleet(
+        n: int,
+        bodies: SyntheticBodies,
+        seed: int = 0,
+        chunk_rows: int = 100_000,
+        prefix: str = "Ship",
+        reliable: bool = False,
+    ) -> Fleet:
+        """
+        The whole fleet of `ship_chunks` for `bodies`, friction columns named after its catalogue.
+        """
+        chunks = list(ScenarioGenerator.ship_chunks(n, bodies.air_density, seed, chunk_rows, prefix, bodies.catalog if reliable else None))
+        planets = len(bodies.catalog)
+        return Fleet._trusted(
+            [name for chunk in chunks for name in chunk["name"].tolist()],
+            np.concatenate([chunk["mass"] for chunk in chunks]) if chunks else np.empty(0),
+            np.concatenate([chunk["engine_thrust_power"] for chunk in chunks]) if chunks else np.empty(0),
+            bodies.catalog.names,
+            np.concatenate([chunk["friction"] for chunk in chunks]) if chunks else np.empty((0, planets)),
+        )
+
+    @staticmethod
+    def write_directory(
+        directory: str,
+        planets: int,
+        ships: int,
+        seed: int = 0,
+        file_format: str = "csv",
+        chunk_rows: int = 100_000,
+        include_star: bool = True,
+    ) -> List[str]:
+        """
+        Streams a generated scenario to `planets.*`, `boosters.*` and `fleet.*` in the layout
+        `ScenarioLoader.load_directory` reads, one chunk in memory at a time.
+        The fleet has one friction column per body, so keep `planets` small when `ships` is large.
+        Returns the written paths.
+        """
+        import pandas as pd
+
+        extension = {"csv": ".csv", "jsonl": ".jsonl", "parquet": ".parquet"}[file_format]
+        os.makedirs(directory, exist_ok=True)
+        paths = {stem: os.path.join(directory, stem + extension) for stem in ("planets", "boosters", "fleet")}
+        writers: Dict[str, object] = {}
+
+        def write(stem: str, table: pd.DataFrame) -> None:
+            path = paths[stem]
+            if file_format == "csv":
+                table.to_csv(path, mode="a" if stem in writers else "w", header=stem not in writers, index=False)
+                writers[stem] = True
+            elif file_format == "jsonl":
+                with open(path, "a" if stem in writers else "w", encoding="utf-8") as f:
+                    f.write(table.to_json(orient="records", lines=True, force_ascii=False))
+                writers[stem] = True
+            else:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+
+                batch = pa.Table.from_pandas(table, preserve_index=False)
+                if stem not in writers:
+                    writers[stem] = pq.ParquetWriter(path, batch.schema)
+                writers[stem].write_table(batch)
+
+        try:
+            air_density: List[np.ndarray] = []
+            planet_names: List[str] = []
+            for chunk in ScenarioGenerator.planet_chunks(planets, seed, chunk_rows, include_star=include_star):
+                air_density.append(chunk["air_density"])
+                planet_names.extend(chunk["name"].tolist())
+                write("planets", pd.DataFrame({column: chunk[column] for column in PLANET_COLUMNS}))
+            air = np.concatenate(air_density) if air_density else np.empty(0)
+
+            profiles = ScenarioGenerator.booster_profiles(planets, seed)
+            names = np.array(planet_names, dtype=object)
+            for start in range(0, planets, chunk_rows):
+                rows = slice(start, start + chunk_rows)
+                write("boosters", pd.concat(
+                    [pd.DataFrame({"scenario": scenario, "planet": names[rows], "boost": boost[rows]}) for scenario, boost in profiles.items()],
+                    ignore_index=True,
+                ))
+
+            for chunk in ScenarioGenerator.ship_chunks(ships, air, seed, chunk_rows):
+                table = pd.DataFrame({"name": chunk["name"], "mass": chunk["mass"], "engine_thrust_power": chunk["engine_thrust_power"]})
+                friction = pd.DataFrame(chunk["friction"], columns=planet_names)
+                write("fleet", pd.concat([table, friction], axis=1))
+        finally:
+            for writer in writers.values():
+                if writer is not True:
+                    writer.close()
+        return [paths[stem] for stem in ("planets", "boosters", "fleet") if stem in writers]
@@ -0,0 +1,229 @@
+from abc import ABC
+from dataclasses import dataclass, field
+import os
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from bulk_construction import PLANET_COLUMNS, SHIP_COLUMNS, BulkConstructor, ValidationReport
+from fleet import Fleet
+from planet_catalog import PlanetCatalog
+
+FORMATS = {".jsonl": "jsonl", ".ndjson": "jsonl", ".csv": "csv", ".parquet": "parquet", ".pq": "parquet"}
+BOOSTER_COLUMNS = ("scenario", "planet", "boost")
+
+
+@dataclass
+class ScenarioData:
+    catalog: PlanetCatalog
+    """
+    the bodies, their own station boost is the baseline every profile overrides
+    """
+    booster_profiles: Dict[str, Dict[str, float]]
+    """
+    scenario name -> booster power (N) per planet name, as taken by FeasibilityEngine.evaluate
+    """
+    fleet: Fleet
+    reports: Dict[str, ValidationReport] = field(default_factory=dict)
+    """
+    validation report per file kind: "planets", "boosters", "fleet"
+    """
+
+    def scenarios(self) -> Iterator[Tuple[str, PlanetCatalog]]:
+        """
+        Yields (scenario name, catalogue with that scenario's boosters), one at a time.
+        """
+        for name, profile in self.booster_profiles.items():
+            yield name, self.catalog.with_boosters(profile)
+
+
+class ScenarioLoader(ABC):
+    """_summary_
+    Reads planet catalogues, booster profiles and fleets from JSON Lines, CSV or Parquet files
+    in chunks of `chunk_rows` rows, and turns every chunk into array-backed objects through
+    `BulkConstructor`. The `iter_*` methods never hold more than one chunk of raw rows,
+    the `load_*` methods build one object for the whole file.
+    Parquet needs the optional pyarrow package, imported only when a Parquet file is read.
+
+    File layouts (one row per line / record):
+        planets: name, station_boost_for_thrust_power_launch, atmosphere_altitude,
+            distance_from_the_sun, surface_gravety_g
+        boosters: scenario, planet, boost
+        fleet: name, mass, engine_thrust_power, then one air friction column per planet
+    """
+
+    @staticmethod
+    def file_format(path: str) -> str:
+        """
+        Raises:
+            ValueError: for an unsupported extension.
+        """
+        extension = os.path.splitext(path)[1].lower()
+        if extension not in FORMATS:
+            raise ValueError(f"unsupported scenario file {path}, expected one of {sorted(FORMATS)}")
+        return FORMATS[extension]
+
+    @staticmethod
+    def iter_chunks(path: str, chunk_rows: int = 100_000, text_columns: Sequence[str] = ("name",)) -> Iterator[pd.DataFrame]:
+        """
+        Yields the rows of a file as DataFrames of at most `chunk_rows` rows.
+        `text_columns` are read as strings even when they look like numbers.
+        """
+        file_format = ScenarioLoader.file_format(path)
+        if file_format == "csv":
+            reader = pd.read_csv(path, chunksize=chunk_rows, dtype={column: str for column in text_columns}, keep_default_na=False, na_values=[""])
+            with reader:
+                for chunk in reader:
+                    # CSV has no types: a stray word must not turn a whole numeric column into text
+                    for column in chunk.columns:
+                        if column not in text_columns and not pd.api.types.is_numeric_dtype(chunk[column]):
+                            chunk[column] = pd.to_numeric(chunk[column], errors="coerce")
+                    yield chunk
+        elif file_format == "jsonl":
+            with pd.read_json(path, lines=True, chunksize=chunk_rows, dtype=False) as reader:
+                yield from reader
+        else:
+            try:
+                import pyarrow.parquet as pq
+            except ImportError as e:
+                raise ImportError("reading Parquet scenario files needs the optional pyarrow package (pip install pyarrow)") from e
+            parquet_file = pq.ParquetFile(path)
+            for batch in parquet_file.iter_batches(batch_size=chunk_rows):
+                yield batch.to_pandas()
+
+    @staticmethod
+    def iter_planet_catalogs(path: str, chunk_rows: int = 100_000) -> Iterator[Tuple[PlanetCatalog, ValidationReport]]:
+        """
+        One (catalogue, report) per chunk; report rows are relative to the chunk and names
+        are only checked for duplicates within it.
+        """
+        for chunk in ScenarioLoader.iter_chunks(path, chunk_rows):
+            yield BulkConstructor.planet_catalog(chunk)
+
+    @staticmethod
+    def load_planet_catalog(path: str, chunk_rows: int = 100_000) -> Tuple[PlanetCatalog, ValidationReport]:
+        """
+        Whole-file catalogue; only the planet columns of each chunk are kept while reading.
+        """
+        chunks = [chunk.reindex(columns=[column for column in PLANET_COLUMNS if column in chunk]) for chunk in ScenarioLoader.iter_chunks(path, chunk_rows)]
+        table = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=list(PLANET_COLUMNS))
+        return BulkConstructor.planet_catalog(table)
+
+    @staticmethod
+    def load_booster_profiles(path: str, known_planets: Optional[Sequence[str]] = None, chunk_rows: int = 100_000) -> Tuple[Dict[str, Dict[str, float]], ValidationReport]:
+        """
+        Reads a long (scenario, planet, boost) table into scenario -> planet -> boost.
+        Rows with a missing column value, a negative or non-finite boost, or a planet
+        outside `known_planets` are reported and skipped.
+        """
+        profiles: Dict[str, Dict[str, float]] = {}
+        report = ValidationReport(total_rows=0, valid=np.ones(0, dtype=bool))
+        known = set(known_planets) if known_planets is not None else None
+        for chunk in ScenarioLoader.iter_chunks(path, chunk_rows, text_columns=("scenario", "planet")):
+            chunk_report = ValidationReport(total_rows=len(chunk), valid=np.ones(len(chunk), dtype=bool))
+            missing = [column for column in BOOSTER_COLUMNS if column not in chunk]
+            for column in missing:
+                chunk_report.add_column_issue(column, "missing column")
+            if not missing:
+                scenario = chunk["scenario"].to_numpy(dtype=object)
+                planet = chunk["planet"].to_numpy(dtype=object)
+                chunk_report.add("scenario", "expected a string", ~pd.Series(scenario).map(lambda value: isinstance(value, str)).to_numpy(dtype=bool))
+                chunk_report.add("planet", "expected a string", ~pd.Series(planet).map(lambda value: isinstance(value, str)).to_numpy(dtype=bool))
+                if known is not None:
+                    chunk_report.add("planet", "unknown planet", chunk_report.valid & ~pd.Series(planet).isin(known).to_numpy())
+                boost = pd.to_numeric(chunk["boost"], errors="coerce").to_numpy(dtype=np.float64)
+                chunk_report.add("boost", "not a finite number", ~np.isfinite(boost))
+                chunk_report.add("boost", "must be >= 0.0", np.isfinite(boost) & (boost < 0))
+                for row in np.flatnonzero(chunk_report.valid):
+                    profiles.setdefault(scenario[row], {})[planet[row]] = float(boost[row])
+            report.extend(chunk_report)
+        return profiles, report
+
+    @staticmethod
+    def iter_fleets(path: str, planet_names: Optional[Sequence[str]] = None, chunk_rows: int = 100_000) -> Iterator[Tuple[Fleet, ValidationReport]]:
+        """
+        One (fleet, report) per chunk, see `BulkConstructor.fleet` for `planet_names`.
+        """
+        for chunk in ScenarioLoader.iter_chunks(path, chunk_rows):
+            yield BulkConstructor.fleet(chunk, planet_names=planet_names)
+
+    @staticmethod
+    def load_fleet(path: str, planet_names: Optional[Sequence[str]] = None, chunk_rows: int = 100_000) -> Tuple[Fleet, ValidationReport]:
+        chunks = list(ScenarioLoader.iter_chunks(path, chunk_rows))
+        table = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=list(SHIP_COLUMNS))
+        return BulkConstructor.fleet(table, planet_names=planet_names)
+
+    @staticmethod
+    def find_file(directory: str, stem: str) -> str:
+        """
+        Raises:
+            FileNotFoundError: when `directory` has no `stem`.<supported extension> file.
+        """
+        for extension in FORMATS:
+            path = os.path.join(directory, stem + extension)
+            if os.path.exists(path):
+                return path
+        raise FileNotFoundError(f"no {stem} file in {directory}, expected {stem} with one of {sorted(FORMATS)}")
+
+    @staticmethod
+    def load_directory(directory: str, chunk_rows: int = 100_000) -> ScenarioData:
+        """
+        Loads `planets.*`, `boosters.*` and `fleet.*` from a data directory.
+        Booster planets and fleet friction columns are checked against the catalogue.
+        """
+        catalog, planet_report = ScenarioLoader.load_planet_catalog(ScenarioLoader.find_file(directory, "planets"), chunk_rows)
+        profiles, booster_report = ScenarioLoader.load_booster_profiles(ScenarioLoader.find_file(directory, "boosters"), catalog.names, chunk_rows)
+        fleet, fleet_report = ScenarioLoader.load_fleet(ScenarioLoader.find_file(directory, "fleet"), catalog.names, chunk_rows)
+        return ScenarioData(
+            catalog=catalog,
+            booster_profiles=profiles,
+            fleet=fleet,
+            reports={"planets": planet_report, "boosters": booster_report, "fleet": fleet_report},
+        )
+
+    @staticmethod
+    def export_builtin_scenarios(directory: str, file_format: str = "csv") -> List[str]:
+        """
+        Writes the hard-coded `Scenarios` data (planets with no boost, the three booster
+        profiles and the nine ships) as a data directory, and returns the written paths.
+        """
+        from scenarios import Scenarios
+
+        extension = {"csv": ".csv", "jsonl": ".jsonl", "parquet": ".parquet"}[file_format]
+        planets = Scenarios.construct_planets_with_boosters(boosters={name: 0.0 for name in Scenarios.super_boosters_minimal()})
+        ships = Scenarios.construct_spaceships(spaceshipData=Scenarios.spaceshipData())
+        tables = {
+            "planets": pd.DataFrame({column: [getattr(planet, column) for planet in planets] for column in PLANET_COLUMNS}),
+            "boosters": pd.DataFrame(
+                [
+                    (scenario, planet, float(boost))
+                    for scenario, profile in (
+                        ("extreme", Scenarios.super_boosters_extreme()),
+                        ("realistic", Scenarios.super_boosters_realistic()),
+                        ("minimal", Scenarios.super_boosters_minimal()),
+                    )
+                    for planet, boost in profile.items()
+                ],
+                columns=list(BOOSTER_COLUMNS),
+            ),
+            "fleet": pd.DataFrame(
+                [
+                    {"name": ship.name, "mass": ship.mass, "engine_thrust_power": ship.engine_thrust_power,
+                     **{planet.name: ship.air_friction_on_each_planet[planet.name] for planet in planets}}
+                    for ship in ships
+                ]
+            ),
+        }
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        for stem, table in tables.items():
+            path = os.path.join(directory, stem + extension)
+            if file_format == "csv":
+                table.to_csv(path, index=False)
+            elif file_format == "jsonl":
+                table.to_json(path, orient="records", lines=True, force_ascii=False)
+            else:
+                table.to_parquet(path, index=False)
+            paths.append(path)
+        return paths
@@ -0,0 +1,119 @@
+from dataclasses import dataclass, field
+import math
+from types import MappingProxyType
+from typing import Mapping, Tuple
+
+from custom_exception import MechanicalError
+from node import BasePlanetNode
+
+
+@dataclass(frozen=True)
+class ShipPhysics:
+    """_summary_
+    Pure, stateless version of the SpaceshipNode physics.
+    It is keyed only on mass, thrust and the air friction table (the name is carried for
+    error messages but ignored by hash and equality), never mutates anything, and is
+    hashable and picklable, so calls can be memoised, batched, and shared across threads
+    and processes. All results are float seconds.
+
+    The `compute_*` staticmethods hold the scalar formulas; `SpaceshipNode` delegates to
+    them and `PhysicsKernel` is their vectorised counterpart.
+    """
+
+    mass: float
+    """
+    Spaceship weight in kilograms (kg)
+    """
+    engine_thrust_power: float
+    """
+    Engine thrust power in Newtons (N)
+    """
+    air_friction: Tuple[Tuple[str, float], ...]
+    """
+    (planet name, air friction in N) pairs sorted by planet name
+    """
+    name: str = field(default="", compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "_friction_lookup", dict(self.air_friction))
+
+    @staticmethod
+    def from_values(mass: float, engine_thrust_power: float, air_friction: Mapping[str, float], name: str = "") -> "ShipPhysics":
+        return ShipPhysics(
+            mass=mass,
+            engine_thrust_power=engine_thrust_power,
+            air_friction=tuple(sorted(air_friction.items())),
+            name=name,
+        )
+
+    @property
+    def air_friction_on_each_planet(self) -> Mapping[str, float]:
+        """
+        Read-only view of the friction table, so the snapshot cannot be changed through it.
+        """
+        return MappingProxyType(self._friction_lookup)
+
+    @staticmethod
+    def compute_exit_seconds(mass: float, engine_thrust_power: float, air_friction: float, planet: BasePlanetNode, name: str = "") -> float:
+        """
+        Time to cross the atmosphere: F_net = F_boost + F_thrust - F_friction - m * g, t = sqrt(2d / a).
+        The one scalar implementation, shared by `exit_seconds` and `SpaceshipNode`.
+
+        Raises:
+            MechanicalError: when the net force is zero or negative.
+        """
+        net_force = (
+            planet.station_boost_for_thrust_power_launch
+            + engine_thrust_power
+            - air_friction
+            - mass * planet.surface_gravety_g
+        )
+        if net_force <= 0:
+            raise MechanicalError(f"The spaceship '{name}' cannot overcome the forces acting against it on planet {planet.name}. to  cross the atmosphere")
+        return math.sqrt((2 * planet.atmosphere_altitude * 1000) / (net_force / mass))
+
+    @staticmethod
+    def compute_landing_seconds(mass: float, engine_thrust_power: float, air_friction: float, planet: BasePlanetNode, name: str = "") -> float:
+        """
+        Time to land from the atmosphere: F_net = F_thrust + F_friction - m * g, t = sqrt(2d / |a|).
+
+        Raises:
+            MechanicalError: when the net force is zero or negative.
+        """
+        net_force = engine_thrust_power + air_friction - mass * planet.surface_gravety_g
+        if net_force <= 0:
+            raise MechanicalError(f"The spaceship {name} cannot slow down sufficiently to land safely. on planet {planet.name}")
+        return math.sqrt((2 * planet.atmosphere_altitude * 1000) / abs(net_force / mass))
+
+    @staticmethod
+    def compute_travel_time_scale(mass: float, engine_thrust_power: float) -> float:
+        """
+        Seconds per sqrt(million km): t = sqrt(2 * d * 1e9 / a) = scale * sqrt(d) with a = F / m.
+        """
+        return math.sqrt((2 * 1e9) / (engine_thrust_power / mass))
+
+    def exit_seconds(self, planet: BasePlanetNode) -> float:
+        """
+        Raises:
+            MechanicalError: when the ship cannot cross the atmosphere of `planet`.
+        """
+        return ShipPhysics.compute_exit_seconds(self.mass, self.engine_thrust_power, self._friction_lookup[planet.name], planet, self.name)
+
+    def landing_seconds(self, planet: BasePlanetNode) -> float:
+        """
+        Raises:
+            MechanicalError: when the ship cannot land on `planet`.
+        """
+        return ShipPhysics.compute_landing_seconds(self.mass, self.engine_thrust_power, self._friction_lookup[planet.name], planet, self.name)
+
+    def travel_time_scale(self) -> float:
+        return ShipPhysics.compute_travel_time_scale(self.mass, self.engine_thrust_power)
+
+    def travel_seconds(self, planetA: BasePlanetNode, planetB: BasePlanetNode) -> float:
+        return self.travel_time_scale() * math.sqrt(abs(planetA.distance_from_the_sun - planetB.distance_from_the_sun))
+
+    def leg_seconds(self, planetA: BasePlanetNode, planetB: BasePlanetNode) -> float:
+        """
+        Exit planetA + travel + land on planetB.
+        """
+        return self.exit_seconds(planetA) + self.travel_seconds(planetA, planetB) + self.landing_seconds(planetB)
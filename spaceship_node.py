@@ -1,24 +1,29 @@
 from dataclasses import dataclass, field
 import datetime
+import logging
 import math
 from typing import Dict, Optional
 
 # Assuming these decorators are defined elsewhere
 from custom_exception import MechanicalError
+from event_log import event, get_logger
 from node import BasePlanetNode
+from ship_physics import ShipPhysics
 from validator_decorators import is_float, is_string,is_valid_dict_of_air_friction_forces
 
-@dataclass
+logger = get_logger("physics")
+
+@dataclass(slots=True)
 class SpaceshipNode:
+    """_summary_
+    A single ship. It uses __slots__ (no per-instance __dict__), so every slot is set in
+    __init__; large collections of ships should live in a `fleet.Fleet` instead.
+    """
     
     _air_friction_on_different_planets: Dict[str,(float|int)]=field(default_factory=None,init=False)
     """
     the air friction value on each planet,
     """
-    _current_journey_time: datetime.timedelta = field(default_factory=datetime.timedelta)
-    """
-    the time spent by the spaceship so far
-    """
     _name: str = field(init=False, default=None)
     """
     Spaceship name
@@ -44,9 +49,10 @@ class SpaceshipNode:
         """
         Initializes the spaceship with validated attributes.
         """
-        # Create an empty instance
-            # Initialize _current_journey_time to zero
-        self._current_journey_time = datetime.timedelta()
+        self._air_friction_on_different_planets = None
+        self._name = None
+        self._mass = None
+        self._engine_thrust_power = None
         self._validate_and_set_attributes(name, mass, engine_thrust_power, air_friction=air_friction_on_each_planet)
     
     def _validate_and_set_attributes(
@@ -73,7 +79,7 @@ class SpaceshipNode:
                 self.__validate_engine_thrust_power(engine_thrust_power)
                 object.__setattr__(self, '_engine_thrust_power', engine_thrust_power)
         except Exception as e:
-            print(f"Validation error: {e}")
+            event(logger, "ship.validation_failed", f"Validation error: {e}", logging.WARNING, ship=name)
         
     @staticmethod
     @is_string
@@ -175,103 +181,86 @@ class SpaceshipNode:
         return self._engine_thrust_power
     
     @property
-    def current_journey_time(self) -> datetime.timedelta:
+    def physics(self) -> ShipPhysics:
         """
-        Returns the time spent in the journey.
+        Immutable, hashable and picklable snapshot of the parameters the physics depends on.
+        Use it to memoise or parallelise leg times; journeys are accumulated by `Mission`.
         """
-        return self._current_journey_time
+        return ShipPhysics.from_values(
+            mass=self._mass,
+            engine_thrust_power=self._engine_thrust_power,
+            air_friction=self._air_friction_on_different_planets,
+            name=self._name,
+        )
     
-    def get_time_needed_to_cross_the_atmosphere_of_planet(self, planet: BasePlanetNode) -> datetime.timedelta:
+    def get_seconds_needed_to_cross_the_atmosphere_of_planet(self, planet: BasePlanetNode) -> float:
         """
-        Calculates the time needed for the spaceship to cross the atmosphere of a given planet,
+        Calculates the time (in seconds) needed for the spaceship to cross the atmosphere of a given planet,
         using the pre-calculated air friction force.
 
         Args:
             planet (BasePlanetNode): The planet whose atmosphere the spaceship is crossing.
 
         Returns:
-            datetime.timedelta: The time needed to cross the atmosphere.
+            float: The time needed to cross the atmosphere, in seconds.
         """
         try:
-            # Convert atmosphere altitude from kilometers to meters
-            atmosphere_altitude_meters = planet.atmosphere_altitude * 1000
-
-            # Calculate net force
-            net_force = (
-                planet.station_boost_for_thrust_power_launch +
-                self._engine_thrust_power  # Thrust power
-                - self.air_friction_on_each_planet[planet.name]  # Pre-calculated air friction force
-                - self.get_space_ship_mass_on_planet(planet=planet)  # Gravitational force
+            return ShipPhysics.compute_exit_seconds(
+                self._mass, self._engine_thrust_power, self._air_friction_on_different_planets[planet.name], planet, self._name,
             )
-
-            # If net force is zero or negative, the spaceship cannot proceed
-            if net_force <= 0:
-                raise MechanicalError(f"The spaceship '{self.name}' cannot overcome the forces acting against it on planet {planet.name}. to  cross the atmosphere")
-
-            # Calculate acceleration
-            acceleration = net_force / self._mass
-
-            # Calculate time using the kinematic equation: d = 0.5 * a * t^2 => t = sqrt(2d / a)
-            time_seconds = math.sqrt((2 * atmosphere_altitude_meters) / acceleration)
-
-            # Convert time to a timedelta object
-            return datetime.timedelta(seconds=time_seconds)
-
         except MechanicalError as e:
-            print(f"⚡⚡⚡Error crossing atmosphere: {e}")
+            event(logger, "physics.atmosphere_exit_failed", f"Error crossing atmosphere: {e}", ship=self.name, planet=planet.name)
             raise
-            
+
+    def get_time_needed_to_cross_the_atmosphere_of_planet(self, planet: BasePlanetNode) -> datetime.timedelta:
+        """
+        timedelta version of `get_seconds_needed_to_cross_the_atmosphere_of_planet`, for reporting.
+        """
+        return datetime.timedelta(seconds=self.get_seconds_needed_to_cross_the_atmosphere_of_planet(planet))
 
     def get_space_ship_mass_on_planet(self, planet: BasePlanetNode) -> float:
         return self._mass * planet.surface_gravety_g
     
-    def get_time_needed_to_land_on_the_planet_from_its_atmosphere(self, planet: BasePlanetNode) -> datetime.timedelta:
+    def get_seconds_needed_to_land_on_the_planet_from_its_atmosphere(self, planet: BasePlanetNode) -> float:
         """
-        Calculates the time needed for the spaceship to land on the planet from its atmosphere,
+        Calculates the time (in seconds) needed for the spaceship to land on the planet from its atmosphere,
         using the pre-calculated air friction force.
 
         Args:
             planet (BasePlanetNode): The planet on which the spaceship is landing.
 
         Returns:
-            datetime.timedelta: The time needed to land.
+            float: The time needed to land, in seconds.
         """
         try:
-            # Convert atmosphere altitude from kilometers to meters
-            atmosphere_altitude_meters = planet.atmosphere_altitude * 1000
-
-            # Calculate net force
-            net_force = (
-                self._engine_thrust_power # Thrust power (slows down the descent)
-                + self.air_friction_on_each_planet[planet.name]  # Air friction force (opposes motion)
-                - self.get_space_ship_mass_on_planet(planet=planet)  # Gravitational force
+            return ShipPhysics.compute_landing_seconds(
+                self._mass, self._engine_thrust_power, self._air_friction_on_different_planets[planet.name], planet, self._name,
             )
-
-            # If net force is zero or negative, the spaceship cannot slow down sufficiently
-            if net_force <= 0:
-                raise MechanicalError(f"The spaceship {self.name} cannot slow down sufficiently to land safely. on planet {planet.name}")
-
-            # Calculate acceleration (deceleration is negative acceleration)
-            acceleration = net_force / self._mass
-
-            # Calculate time using the kinematic equation: d = 0.5 * a * t^2 => t = sqrt(2d / |a|)
-            time_seconds = math.sqrt((2 * atmosphere_altitude_meters) / abs(acceleration))
-
-            # Convert time to a timedelta object
-            return datetime.timedelta(seconds=time_seconds)
-
         except MechanicalError as e:
-            print(f'🌍🌍🌍Landing Error : {e}')
+            event(logger, "physics.landing_failed", f"Landing error: {e}", ship=self.name, planet=planet.name)
             raise
-          
+
+    def get_time_needed_to_land_on_the_planet_from_its_atmosphere(self, planet: BasePlanetNode) -> datetime.timedelta:
+        """
+        timedelta version of `get_seconds_needed_to_land_on_the_planet_from_its_atmosphere`, for reporting.
+        """
+        return datetime.timedelta(seconds=self.get_seconds_needed_to_land_on_the_planet_from_its_atmosphere(planet))
         
-    def calculate_the_time_needed_to_travel_between_two_planets(
+    def get_travel_time_scale(self) -> float:
+        """
+        Seconds needed to travel sqrt(1 million km) from rest, so that the travel time over
+        a distance d (in million km) is scale * sqrt(d).
+        Under constant acceleration a = F / m: t = sqrt(2 * d * 1e9 / a).
+        """
+        return ShipPhysics.compute_travel_time_scale(self._mass, self._engine_thrust_power)
+
+    def calculate_the_seconds_needed_to_travel_between_two_planets(
         self, 
         planetA: BasePlanetNode,
         planetB: BasePlanetNode,
-    ) -> datetime.timedelta:
+    ) -> float:
         """
-        Calculates the time needed to travel between two planets based on the actual distance,
+        Calculates the time (in seconds) needed to travel between two planets based on the actual distance,
         the spaceship's thrust power, and its mass. Assumes a straight-line trajectory with constant acceleration.
 
         Args:
@@ -279,36 +268,39 @@ class SpaceshipNode:
             planetB (BasePlanetNode): The destination planet.
 
         Returns:
-            datetime.timedelta: The time needed to travel between the two planets.
+            float: The time needed to travel between the two planets, in seconds.
 
         Raises:
             Exception: If the calculation fails.
         """
         try:
-            # Get the distance between the two planets (in meters)
-            distance_between_planets = abs(planetA.distance_from_the_sun - planetB.distance_from_the_sun) * 1e9  # Convert million km to meters
-
-            # Calculate the acceleration of the spaceship (a = F / m)
-            acceleration = self._engine_thrust_power / self._mass
-
-            # Calculate the time required to travel the distance using the kinematic equation:
-            # distance = 0.5 * a * t^2 => t = sqrt(2 * distance / a)
-            time_seconds = math.sqrt((2 * distance_between_planets) / acceleration)
+            # Get the distance between the two planets (in million km)
+            distance_between_planets = abs(planetA.distance_from_the_sun - planetB.distance_from_the_sun)
 
-            # Convert time to a timedelta object
-            
-            return datetime.timedelta(seconds=time_seconds)
+            # distance = 0.5 * a * t^2 => t = sqrt(2 * distance / a) = scale * sqrt(distance)
+            return self.get_travel_time_scale() * math.sqrt(distance_between_planets)
 
         except Exception as e:
-            print(f"Error calculating travel time between planets: {e}")
+            event(logger, "physics.travel_failed", f"Error calculating travel time between planets: {e}", logging.DEBUG, ship=self.name, planet=planetB.name)
             raise
-    def calculate_total_journey_time_from_planetA_to_planetB(
-        self,
+
+    def calculate_the_time_needed_to_travel_between_two_planets(
+        self, 
         planetA: BasePlanetNode,
         planetB: BasePlanetNode,
     ) -> datetime.timedelta:
         """
-        Calculates the total journey time from planetA to planetB, including:
+        timedelta version of `calculate_the_seconds_needed_to_travel_between_two_planets`, for reporting.
+        """
+        return datetime.timedelta(seconds=self.calculate_the_seconds_needed_to_travel_between_two_planets(planetA, planetB))
+
+    def calculate_total_journey_seconds_from_planetA_to_planetB(
+        self,
+        planetA: BasePlanetNode,
+        planetB: BasePlanetNode,
+    ) -> float:
+        """
+        Calculates the total journey time (in seconds) from planetA to planetB, including:
         - Time to exit planetA's atmosphere.
         - Time to travel between the two planets.
         - Time to land on planetB.
@@ -318,29 +310,35 @@ class SpaceshipNode:
             planetB (BasePlanetNode): The destination planet.
 
         Returns:
-            datetime.timedelta: The total journey time.
+            float: The total journey time, in seconds.
 
         Raises:
             Exception: If any of the calculations fail.
         """
         try:
             # Time to exit planetA's atmosphere
-            exit_time = self.get_time_needed_to_cross_the_atmosphere_of_planet(planetA)
+            exit_time = self.get_seconds_needed_to_cross_the_atmosphere_of_planet(planetA)
 
             # Time to travel between the two planets
-            travel_time = self.calculate_the_time_needed_to_travel_between_two_planets(planetA, planetB)
+            travel_time = self.calculate_the_seconds_needed_to_travel_between_two_planets(planetA, planetB)
 
             # Time to land on planetB
-            landing_time = self.get_time_needed_to_land_on_the_planet_from_its_atmosphere(planetB)
+            landing_time = self.get_seconds_needed_to_land_on_the_planet_from_its_atmosphere(planetB)
 
             # Total journey time
-            total_time = exit_time + travel_time + landing_time
-
-            # Update the current journey time
-            self._current_journey_time += total_time
-            return total_time
+            return exit_time + travel_time + landing_time
 
         except Exception as e:
-            print(f"Error calculating total journey time: {e}")
+            event(logger, "physics.journey_failed", f"Error calculating total journey time: {e}", logging.DEBUG, ship=self.name, planet=planetB.name)
             raise
-           
\ No newline at end of file
+
+    def calculate_total_journey_time_from_planetA_to_planetB(
+        self,
+        planetA: BasePlanetNode,
+        planetB: BasePlanetNode,
+    ) -> datetime.timedelta:
+        """
+        timedelta version of `calculate_total_journey_seconds_from_planetA_to_planetB`, for reporting.
+        It has no side effect: use a `Mission` to accumulate the time of a journey.
+        """
+        return datetime.timedelta(seconds=self.calculate_total_journey_seconds_from_planetA_to_planetB(planetA, planetB))
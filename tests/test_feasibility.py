@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from feasibility import FeasibilityEngine, FeasibilityReason
+from fleet import Fleet
+from scenarios import Scenarios
+
+
+@pytest.fixture(scope="module")
+def planets():
+    return Scenarios.construct_planets_with_boosters(boosters=Scenarios.super_boosters_extreme())
+
+
+def test_nan_friction_is_missing_data_not_feasible(planets):
+    names = [planet.name for planet in planets]
+    friction = np.zeros((1, len(names)))
+    friction[0, names.index("Mars")] = np.nan
+    fleet = Fleet(["Probe"], [10.0], [1e6], names, friction)
+
+    report = FeasibilityEngine.evaluate_planet_list(spaceships=fleet, planet_list=planets)
+
+    mars = names.index("Mars")
+    assert report.reason[0, mars, 0] == FeasibilityReason.MISSING_DATA
+    assert not report.feasible[0, mars, 0]
+    assert report.reliable_ships("default") == []
+    others = np.delete(report.reason[0, :, 0], mars)
+    assert (others != FeasibilityReason.MISSING_DATA).all()
+
+
+def test_booster_profile_missing_planets_names_them(planets):
+    ships = Scenarios.construct_spaceships(spaceshipData=Scenarios.spaceshipData())
+    profile = {planet.name: 0.0 for planet in planets if planet.name not in ("Venus", "Pluto")}
+    with pytest.raises(ValueError, match="Venus, Pluto|Pluto, Venus"):
+        FeasibilityEngine.evaluate(spaceships=ships, planet_list=planets, booster_profiles={"partial": profile})
+
+
+def test_evaluate_matches_spaceship_exceptions(planets):
+    ships = Scenarios.construct_spaceships(spaceshipData=Scenarios.spaceshipData())
+    report = FeasibilityEngine.evaluate_planet_list(spaceships=ships, planet_list=planets)
+    for i, ship in enumerate(ships):
+        for j, planet in enumerate(planets):
+            try:
+                ship.get_seconds_needed_to_cross_the_atmosphere_of_planet(planet)
+                ship.get_seconds_needed_to_land_on_the_planet_from_its_atmosphere(planet)
+                expected = True
+            except Exception:
+                expected = False
+            assert report.feasible[i, j, 0] == expected, (ship.name, planet.name)
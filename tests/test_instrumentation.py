@@ -0,0 +1,51 @@
+import math
+
+import numpy as np
+import pytest
+
+from instrumentation import INSTRUMENTATION
+from scenarios import Scenarios
+from tsp_branch_and_bound import TspBranchAndBound
+from tsp_cache import TspCache
+from tsp_heuristics import TspHeuristics
+from tsp_top_k import TspTopK
+from tsp_utils import TspUtils
+
+
+@pytest.fixture
+def instrumentation():
+    INSTRUMENTATION.configure("all")
+    yield INSTRUMENTATION
+    INSTRUMENTATION.configure(None)
+
+
+@pytest.fixture(scope="module")
+def matrix():
+    return np.random.default_rng(7).uniform(1.0, 100.0, size=(7, 7))
+
+
+@pytest.mark.parametrize("solve", [
+    lambda m: TspBranchAndBound.branch_and_bound_order(m),
+    lambda m: TspHeuristics.heuristic_order(m),
+    lambda m: TspTopK.k_best_orders(m, k=3),
+])
+def test_solvers_report_one_solve_call(instrumentation, matrix, solve):
+    solve(matrix)
+    assert instrumentation.phases["solve"].calls == 1
+
+
+def test_parallel_brute_force_counts_permutations(instrumentation, matrix):
+    planets = Scenarios.construct_planets_with_boosters(boosters=Scenarios.super_boosters_extreme())[:len(matrix)]
+    TspUtils.tsp_brute_force_parallel(matrix, planets, "Probe", max_workers=1)
+    assert instrumentation.counters["permutations_scored"] == math.factorial(len(matrix) - 1)
+    assert instrumentation.phases["solve"].calls == 1
+
+
+def test_cache_lookups_are_a_phase(instrumentation, tmp_path):
+    planets = TspUtils.format_planet_list_from_starting_node(
+        planet_list=Scenarios.construct_planets_with_boosters(boosters=Scenarios.super_boosters_extreme()), starting_node="Earth",
+    )
+    ship = Scenarios.construct_spaceships(spaceshipData=Scenarios.spaceshipData())[0]
+    TspCache(cache_dir=str(tmp_path)).tsp(formatted_planet_list=planets, spaceship=ship, shipName=ship.name)
+    assert instrumentation.phases["cache"].calls > 0
+    assert instrumentation.counters["cache_misses"] == 1
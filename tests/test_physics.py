@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from custom_exception import MechanicalError
+from mission import Mission
+from scenarios import Scenarios
+from ship_physics import ShipPhysics
+from tsp_cache import TspCache
+from tsp_utils import TspUtils
+
+
+@pytest.fixture(scope="module")
+def planets():
+    planet_list = Scenarios.construct_planets_with_boosters(boosters=Scenarios.super_boosters_extreme())
+    return TspUtils.format_planet_list_from_starting_node(planet_list=planet_list, starting_node="Earth")
+
+
+@pytest.fixture(scope="module")
+def ships():
+    return Scenarios.construct_spaceships(spaceshipData=Scenarios.spaceshipData())
+
+
+def test_spaceship_node_and_ship_physics_agree(planets, ships):
+    for ship in ships:
+        physics = ship.physics
+        for planetA in planets:
+            for planetB in planets:
+                try:
+                    expected = ship.calculate_total_journey_seconds_from_planetA_to_planetB(planetA, planetB)
+                except MechanicalError:
+                    with pytest.raises(MechanicalError):
+                        physics.leg_seconds(planetA, planetB)
+                    continue
+                assert physics.leg_seconds(planetA, planetB) == pytest.approx(expected)
+
+
+def test_kernel_matrix_matches_ship_physics(planets, ships):
+    time_tensor, infeasible = TspUtils.build_time_tensor(formatted_planet_list=planets, spaceships=[ship.physics for ship in ships])
+    for s, ship in enumerate(ships):
+        for i, planetA in enumerate(planets):
+            for j, planetB in enumerate(planets):
+                if infeasible[s, i, j]:
+                    assert np.isinf(time_tensor[s, i, j])
+                else:
+                    assert time_tensor[s, i, j] == pytest.approx(ship.physics.leg_seconds(planetA, planetB))
+
+
+def test_mission_total_matches_time_matrix(planets, ships):
+    time_tensor, infeasible = TspUtils.build_time_tensor(formatted_planet_list=planets, spaceships=ships)
+    ship = ships[int(np.flatnonzero(~infeasible.any(axis=(1, 2)))[0])]
+    matrix = TspUtils.build_time_matrix(formatted_planet_list=planets, spaceship=ship)
+    tour = TspUtils.line_tour_order(planets)
+    mission = Mission(spaceship=ship)
+    mission.fly_tour(planets, tour)
+    assert mission.total_seconds == pytest.approx(sum(matrix[tour[i], tour[i + 1]] for i in range(len(tour) - 1)))
+    assert len(mission.legs) == len(tour) - 1
+
+
+def test_mission_flies_ship_physics_snapshots(planets, ships):
+    _, infeasible = TspUtils.build_time_tensor(formatted_planet_list=planets, spaceships=ships)
+    ship = ships[int(np.flatnonzero(~infeasible.any(axis=(1, 2)))[0])]
+    tour = TspUtils.line_tour_order(planets)
+    expected = Mission(spaceship=ship)
+    expected.fly_tour(planets, tour)
+    mission = Mission(spaceship=ship.physics)
+    assert mission.fly_tour(planets, tour) == expected.journey_time
+    assert mission.legs == expected.legs
+    scored = TspUtils.score_ship_on_tour(planets, tour, ship.physics, ship.name)
+    assert scored[2] == TspUtils.score_ship_on_tour(planets, tour, ship, ship.name)[2]
+
+
+def test_physics_snapshot_shares_cache_entries(planets, ships):
+    ship = ships[0]
+    assert TspCache.fingerprint(planets, ship) == TspCache.fingerprint(planets, ship.physics)
+    assert TspCache.fingerprint(planets, ship) != TspCache.fingerprint(planets, ship.copy_with(mass=ship.mass * 2))
+
+
+def test_physics_snapshot_is_read_only(ships):
+    physics = ships[0].physics
+    with pytest.raises(TypeError):
+        physics.air_friction_on_each_planet["Earth"] = 0.0
+    assert physics == ShipPhysics.from_values(ships[0].mass, ships[0].engine_thrust_power, ships[0].air_friction_on_each_planet, name="other")
@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+
+from feasibility import FeasibilityReport
+from results_store import ResultsStore
+from scenarios import Scenarios
+from tsp_utils import TspUtils
+
+
+@pytest.fixture(params=["numpy", "arrow"])
+def backend(request):
+    if request.param == "arrow":
+        pytest.importorskip("pyarrow")
+    return request.param
+
+
+@pytest.fixture(scope="module")
+def planets():
+    return Scenarios.construct_planets_with_boosters(boosters=Scenarios.super_boosters_extreme())[:4]
+
+
+def solve(planets, ship: str, seconds: float):
+    matrix = np.full((len(planets), len(planets)), seconds)
+    return TspUtils.format_tour_result(time_metrix=matrix, formatted_planet_list=planets, shipName=ship, tour_order=[0, 2, 1, 3, 0])
+
+
+def report() -> FeasibilityReport:
+    feasible = np.array([[[True, False], [True, True]], [[False, False], [True, False]]])
+    return FeasibilityReport(
+        ship_names=("Ariane 5", "Falcon 9"),
+        planet_names=("Earth", "Mars"),
+        scenario_names=("minimal", "extreme"),
+        feasible=feasible,
+        reason=np.where(feasible, 0, 2).astype(np.int8),
+        margin=np.arange(8, dtype=np.float64).reshape(2, 2, 2),
+    )
+
+
+def test_solves_round_trip(tmp_path, backend, planets):
+    # batch_rows=2 spreads the rows over several parts
+    with ResultsStore(str(tmp_path), backend=backend, batch_rows=2) as store:
+        store.append_solve("minimal", solve(planets, "Ariane 5", 10.0), solver="held_karp", runtime_s=0.5)
+        store.append_solve("minimal", solve(planets, "Falcon 9", 5.0), solver="held_karp", runtime_s=0.25)
+        store.append_solve("extreme", solve(planets, "Ariane 5", 3.0), solver="brute_force")
+    assert len(store.parts("solves")) == 2
+
+    reopened = ResultsStore(str(tmp_path), backend=backend)
+    frame = reopened.read("solves")
+    assert list(frame.columns) == ["scenario", "ship", "solver", "total_s", "runtime_s", "tour", "leg_s"]
+    assert frame["scenario"].tolist() == ["minimal", "minimal", "extreme"]
+    assert frame["ship"].tolist() == ["Ariane 5", "Falcon 9", "Ariane 5"]
+    assert frame["total_s"].tolist() == [40.0, 20.0, 12.0]
+    assert frame["runtime_s"].iloc[:2].tolist() == [0.5, 0.25] and np.isnan(frame["runtime_s"].iloc[2])
+    names = [planet.name for planet in planets]
+    assert frame["tour"].iloc[0] == [names[0], names[2], names[1], names[3], names[0]]
+    assert list(frame["leg_s"].iloc[1]) == [5.0] * 4
+
+
+def test_solves_filter_and_fastest(tmp_path, backend, planets):
+    with ResultsStore(str(tmp_path), backend=backend, batch_rows=2) as store:
+        store.append_solve("minimal", solve(planets, "Ariane 5", 10.0), solver="held_karp")
+        store.append_solve("minimal", solve(planets, "Falcon 9", 5.0), solver="brute_force")
+        store.append_solve("extreme", solve(planets, "Ariane 5", 3.0), solver="held_karp")
+        store.append_solve("extreme", solve(planets, "Falcon 9", 7.0), solver="held_karp")
+
+    filtered = store.read("solves", columns=["ship", "total_s"], scenario="minimal", solver="held_karp")
+    assert filtered.to_dict("records") == [{"ship": "Ariane 5", "total_s": 40.0}]
+    assert store.read("solves", ship="Saturn V").empty
+
+    fastest = store.fastest().sort_values("scenario").reset_index(drop=True)
+    assert fastest.to_dict("records") == [
+        {"scenario": "extreme", "ship": "Ariane 5", "solver": "held_karp", "total_s": 12.0},
+        {"scenario": "minimal", "ship": "Falcon 9", "solver": "brute_force", "total_s": 20.0},
+    ]
+    assert store.fastest(solver="held_karp", scenario="minimal")["ship"].tolist() == ["Ariane 5"]
+    with pytest.raises(KeyError):
+        store.fastest(total_s="1")
+
+
+def test_feasibility_round_trip(tmp_path, backend):
+    with ResultsStore(str(tmp_path), backend=backend) as store:
+        store.append_feasibility(report())
+        store.append_feasibility(report(), scenarios=["default", "boosted"])
+
+    frame = store.read("feasibility")
+    assert len(frame) == 16
+    first = frame.iloc[:8]
+    expected = report()
+    for row in first.itertuples():
+        s, p, c = expected.ship_names.index(row.ship), expected.planet_names.index(row.planet), expected.scenario_names.index(row.scenario)
+        assert row.feasible == expected.feasible[s, p, c]
+        assert row.reason == expected.reason[s, p, c]
+        assert row.margin == expected.margin[s, p, c]
+    assert set(frame["scenario"].iloc[8:]) == {"default", "boosted"}
+
+    filtered = store.read("feasibility", columns=["planet", "feasible"], scenario="minimal", ship="Falcon 9")
+    assert filtered.to_dict("records") == [{"planet": "Earth", "feasible": False}, {"planet": "Mars", "feasible": True}]
+    with pytest.raises(KeyError):
+        store.read("feasibility", margin="1")
@@ -0,0 +1,61 @@
+import time
+
+import numpy as np
+import pytest
+
+from tsp_branch_and_bound import BranchAndBoundStats, TspBranchAndBound
+from tsp_heuristics import TspHeuristics
+from tsp_utils import TspUtils
+
+BOUND_SETS = [("min_edges",), ("reduction",), ("one_tree",), TspBranchAndBound.BOUNDS]
+
+
+@pytest.mark.parametrize("bounds", BOUND_SETS, ids=["+".join(bounds) for bounds in BOUND_SETS])
+@pytest.mark.parametrize("n", range(2, 9))
+def test_branch_and_bound_matches_held_karp(bounds, n):
+    rng = np.random.default_rng(100 + n)
+    for _ in range(3):
+        matrix = rng.uniform(1.0, 100.0, size=(n, n))
+        expected, _ = TspUtils.held_karp_order(matrix)
+        stats = BranchAndBoundStats()
+        cost, tour = TspBranchAndBound.branch_and_bound_order(matrix, bounds=bounds, stats=stats)
+        assert stats.optimal
+        assert cost == pytest.approx(expected, rel=1e-6)
+        assert tour[0] == tour[-1] == 0 and sorted(tour[:-1]) == list(range(n))
+        assert cost == pytest.approx(sum(matrix[tour[i], tour[i + 1]] for i in range(n)))
+
+
+@pytest.mark.parametrize("bounds", BOUND_SETS, ids=["+".join(bounds) for bounds in BOUND_SETS])
+def test_branch_and_bound_with_forbidden_legs(bounds):
+    rng = np.random.default_rng(7)
+    matrix = rng.uniform(1.0, 100.0, size=(7, 7))
+    matrix[rng.random((7, 7)) < 0.3] = np.inf
+    # keep the tour 0 -> 1 -> ... -> 6 -> 0 open so a finite optimum exists
+    for i in range(7):
+        matrix[i, (i + 1) % 7] = rng.uniform(1.0, 100.0)
+    expected, _ = TspUtils.held_karp_order(matrix)
+    cost, _ = TspBranchAndBound.branch_and_bound_order(matrix, bounds=bounds)
+    assert cost == pytest.approx(expected, rel=1e-6)
+
+
+def test_incumbent_is_seeded_by_nearest_neighbour():
+    matrix = np.random.default_rng(1).uniform(1.0, 100.0, size=(6, 6))
+    stats = BranchAndBoundStats()
+    # a zero time limit stops at the first expansion and returns the seed
+    _, tour = TspBranchAndBound.branch_and_bound_order(matrix, time_limit_s=0.0, stats=stats)
+    assert not stats.optimal
+    assert tour == TspHeuristics.nearest_neighbour(matrix, start=0).tolist() + [0]
+
+
+def test_time_limit_is_independent_of_report_every():
+    matrix = np.random.default_rng(30).uniform(1.0, 100.0, size=(30, 30))
+    stats = BranchAndBoundStats()
+    started = time.perf_counter()
+    cost, tour = TspBranchAndBound.branch_and_bound_order(matrix, time_limit_s=0.5, stats=stats)
+    elapsed = time.perf_counter() - started
+    assert not stats.optimal
+    # the default report_every of 10,000 expansions would run for several seconds
+    assert stats.nodes_expanded < 10_000
+    assert elapsed < 1.5
+    assert sorted(tour[:-1]) == list(range(30))
+    assert cost == pytest.approx(sum(matrix[tour[i], tour[i + 1]] for i in range(30)))
@@ -0,0 +1,45 @@
+import pytest
+
+from feasibility import FeasibilityEngine
+from scenarios import Scenarios
+from tsp_cache import TspCache
+from tsp_utils import TspUtils
+
+
+@pytest.fixture(scope="module")
+def scenario():
+    planets = Scenarios.construct_planets_with_boosters(boosters=Scenarios.super_boosters_minimal())
+    ships = Scenarios.construct_spaceships(spaceshipData=Scenarios.spaceshipData())
+    reliable = FeasibilityEngine.evaluate_planet_list(spaceships=ships, planet_list=planets).reliable_ships("default")
+    formatted = TspUtils.format_planet_list_from_starting_node(planet_list=list(planets), starting_node="Earth")
+    return formatted, [TspUtils.check_ship_is_valid(ship_list=ships, ship_name=name) for name in reliable[:3]]
+
+
+def solve_all(cache, scenario):
+    formatted, ships = scenario
+    return [cache.tsp(formatted_planet_list=formatted, spaceship=ship, shipName=ship.name) for ship in ships]
+
+
+def test_tsp_counts_one_lookup_per_solve(scenario, tmp_path):
+    solves = len(scenario[1])
+
+    cold = TspCache(cache_dir=str(tmp_path))
+    cold_results = solve_all(cold, scenario)
+    assert (cold.stats.memory_hits, cold.stats.disk_hits, cold.stats.misses) == (0, 0, solves)
+
+    again = solve_all(cold, scenario)
+    assert (cold.stats.memory_hits, cold.stats.disk_hits, cold.stats.misses) == (solves, 0, solves)
+
+    warm = TspCache(cache_dir=str(tmp_path))
+    warm_results = solve_all(warm, scenario)
+    assert (warm.stats.memory_hits, warm.stats.disk_hits, warm.stats.misses) == (0, solves, 0)
+    assert [result[2] for result in warm_results] == [result[2] for result in cold_results] == [result[2] for result in again]
+
+
+def test_time_matrix_and_order_count_their_own_lookup(scenario):
+    formatted, ships = scenario
+    cache = TspCache()
+    cache.order(formatted, ships[0])
+    assert (cache.stats.hits, cache.stats.misses) == (0, 1)
+    cache.time_matrix(formatted, ships[0])
+    assert (cache.stats.memory_hits, cache.stats.misses) == (1, 1)
@@ -0,0 +1,32 @@
+import pytest
+
+import tsp_cli
+
+
+def test_unknown_scenario_is_a_usage_error(capsys):
+    assert tsp_cli.main(["solve", "--scenario", "nowhere"]) == 2
+    assert "unknown scenario nowhere" in capsys.readouterr().err
+
+
+def test_bad_log_level_is_a_usage_error(capsys):
+    assert tsp_cli.main(["--log-level", "LOUD", "feasibility", "--scenario", "minimal"]) == 2
+    assert "unknown log level LOUD" in capsys.readouterr().err
+
+
+def test_results_arguments_are_checked(tmp_path, capsys):
+    assert tsp_cli.main(["results", str(tmp_path / "missing")]) == 2
+    assert "no results directory" in capsys.readouterr().err
+    assert tsp_cli.main(["feasibility", "--scenario", "minimal", "--results-dir", str(tmp_path)]) == 0
+    assert tsp_cli.main(["results", str(tmp_path), "--table", "feasibility", "--columns", "ship,speed"]) == 2
+    assert "unknown columns speed of feasibility" in capsys.readouterr().err
+
+
+def test_errors_raised_by_a_solve_propagate(monkeypatch):
+    def broken(name, deadline_s):
+        def solve(time_metrix):
+            raise ValueError("solver bug")
+        return solve
+
+    monkeypatch.setattr(tsp_cli, "solver_function", broken)
+    with pytest.raises(ValueError, match="solver bug"):
+        tsp_cli.main(["solve", "--scenario", "minimal"])
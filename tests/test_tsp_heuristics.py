@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from tsp_heuristics import TspHeuristics
+
+# runtimes at 10k planets are tracked by the "heuristic*" cases of `tsp_benchmark`
+
+
+@pytest.fixture(scope="module")
+def matrix_2k():
+    return np.random.default_rng(0).uniform(1.0, 1000.0, size=(2_000, 2_000))
+
+
+def test_neighbour_lists_match_full_sort():
+    matrix = np.random.default_rng(1).integers(1, 20, size=(300, 300)).astype(np.float64)
+    matrix[4, :] = np.inf
+    for incoming in (False, True):
+        rows = np.array(matrix.T if incoming else matrix)
+        rows[np.arange(300), np.arange(300)] = np.inf
+        expected = np.array([np.lexsort((np.arange(300), np.arange(300) == i, row))[:8] for i, row in enumerate(rows)])
+        found = TspHeuristics.neighbour_lists(matrix, k=8, incoming=incoming, block_rows=64, sample_size=32)
+        np.testing.assert_array_equal(found, expected)
+
+
+@pytest.mark.parametrize("construction", ["cheapest_insertion", "farthest_insertion"])
+def test_insertion_with_infinite_legs_returns_a_permutation(construction):
+    rng = np.random.default_rng(2)
+    for _ in range(50):
+        n = int(rng.integers(3, 60))
+        matrix = rng.uniform(1.0, 100.0, size=(n, n))
+        matrix[rng.random((n, n)) < rng.uniform(0.0, 0.9)] = np.inf
+        order = getattr(TspHeuristics, construction)(matrix, neighbour_count=4)
+        assert sorted(order.tolist()) == list(range(n))
+
+
+@pytest.mark.parametrize("construction", TspHeuristics.CONSTRUCTIONS)
+def test_heuristic_order_returns_a_priced_tour(matrix_2k, construction):
+    cost, tour = TspHeuristics.heuristic_order(matrix_2k, construction=construction)
+
+    assert tour[0] == tour[-1] == 0
+    assert sorted(tour[:-1]) == list(range(2_000))
+    assert cost == pytest.approx(TspHeuristics.tour_cost(matrix_2k, np.array(tour[:-1])))
+    # the improvements never end above the construction they start from
+    assert cost <= TspHeuristics.tour_cost(matrix_2k, getattr(TspHeuristics, construction)(matrix_2k, start=0)) + 1e-6
@@ -0,0 +1,20 @@
+from datetime import timedelta
+
+from tsp_render import TspRenderer
+
+
+def test_duration_label_uses_hours_then_days():
+    assert TspRenderer.duration_label(timedelta(hours=7, minutes=27)) == "7.45 hours"
+    assert TspRenderer.duration_label(47 * 3600.0) == "47.00 hours"
+    assert TspRenderer.duration_label(timedelta(days=3, hours=3)) == "3.12 days"
+
+
+def test_draw_labels_legs_with_duration_label():
+    legs = [
+        {"source": "Earth", "destination": "Mars", "cost": timedelta(hours=5)},
+        {"source": "Mars", "destination": "Earth", "cost": timedelta(days=4)},
+    ]
+    figure = TspRenderer.draw(("Probe", legs, timedelta(days=4, hours=5), "4 days, 5:00:00"))
+    texts = {text.get_text() for text in figure.axes[0].texts}
+    assert {"5.00 hours", "4.00 days"} <= texts
+    assert not any("years" in text for text in texts)
@@ -0,0 +1,79 @@
+from itertools import permutations
+from math import factorial
+
+import numpy as np
+import pytest
+
+from tsp_top_k import TspTopK
+
+
+def enumerate_tours(matrix: np.ndarray):
+    n = matrix.shape[0]
+    tours = []
+    for middle in permutations(range(1, n)):
+        tour = [0, *middle, 0]
+        cost = float(sum(matrix[tour[i], tour[i + 1]] for i in range(n)))
+        if np.isfinite(cost):
+            tours.append((cost, tour))
+    return sorted(tours)
+
+
+def assert_top_k(matrix: np.ndarray, k: int):
+    expected = enumerate_tours(matrix)
+    ranked = TspTopK.k_best_orders(matrix, k)
+    assert len(ranked) == min(k, len(expected))
+    assert [cost for cost, _ in ranked] == pytest.approx([cost for cost, _ in expected[: len(ranked)]], rel=1e-9)
+    # every tour is a distinct cycle priced at its own cost
+    assert len({tuple(tour) for _, tour in ranked}) == len(ranked)
+    for cost, tour in ranked:
+        assert tour[0] == tour[-1] == 0 and sorted(tour[:-1]) == list(range(matrix.shape[0]))
+        assert cost == pytest.approx(sum(matrix[tour[i], tour[i + 1]] for i in range(len(tour) - 1)))
+
+
+@pytest.mark.parametrize("n", range(2, 7))
+def test_k_best_orders_match_sorted_enumeration(n):
+    rng = np.random.default_rng(200 + n)
+    for _ in range(3):
+        matrix = rng.uniform(1.0, 100.0, size=(n, n))
+        assert_top_k(matrix, k=min(10, factorial(n - 1)))
+
+
+@pytest.mark.parametrize("n", range(3, 6))
+def test_k_best_orders_returns_every_cycle_when_k_is_large(n):
+    matrix = np.random.default_rng(n).uniform(1.0, 100.0, size=(n, n))
+    assert_top_k(matrix, k=factorial(n - 1) + 5)
+
+
+def test_k_best_orders_with_forbidden_legs():
+    rng = np.random.default_rng(11)
+    matrix = rng.uniform(1.0, 100.0, size=(6, 6))
+    matrix[rng.random((6, 6)) < 0.3] = np.inf
+    for i in range(6):
+        matrix[i, (i + 1) % 6] = rng.uniform(1.0, 100.0)
+    assert_top_k(matrix, k=len(enumerate_tours(matrix)) + 2)
+
+
+def test_k_best_orders_with_ties():
+    # a symmetric matrix prices every cycle and its reverse the same
+    rng = np.random.default_rng(5)
+    upper = np.triu(rng.integers(1, 5, size=(5, 5)).astype(np.float64), 1)
+    assert_top_k(upper + upper.T, k=12)
+
+
+def test_k_best_orders_rejects_matrices_too_large_for_held_karp():
+    matrix = np.random.default_rng(0).uniform(1.0, 100.0, size=(33, 33))
+    with pytest.raises(ValueError, match="at most 32 nodes"):
+        TspTopK.k_best_orders(matrix, k=3)
+
+
+def test_k_best_orders_lets_solver_errors_through():
+    def broken(matrix):
+        raise ValueError("solver bug")
+
+    with pytest.raises(ValueError, match="solver bug"):
+        TspTopK.k_best_orders(np.ones((4, 4)), k=2, solver=broken)
+
+
+def test_k_best_orders_without_any_cycle():
+    matrix = np.full((4, 4), np.inf)
+    assert TspTopK.k_best_orders(matrix, k=3) == []
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from custom_exception import NoTourError
+from scenarios import Scenarios
+from tsp_utils import TspUtils
+
+
+@pytest.fixture(scope="module")
+def planets():
+    return Scenarios.construct_planets_with_boosters(boosters=Scenarios.super_boosters_extreme())
+
+
+def test_brute_force_without_finite_tour_is_an_error(planets):
+    # every leg between two planets is forbidden, only the diagonal is finite
+    matrix = np.full((6, 6), np.inf)
+    np.fill_diagonal(matrix, 0.0)
+    cost, tour = TspUtils.brute_force_order(matrix)
+    assert cost == np.inf and tour == []
+    with pytest.raises(NoTourError):
+        TspUtils.tsp_brute_force(matrix, planets[:6], "Probe")
+    with pytest.raises(NoTourError):
+        TspUtils.tsp_brute_force_parallel(matrix, planets[:6], "Probe", max_workers=1)
+    with pytest.raises(NoTourError):
+        TspUtils.format_tour_result(time_metrix=matrix, formatted_planet_list=planets[:6], shipName="Probe", tour_order=[0, 1, 2, 3, 4, 5, 0])
+
+
+def test_parallel_brute_force_skips_infinite_shards(planets):
+    matrix = np.random.default_rng(3).uniform(1.0, 10.0, size=(7, 7))
+    # 6 can only be reached from 4, so shards like (0, 4, 5) have no finite tail
+    matrix[:, 6] = np.inf
+    matrix[4, 6] = 1.0
+    expected = TspUtils.tsp_brute_force(matrix, planets[:7], "Probe")
+    assert TspUtils.tsp_brute_force_parallel(matrix, planets[:7], "Probe", max_workers=1, prefix_length=2) == expected
+
+
+@pytest.mark.parametrize("n", range(2, 9))
+def test_held_karp_matches_brute_force(n):
+    rng = np.random.default_rng(n)
+    for _ in range(5):
+        matrix = rng.uniform(1.0, 100.0, size=(n, n))
+        expected, _ = TspUtils.brute_force_order(matrix)
+        cost, tour = TspUtils.held_karp_order(matrix)
+        assert cost == pytest.approx(expected, rel=1e-6)
+        assert tour[0] == tour[-1] == 0 and sorted(tour[:-1]) == list(range(n))
+        assert cost == pytest.approx(sum(matrix[tour[i], tour[i + 1]] for i in range(n)))
+
+
+def test_held_karp_with_forbidden_legs():
+    matrix = np.random.default_rng(11).uniform(1.0, 100.0, size=(7, 7))
+    matrix[0, 1:4] = np.inf
+    matrix[5, 2] = matrix[2, 6] = np.inf
+    expected, _ = TspUtils.brute_force_order(matrix)
+    assert TspUtils.held_karp_order(matrix)[0] == pytest.approx(expected, rel=1e-6)
+
+    matrix[:, 0] = np.inf
+    with pytest.raises(ValueError, match="no Hamiltonian cycle"):
+        TspUtils.held_karp_order(matrix)
+
+
+def test_held_karp_spilled_parents_give_the_same_tour(tmp_path):
+    matrix = np.random.default_rng(12).uniform(1.0, 100.0, size=(8, 8))
+    in_memory = TspUtils.held_karp_order(matrix)
+    spilled = TspUtils.held_karp_order(matrix, spill_dir=str(tmp_path), spill_threshold_bytes=0, chunk_size=7)
+    assert spilled == in_memory
+    # the memory-mapped parent layers are removed once the tour is rebuilt
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,453 @@
+"""
+Benchmark suite for the hot paths: `python -m tsp_benchmark run|compare [options]`.
+
+    run       times every case and writes a JSON baseline (--output)
+    compare   re-runs the cases of a baseline (or reads --current) and flags regressions
+
+Cases use `ScenarioGenerator` catalogues of PLANET_SIZES bodies and fleets of FLEET_SIZES
+ships, so the numbers do not depend on the ten hard-coded planets. Each case is warmed up, repeated,
+and run once more under tracemalloc for its peak memory.
+"""
+from abc import ABC
+import argparse
+import contextlib
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from functools import partial
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from feasibility import FeasibilityEngine
+from fleet import Fleet
+from scenario_generator import ScenarioGenerator, SyntheticBodies
+from tsp_branch_and_bound import TspBranchAndBound
+from tsp_heuristics import TspHeuristics
+from tsp_metaheuristics import TspMetaheuristics
+from tsp_utils import TspUtils
+
+BENCHMARK_FORMAT_VERSION = 4
+"""
+bump when the cases or their inputs change, so old baselines are not compared against new numbers
+"""
+PLANET_SIZES = (8, 10, 12, 20, 100, 1_000, 10_000)
+FLEET_SIZES = (1, 10, 100, 1_000, 10_000)
+QUICK_PLANET_SIZES = (8, 10, 12, 20, 100)
+QUICK_FLEET_SIZES = (1, 10, 100)
+
+SIZE_LIMITS: Dict[str, int] = {
+    "spaceship_physics": 10_000,
+    "build_time_matrix": 1_000,
+    "brute_force": 10,
+    "brute_force_parallel": 10,
+    "held_karp": 12,
+    "branch_and_bound": 12,
+    "heuristic": 10_000,
+    "heuristic_cheapest_insertion": 10_000,
+    "heuristic_farthest_insertion": 10_000,
+    "anytime": 100,
+}
+"""
+largest catalogue each single-ship case runs on; above it the case is too slow or its
+n x n matrix too big to be worth timing
+"""
+MAX_FLEET_CELLS = 10_000_000
+"""
+ships x planets limit for the fleet-wide cases (feasibility, spaceship_capability_comparaison,
+build_time_tensor)
+"""
+FLEET_CASES = ("feasibility", "spaceship_capability_comparaison", "build_time_tensor")
+ANYTIME_DEADLINE_S = 0.2
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    planets: int
+    ships: int
+    repeats: int
+    best_s: float
+    median_s: float
+    mean_s: float
+    peak_bytes: int
+    """
+    tracemalloc peak of one extra run, NumPy buffers included
+    """
+    cost: Optional[float] = None
+    """
+    tour cost in seconds for the deterministic solver cases, so quality regressions show up too
+    """
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}[planets={self.planets},ships={self.ships}]"
+
+
+@dataclass
+class BenchmarkComparison:
+    key: str
+    status: str
+    """
+    "regression", "improvement", "unchanged", "new" or "missing"
+    """
+    baseline: Optional[BenchmarkResult] = None
+    current: Optional[BenchmarkResult] = None
+    notes: List[str] = field(default_factory=list)
+
+    @property
+    def ratio(self) -> Optional[float]:
+        if self.baseline is None or self.current is None or self.baseline.median_s <= 0:
+            return None
+        return self.current.median_s / self.baseline.median_s
+
+
+class TspBenchmark(ABC):
+    """_summary_
+    Builds the benchmark cases, times them, and stores or compares the results.
+    """
+
+    @staticmethod
+    def synthetic_bodies(n: int, seed: int = 0) -> SyntheticBodies:
+        """
+        `n` generated bodies (a sun first) with the "realistic" booster profile applied.
+        """
+        bodies = ScenarioGenerator.bodies(n, seed=seed, include_star=True)
+        boost = ScenarioGenerator.booster_profiles(n, seed=seed)["realistic"]
+        return SyntheticBodies(catalog=ScenarioGenerator.with_boost(bodies.catalog, boost), air_density=bodies.air_density, kind=bodies.kind)
+
+    @staticmethod
+    def synthetic_fleet(n: int, bodies: SyntheticBodies, seed: int = 0) -> Fleet:
+        """
+        `n` generated ships that can all exit and land on every body, so every case has a
+        finite tour to solve.
+        """
+        return ScenarioGenerator.fleet(n, bodies, seed=seed, reliable=True)
+
+    @staticmethod
+    def measure(
+        name: str,
+        planets: int,
+        ships: int,
+        function: Callable[[], object],
+        warmup: int = 1,
+        repeats: int = 5,
+        max_seconds: float = 10.0,
+        cost: Optional[Callable[[object], float]] = None,
+    ) -> BenchmarkResult:
+        """
+        Times `function` after `warmup` calls, lowering `repeats` so the timed runs take
+        roughly `max_seconds` at most, then runs it once under tracemalloc.
+        """
+        elapsed = 0.0
+        for _ in range(warmup):
+            started = time.perf_counter()
+            function()
+            elapsed = time.perf_counter() - started
+        if elapsed > 0:
+            repeats = max(1, min(repeats, int(max_seconds / elapsed)))
+
+        timings = []
+        value = None
+        for _ in range(repeats):
+            started = time.perf_counter()
+            value = function()
+            timings.append(time.perf_counter() - started)
+
+        tracemalloc.start()
+        try:
+            function()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        return BenchmarkResult(
+            name=name,
+            planets=planets,
+            ships=ships,
+            repeats=repeats,
+            best_s=min(timings),
+            median_s=statistics.median(timings),
+            mean_s=statistics.fmean(timings),
+            peak_bytes=peak,
+            cost=float(cost(value)) if cost is not None else None,
+        )
+
+    @staticmethod
+    def solvers() -> Dict[str, Callable[[np.ndarray], Tuple[float, List[int]]]]:
+        """
+        name -> function time_matrix -> (cost in seconds, closed tour), as in `tsp_cli`.
+        """
+
+        def anytime(time_metrix: np.ndarray) -> Tuple[float, List[int]]:
+            best = None
+            for best in TspMetaheuristics.iterate(time_metrix=time_metrix, deadline_s=ANYTIME_DEADLINE_S, seed=0):
+                pass
+            return best.cost, list(best.tour)
+
+        return {
+            "brute_force": TspUtils.brute_force_order,
+            "held_karp": TspUtils.held_karp_order,
+            "branch_and_bound": TspBranchAndBound.branch_and_bound_order,
+            "heuristic": TspHeuristics.heuristic_order,
+            "heuristic_cheapest_insertion": partial(TspHeuristics.heuristic_order, construction="cheapest_insertion"),
+            "heuristic_farthest_insertion": partial(TspHeuristics.heuristic_order, construction="farthest_insertion"),
+            "anytime": anytime,
+        }
+
+    @staticmethod
+    def cases(
+        planet_sizes: Sequence[int] = PLANET_SIZES,
+        fleet_sizes: Sequence[int] = FLEET_SIZES,
+        seed: int = 0,
+    ) -> Iterator[Tuple[str, int, int, Callable[[], object], Optional[Callable[[object], float]]]]:
+        """
+        Yields (name, planets, ships, function, cost) for every case within `SIZE_LIMITS`
+        and `MAX_FLEET_CELLS`. Inputs are built lazily, one catalogue at a time.
+        """
+        from tsp_final import spaceship_capability_comparaison
+
+        def capability_comparaison(planets, spaceships):
+            with contextlib.redirect_stdout(io.StringIO()):
+                return spaceship_capability_comparaison(planetList=planets, spaceship_list=spaceships)
+
+        solvers = TspBenchmark.solvers()
+        for n in planet_sizes:
+            bodies = TspBenchmark.synthetic_bodies(n, seed)
+            catalog = bodies.catalog
+            ship = TspBenchmark.synthetic_fleet(1, bodies, seed)[0]
+            planets = list(catalog)
+
+            if n <= SIZE_LIMITS["spaceship_physics"]:
+                def physics(ship=ship, planets=planets):
+                    return [
+                        ship.calculate_total_journey_seconds_from_planetA_to_planetB(planetA=planets[i - 1], planetB=planets[i])
+                        for i in range(len(planets))
+                    ]
+                yield "spaceship_physics", n, 1, physics, None
+
+            if n <= SIZE_LIMITS["build_time_matrix"]:
+                yield "build_time_matrix", n, 1, (lambda catalog=catalog, ship=ship: TspUtils.build_time_matrix(formatted_planet_list=catalog, spaceship=ship)), None
+            if n <= max(SIZE_LIMITS[name] for name in (*solvers, "brute_force_parallel")):
+                time_metrix = TspUtils.build_time_matrix(formatted_planet_list=catalog, spaceship=ship)
+                for name, solver in solvers.items():
+                    if n <= SIZE_LIMITS[name]:
+                        # the anytime tour depends on how many iterations fit in the deadline
+                        cost = (lambda result: result[0]) if name != "anytime" else None
+                        yield name, n, 1, (lambda solver=solver, time_metrix=time_metrix: solver(time_metrix)), cost
+                if n <= SIZE_LIMITS["brute_force_parallel"]:
+                    # the pool start-up and the shard merge are part of the timed call
+                    yield "brute_force_parallel", n, 1, (
+                        lambda time_metrix=time_metrix, planets=planets: TspUtils.tsp_brute_force_parallel(time_metrix, planets, "benchmark")
+                    ), (lambda result: result[2].total_seconds())
+
+            for ships in fleet_sizes:
+                if n * ships > MAX_FLEET_CELLS:
+                    continue
+                fleet = TspBenchmark.synthetic_fleet(ships, bodies, seed)
+                yield "feasibility", n, ships, (lambda fleet=fleet, catalog=catalog: FeasibilityEngine.evaluate_planet_list(spaceships=fleet, planet_list=catalog).reliable_ships("default")), None
+                # what `tsp_final` runs: SpaceshipNode objects, the DataFrame and its printout
+                yield "spaceship_capability_comparaison", n, ships, (lambda spaceships=list(fleet), planets=planets: capability_comparaison(planets, spaceships)), None
+                if n * n * ships <= MAX_FLEET_CELLS:
+                    yield "build_time_tensor", n, ships, (lambda fleet=fleet, catalog=catalog: TspUtils.build_time_tensor(formatted_planet_list=catalog, spaceships=fleet)), None
+
+    @staticmethod
+    def run(
+        planet_sizes: Sequence[int] = PLANET_SIZES,
+        fleet_sizes: Sequence[int] = FLEET_SIZES,
+        warmup: int = 1,
+        repeats: int = 5,
+        max_seconds: float = 10.0,
+        only: Optional[Sequence[str]] = None,
+        seed: int = 0,
+        progress: Optional[Callable[[BenchmarkResult], None]] = None,
+    ) -> List[BenchmarkResult]:
+        """
+        Runs every case (or the ones named in `only`) and returns their results.
+        """
+        results = []
+        for name, planets, ships, function, cost in TspBenchmark.cases(planet_sizes, fleet_sizes, seed):
+            if only and name not in only:
+                continue
+            result = TspBenchmark.measure(name, planets, ships, function, warmup, repeats, max_seconds, cost)
+            results.append(result)
+            if progress is not None:
+                progress(result)
+        return results
+
+    @staticmethod
+    def save(results: Sequence[BenchmarkResult], path: str, settings: Optional[Dict] = None) -> None:
+        """
+        Writes a baseline: the results plus the machine and `settings` used to get them.
+        """
+        import pandas as pd
+
+        document = {
+            "format_version": BENCHMARK_FORMAT_VERSION,
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "machine": {
+                "python": platform.python_version(),
+                "numpy": np.__version__,
+                "pandas": pd.__version__,
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+            },
+            "settings": settings or {},
+            "results": [asdict(result) for result in results],
+        }
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(document, f, indent=2)
+
+    @staticmethod
+    def load(path: str) -> Tuple[List[BenchmarkResult], Dict]:
+        """
+        Returns (results, whole document).
+
+        Raises:
+            ValueError: for a baseline written by another format version.
+        """
+        with open(path, encoding="utf-8") as f:
+            document = json.load(f)
+        if document.get("format_version") != BENCHMARK_FORMAT_VERSION:
+            raise ValueError(f"{path} has benchmark format {document.get('format_version')}, expected {BENCHMARK_FORMAT_VERSION}")
+        return [BenchmarkResult(**result) for result in document["results"]], document
+
+    @staticmethod
+    def compare(
+        baseline: Sequence[BenchmarkResult],
+        current: Sequence[BenchmarkResult],
+        threshold: float = 0.2,
+        min_seconds: float = 1e-4,
+    ) -> List[BenchmarkComparison]:
+        """
+        Matches results by case and flags a regression when the median time grows by more
+        than `threshold` (0.2 = 20%) and by more than `min_seconds`, when the peak memory
+        grows by more than `threshold`, or when a solver's tour cost gets worse.
+        """
+        baseline_by_key = {result.key: result for result in baseline}
+        current_by_key = {result.key: result for result in current}
+        comparisons = []
+        for key in list(baseline_by_key) + [key for key in current_by_key if key not in baseline_by_key]:
+            before, after = baseline_by_key.get(key), current_by_key.get(key)
+            if before is None or after is None:
+                comparisons.append(BenchmarkComparison(key=key, status="new" if before is None else "missing", baseline=before, current=after))
+                continue
+            comparison = BenchmarkComparison(key=key, status="unchanged", baseline=before, current=after)
+            slower = after.median_s - before.median_s
+            if after.median_s > before.median_s * (1 + threshold) and slower > min_seconds:
+                comparison.notes.append(f"median {before.median_s:.6f}s -> {after.median_s:.6f}s")
+            if after.peak_bytes > before.peak_bytes * (1 + threshold) and after.peak_bytes - before.peak_bytes > 64 * 1024:
+                comparison.notes.append(f"peak memory {before.peak_bytes} -> {after.peak_bytes} bytes")
+            if before.cost is not None and after.cost is not None and after.cost > before.cost * (1 + 1e-9):
+                comparison.notes.append(f"tour cost {before.cost:.3f}s -> {after.cost:.3f}s")
+            if comparison.notes:
+                comparison.status = "regression"
+            elif after.median_s < before.median_s * (1 - threshold) and -slower > min_seconds:
+                comparison.status = "improvement"
+            comparisons.append(comparison)
+        return comparisons
+
+
+def format_result(result: BenchmarkResult) -> str:
+    cost = f"  cost {result.cost:.1f}s" if result.cost is not None else ""
+    return f"{result.key:<52} median {result.median_s * 1e3:10.3f} ms  best {result.best_s * 1e3:10.3f} ms  x{result.repeats:<3} peak {result.peak_bytes / 1e6:9.2f} MB{cost}"
+
+
+def format_comparison(comparison: BenchmarkComparison) -> str:
+    ratio = f"x{comparison.ratio:.2f}" if comparison.ratio is not None else ""
+    notes = f"  ({'; '.join(comparison.notes)})" if comparison.notes else ""
+    return f"{comparison.status:<12} {comparison.key:<52} {ratio}{notes}"
+
+
+def parse_sizes(text: Optional[str], default: Sequence[int]) -> Tuple[int, ...]:
+    return tuple(int(size) for size in text.split(",")) if text else tuple(default)
+
+
+def command_run(args: argparse.Namespace) -> int:
+    planet_sizes = parse_sizes(args.planets, QUICK_PLANET_SIZES if args.quick else PLANET_SIZES)
+    fleet_sizes = parse_sizes(args.ships, QUICK_FLEET_SIZES if args.quick else FLEET_SIZES)
+    results = TspBenchmark.run(
+        planet_sizes=planet_sizes,
+        fleet_sizes=fleet_sizes,
+        warmup=args.warmup,
+        repeats=args.repeats,
+        max_seconds=args.max_seconds,
+        only=args.case,
+        seed=args.seed,
+        progress=lambda result: print(format_result(result), flush=True),
+    )
+    settings = {"planet_sizes": planet_sizes, "fleet_sizes": fleet_sizes, "warmup": args.warmup, "repeats": args.repeats, "max_seconds": args.max_seconds, "case": args.case, "seed": args.seed}
+    if args.output:
+        TspBenchmark.save(results, args.output, settings)
+        print(f"wrote {args.output}")
+    return 0
+
+
+def command_compare(args: argparse.Namespace) -> int:
+    baseline, document = TspBenchmark.load(args.baseline)
+    if args.current:
+        current, _ = TspBenchmark.load(args.current)
+    else:
+        settings = document.get("settings", {})
+        current = TspBenchmark.run(
+            planet_sizes=settings.get("planet_sizes", PLANET_SIZES),
+            fleet_sizes=settings.get("fleet_sizes", FLEET_SIZES),
+            warmup=settings.get("warmup", 1),
+            repeats=settings.get("repeats", 5),
+            max_seconds=settings.get("max_seconds", 10.0),
+            only=settings.get("case"),
+            seed=settings.get("seed", 0),
+        )
+    comparisons = TspBenchmark.compare(baseline, current, threshold=args.threshold)
+    for comparison in comparisons:
+        print(format_comparison(comparison))
+    regressions = sum(comparison.status == "regression" for comparison in comparisons)
+    print(f"{regressions} regression(s) beyond {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m tsp_benchmark", description="Times the physics, matrix, feasibility and solver hot paths.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="time every case, optionally writing a baseline")
+    run.add_argument("--output", default=None, help="JSON baseline to write")
+    run.add_argument("--quick", action="store_true", help=f"planets {QUICK_PLANET_SIZES} and ships {QUICK_FLEET_SIZES} only")
+    run.add_argument("--planets", default=None, help="comma separated catalogue sizes")
+    run.add_argument("--ships", default=None, help="comma separated fleet sizes")
+    run.add_argument("--case", action="append", default=None, choices=sorted(set(SIZE_LIMITS) | set(FLEET_CASES)), help="run only this case, repeat for several")
+    run.add_argument("--warmup", type=int, default=1)
+    run.add_argument("--repeats", type=int, default=5)
+    run.add_argument("--max-seconds", type=float, default=10.0, help="time budget per case, fewer repeats for slow cases")
+    run.add_argument("--seed", type=int, default=0)
+    run.set_defaults(handler=command_run)
+
+    compare = commands.add_parser("compare", help="compare against a baseline, exit code 1 on regressions")
+    compare.add_argument("baseline")
+    compare.add_argument("--current", default=None, help="results to compare instead of a fresh run with the baseline's settings")
+    compare.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown, 0.2 = 20%% (default)")
+    compare.set_defaults(handler=command_compare)
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        return args.handler(args)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
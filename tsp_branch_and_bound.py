@@ -0,0 +1,250 @@
+from abc import ABC
+from dataclasses import dataclass, field
+import time
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from instrumentation import instrumented
+from node import BasePlanetNode
+from tsp_heuristics import TspHeuristics
+from tsp_utils import TspUtils
+
+
+@dataclass
+class BranchAndBoundStats:
+    nodes_expanded: int = 0
+    """
+    partial tours whose children were generated
+    """
+    nodes_pruned: int = 0
+    """
+    children discarded because their lower bound reached the incumbent
+    """
+    incumbent_updates: int = 0
+    root_lower_bound: float = 0.0
+    elapsed_s: float = 0.0
+    optimal: bool = False
+    """
+    False when the search stopped on its time limit
+    """
+    gap_history: List[Tuple[float, int, float, float]] = field(default_factory=list)
+    """
+    (elapsed_s, nodes_expanded, incumbent_cost, lower_bound) samples; the relative gap
+    is (incumbent_cost - lower_bound) / incumbent_cost
+    """
+
+
+class TspBranchAndBound(ABC):
+    """_summary_
+    Depth-first branch-and-bound over a `build_time_matrix` output (asymmetric allowed).
+    Partial tours grow from node 0; a child is pruned when its cost plus an admissible
+    bound on the remaining Hamiltonian path back to 0 cannot beat the incumbent.
+    Memory stays O(n^2): the current path plus the pending children of each level.
+    """
+
+    BOUNDS = ("min_edges", "reduction", "one_tree")
+
+    @staticmethod
+    def min_edges_bound(sub: np.ndarray) -> float:
+        """
+        max(sum of cheapest outgoing edges, sum of cheapest incoming edges) of a sub-problem
+        whose rows are the nodes still to leave and whose columns are the nodes still to enter.
+        """
+        return float(max(sub.min(axis=1).sum(), sub.min(axis=0).sum()))
+
+    @staticmethod
+    def reduction_bound(sub: np.ndarray) -> float:
+        """
+        Reduced-cost matrix bound: row reductions followed by column reductions.
+        """
+        row_min = sub.min(axis=1)
+        if not np.all(np.isfinite(row_min)):
+            return np.inf
+        reduced = sub - row_min[:, None]
+        return float(row_min.sum() + reduced.min(axis=0).sum())
+
+    @staticmethod
+    def minimum_spanning_tree_cost(symmetric: np.ndarray, nodes: np.ndarray) -> float:
+        """
+        Prim's algorithm on the symmetric costs restricted to `nodes`.
+        """
+        if len(nodes) < 2:
+            return 0.0
+        sub = symmetric[np.ix_(nodes, nodes)]
+        in_tree = np.zeros(len(nodes), dtype=bool)
+        in_tree[0] = True
+        best = sub[0].copy()
+        total = 0.0
+        for _ in range(len(nodes) - 1):
+            candidates = np.where(in_tree, np.inf, best)
+            nxt = int(np.argmin(candidates))
+            total += candidates[nxt]
+            in_tree[nxt] = True
+            best = np.minimum(best, sub[nxt])
+        return float(total)
+
+    @staticmethod
+    def one_tree_bound(symmetric: np.ndarray, last: int, unvisited: np.ndarray) -> float:
+        """
+        Undirected relaxation using min(c_ij, c_ji). From the root the rest of the tour is a
+        cycle through 0, bounded by a 1-tree; afterwards it is a Hamiltonian path from `last`
+        to 0, bounded by a spanning tree.
+        """
+        if last == 0:
+            if len(unvisited) < 2:
+                return float(2 * symmetric[0, unvisited].sum())
+            two_cheapest = np.sort(symmetric[0, unvisited])[:2].sum()
+            return float(TspBranchAndBound.minimum_spanning_tree_cost(symmetric, unvisited) + two_cheapest)
+        nodes = np.concatenate(([last, 0], unvisited))
+        return TspBranchAndBound.minimum_spanning_tree_cost(symmetric, nodes)
+
+    @staticmethod
+    def remaining_bound(matrix: np.ndarray, symmetric: np.ndarray, last: int, unvisited: np.ndarray, bounds: Sequence[str]) -> float:
+        """
+        Lower bound on the cost of leaving `last`, visiting every node in `unvisited` and
+        returning to 0: the max of the selected bounds. `matrix` must have an infinite diagonal.
+        """
+        if len(unvisited) == 0:
+            return float(matrix[last, 0])
+        # rows: nodes still to leave, cols: nodes still to enter; last -> 0 would skip the rest
+        sub = matrix[np.ix_(np.concatenate(([last], unvisited)), np.concatenate((unvisited, [0])))]
+        sub[0, -1] = np.inf
+        bound = 0.0
+        if "min_edges" in bounds:
+            bound = max(bound, TspBranchAndBound.min_edges_bound(sub))
+        if "reduction" in bounds:
+            bound = max(bound, TspBranchAndBound.reduction_bound(sub))
+        if "one_tree" in bounds:
+            bound = max(bound, TspBranchAndBound.one_tree_bound(symmetric, last, unvisited))
+        return bound
+
+    @staticmethod
+    @instrumented("solve")
+    def branch_and_bound_order(
+        time_metrix: np.ndarray,
+        bounds: Sequence[str] = ("reduction", "one_tree"),
+        initial_tour: Optional[Sequence[int]] = None,
+        time_limit_s: Optional[float] = None,
+        report_every: int = 10_000,
+        stats: Optional[BranchAndBoundStats] = None,
+    ) -> Tuple[float, List[int]]:
+        """
+        Runs the search and returns (cost in seconds, closed tour order from 0).
+
+        Args:
+            time_metrix (np.ndarray): n x n matrix of seconds, np.inf for forbidden legs.
+            bounds (Sequence[str]): any of `BOUNDS`; the max of the selected bounds is used.
+            initial_tour (Sequence[int]): incumbent seed, nearest neighbour when omitted.
+            time_limit_s (float): stop early and return the incumbent, stats.optimal is then False.
+            report_every (int): expansions between two gap_history samples.
+            stats (BranchAndBoundStats): filled in place when given.
+        """
+        unknown = set(bounds) - set(TspBranchAndBound.BOUNDS)
+        if unknown:
+            raise ValueError(f"unknown bounds {sorted(unknown)}, expected any of {TspBranchAndBound.BOUNDS}")
+        stats = stats if stats is not None else BranchAndBoundStats()
+        matrix = np.array(time_metrix, dtype=np.float64)
+        n = matrix.shape[0]
+        if n < 2:
+            stats.optimal = True
+            return float(matrix[0, 0]) if n else 0.0, [0, 0]
+        np.fill_diagonal(matrix, np.inf)
+        symmetric = np.minimum(matrix, matrix.T)
+        started = time.perf_counter()
+
+        def tour_cost(tour: Sequence[int]) -> float:
+            return float(sum(matrix[tour[i], tour[i + 1]] for i in range(len(tour) - 1)))
+
+        incumbent = list(initial_tour) if initial_tour is not None else TspHeuristics.nearest_neighbour(matrix, start=0).tolist() + [0]
+        incumbent_cost = tour_cost(incumbent)
+        visited = np.zeros(n, dtype=bool)
+        visited[0] = True
+        stats.root_lower_bound = TspBranchAndBound.remaining_bound(matrix, symmetric, 0, np.arange(1, n), bounds)
+        path = [0]
+        # bounds of the children still to explore, per depth, for the global lower bound
+        pending: List[List[float]] = []
+        timed_out = False
+
+        def lower_bound() -> float:
+            open_bounds = [bound for level in pending for bound in level]
+            return float(min(open_bounds + [incumbent_cost]))
+
+        def record() -> None:
+            stats.gap_history.append((time.perf_counter() - started, stats.nodes_expanded, incumbent_cost, lower_bound()))
+
+        def search(cost: float) -> None:
+            nonlocal incumbent, incumbent_cost, timed_out
+            last = path[-1]
+            unvisited = np.flatnonzero(~visited)
+            if len(unvisited) == 0:
+                total = cost + matrix[last, 0]
+                if total < incumbent_cost:
+                    incumbent, incumbent_cost = path + [0], float(total)
+                    stats.incumbent_updates += 1
+                    record()
+                return
+
+            stats.nodes_expanded += 1
+            if stats.nodes_expanded % report_every == 0:
+                record()
+            # every expansion: one costs up to milliseconds on large matrices
+            if time_limit_s is not None and time.perf_counter() - started > time_limit_s:
+                timed_out = True
+
+            children = []
+            for nxt in unvisited[np.argsort(matrix[last, unvisited], kind="stable")]:
+                child_cost = cost + matrix[last, nxt]
+                visited[nxt] = True
+                bound = child_cost + TspBranchAndBound.remaining_bound(matrix, symmetric, int(nxt), np.flatnonzero(~visited), bounds)
+                visited[nxt] = False
+                if bound < incumbent_cost:
+                    children.append((bound, child_cost, int(nxt)))
+                else:
+                    stats.nodes_pruned += 1
+            children.sort()
+
+            level = [bound for bound, _, _ in children]
+            pending.append(level)
+            for index, (bound, child_cost, nxt) in enumerate(children):
+                level.pop(0)
+                if timed_out:
+                    break
+                if bound >= incumbent_cost:
+                    stats.nodes_pruned += len(children) - index
+                    break
+                visited[nxt] = True
+                path.append(nxt)
+                search(child_cost)
+                path.pop()
+                visited[nxt] = False
+            pending.pop()
+
+        search(0.0)
+        stats.elapsed_s = time.perf_counter() - started
+        stats.optimal = not timed_out
+        record()
+        return incumbent_cost, incumbent
+
+    @staticmethod
+    def tsp_branch_and_bound(
+        time_metrix: np.ndarray,
+        formatted_planet_list: List[BasePlanetNode],
+        shipName: str,
+        bounds: Sequence[str] = ("reduction", "one_tree"),
+        time_limit_s: Optional[float] = None,
+        stats: Optional[BranchAndBoundStats] = None,
+    ):
+        """
+        Same inputs and (shipName, legs, tour_time, summary) output as `TspUtils.tsp_brute_force`.
+        Pass a BranchAndBoundStats to read the nodes expanded / pruned and the gap history.
+        """
+        _, tour = TspBranchAndBound.branch_and_bound_order(
+            time_metrix=time_metrix, bounds=bounds, time_limit_s=time_limit_s, stats=stats,
+        )
+        return TspUtils.format_tour_result(
+            time_metrix=time_metrix,
+            formatted_planet_list=formatted_planet_list,
+            shipName=shipName,
+            tour_order=tour,
+        )
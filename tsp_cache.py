@@ -0,0 +1,275 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from instrumentation import count, phase
+from node import BasePlanetNode
+from ship_physics import ShipPhysics
+from spaceship_node import SpaceshipNode
+from tsp_utils import TspUtils
+
+CACHE_FORMAT_VERSION = 2
+"""
+bump when the physics or the stored layout changes, so stale entries stop matching
+"""
+
+
+@dataclass
+class CacheStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    """
+    entries dropped from the memory tier to stay under its byte budget
+    """
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class TspCache:
+    """_summary_
+    Content-addressed cache in front of `TspUtils.build_time_matrix` and the exact solvers.
+
+    Keys are sha256 digests of a canonical JSON description of the ship (class, mass, thrust,
+    friction table) and of every planet field, in tour order, so they are identical across
+    processes and runs, unlike Python's salted `hash()` of strings.
+    Two tiers are used: an in-memory LRU bounded in bytes, then, when `cache_dir` is given,
+    `.npy` time matrices (opened memory-mapped) and JSON tour results on disk.
+    Cached matrices are read-only; copy them before modifying.
+    """
+
+    SOLVERS: Dict[str, Callable[[np.ndarray], Tuple[float, List[int]]]] = {
+        "brute_force": TspUtils.brute_force_order,
+        "held_karp": TspUtils.held_karp_order,
+    }
+
+    def __init__(self, cache_dir: Optional[str] = None, max_memory_bytes: int = 256 * 1024 * 1024):
+        """
+        Args:
+            cache_dir (str): directory of the disk tier, memory only when None.
+            max_memory_bytes (int): budget of the in-memory LRU tier.
+        """
+        self.cache_dir = cache_dir
+        self.max_memory_bytes = max_memory_bytes
+        self.stats = CacheStats()
+        self._memory: "OrderedDict[str, Tuple[Any, int]]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        if cache_dir is not None:
+            os.makedirs(os.path.join(cache_dir, "matrices"), exist_ok=True)
+            os.makedirs(os.path.join(cache_dir, "tours"), exist_ok=True)
+
+    @staticmethod
+    def fingerprint(formatted_planet_list: List[BasePlanetNode], spaceship: Union[SpaceshipNode, ShipPhysics]) -> str:
+        """
+        Stable sha256 key of everything a time matrix depends on: the ship's `ShipPhysics`
+        (mass, thrust, friction table) and every planet field. A SpaceshipNode and its
+        `physics` snapshot share entries; a subclass with its own cost model is keyed apart.
+        """
+        physics = spaceship if isinstance(spaceship, ShipPhysics) else spaceship.physics
+        model = "stock" if TspUtils.has_separable_cost_model(spaceship) else f"{type(spaceship).__module__}.{type(spaceship).__qualname__}"
+        description = {
+            "version": CACHE_FORMAT_VERSION,
+            "ship": {
+                "model": model,
+                "mass": float(physics.mass),
+                "engine_thrust_power": float(physics.engine_thrust_power),
+                "air_friction": {name: float(value) for name, value in physics.air_friction},
+            },
+            "planets": [
+                {
+                    "name": planet.name,
+                    "surface_gravety_g": float(planet.surface_gravety_g),
+                    "distance_from_the_sun": float(planet.distance_from_the_sun),
+                    "atmosphere_altitude": float(planet.atmosphere_altitude),
+                    "station_boost_for_thrust_power_launch": float(planet.station_boost_for_thrust_power_launch),
+                }
+                for planet in formatted_planet_list
+            ],
+        }
+        canonical = json.dumps(description, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def _memory_get(self, key: str, record: bool = True) -> Any:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            self._memory.move_to_end(key)
+            if record:
+                self.stats.memory_hits += 1
+        if record:
+            count("cache_memory_hits")
+        return entry[0]
+
+    def _memory_put(self, key: str, value: Any, size: int) -> None:
+        with self._lock:
+            if size > self.max_memory_bytes:
+                return
+            previous = self._memory.pop(key, None)
+            if previous is not None:
+                self._memory_bytes -= previous[1]
+            self._memory[key] = (value, size)
+            self._memory_bytes += size
+            while self._memory_bytes > self.max_memory_bytes:
+                _, (_, evicted_size) = self._memory.popitem(last=False)
+                self._memory_bytes -= evicted_size
+                self.stats.evictions += 1
+
+    def _record(self, disk_hit: bool) -> None:
+        with self._lock:
+            if disk_hit:
+                self.stats.disk_hits += 1
+            else:
+                self.stats.misses += 1
+        count("cache_disk_hits" if disk_hit else "cache_misses")
+
+    def _path(self, kind: str, key: str, extension: str) -> Optional[str]:
+        if self.cache_dir is None:
+            return None
+        return os.path.join(self.cache_dir, kind, key + extension)
+
+    @staticmethod
+    def _atomic_write(path: str, write: Callable[[Any], None]) -> None:
+        """
+        Writes through a temporary file in the same directory and renames it into place,
+        so concurrent readers never see a partial entry.
+        """
+        handle, temporary = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(handle, "wb") as file:
+                write(file)
+            os.replace(temporary, path)
+        except BaseException:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+
+    def time_matrix(self, formatted_planet_list: List[BasePlanetNode], spaceship: SpaceshipNode) -> np.ndarray:
+        """
+        Cached `TspUtils.build_time_matrix`. MechanicalError is raised, never cached.
+        """
+        return self._time_matrix(formatted_planet_list, spaceship, record=True)
+
+    def _time_matrix(self, formatted_planet_list: List[BasePlanetNode], spaceship: SpaceshipNode, record: bool) -> np.ndarray:
+        """
+        `time_matrix`, counted in the stats only when `record`: a matrix loaded on behalf of
+        a tour lookup is part of that lookup.
+        """
+        with phase("cache"):
+            key = self.fingerprint(formatted_planet_list, spaceship)
+            matrix = self._memory_get(key, record=record)
+            if matrix is not None:
+                return matrix
+            path = self._path("matrices", key, ".npy")
+            if path is not None and os.path.exists(path):
+                matrix = np.load(path, mmap_mode="r")
+                if record:
+                    self._record(disk_hit=True)
+                self._memory_put(key, matrix, matrix.nbytes)
+                return matrix
+
+        matrix = np.asarray(TspUtils.build_time_matrix(formatted_planet_list=formatted_planet_list, spaceship=spaceship), dtype=np.float64)
+        matrix.setflags(write=False)
+        with phase("cache"):
+            if record:
+                self._record(disk_hit=False)
+            if path is not None:
+                self._atomic_write(path, lambda file: np.save(file, matrix))
+            self._memory_put(key, matrix, matrix.nbytes)
+        return matrix
+
+    def order(
+        self,
+        formatted_planet_list: List[BasePlanetNode],
+        spaceship: SpaceshipNode,
+        solver_name: str = "held_karp",
+        solver: Optional[Callable[[np.ndarray], Tuple[float, List[int]]]] = None,
+    ) -> Tuple[float, List[int]]:
+        """
+        Cached (cost in seconds, closed tour order) of a solver on the ship's time matrix.
+
+        Args:
+            solver_name (str): part of the key, one of `SOLVERS` unless `solver` is given.
+            solver (Callable): custom exact solver, stored under `solver_name`.
+        """
+        cost, tour, _ = self._order(formatted_planet_list, spaceship, solver_name, solver)
+        return cost, tour
+
+    def _order(
+        self,
+        formatted_planet_list: List[BasePlanetNode],
+        spaceship: SpaceshipNode,
+        solver_name: str,
+        solver: Optional[Callable[[np.ndarray], Tuple[float, List[int]]]],
+    ) -> Tuple[float, List[int], Optional[np.ndarray]]:
+        """
+        `order` plus the time matrix when a miss had to load it, None on a hit.
+        """
+        solver = solver if solver is not None else self.SOLVERS[solver_name]
+        with phase("cache"):
+            key = hashlib.sha256(f"{self.fingerprint(formatted_planet_list, spaceship)}:{solver_name}".encode("utf-8")).hexdigest()
+            result = self._memory_get(key)
+            if result is not None:
+                return result[0], list(result[1]), None
+            path = self._path("tours", key, ".json")
+            if path is not None and os.path.exists(path):
+                with open(path, "r", encoding="utf-8") as file:
+                    stored = json.load(file)
+                cost, tour = float(stored["cost"]), [int(node) for node in stored["tour"]]
+                self._record(disk_hit=True)
+                self._memory_put(key, (cost, tuple(tour)), 64 + 8 * len(tour))
+                return cost, tour, None
+
+        # the matrix load and the solve are timed as their own phases, not as "cache"
+        matrix = self._time_matrix(formatted_planet_list, spaceship, record=False)
+        cost, tour = solver(matrix)
+        cost, tour = float(cost), [int(node) for node in tour]
+        with phase("cache"):
+            self._record(disk_hit=False)
+            if path is not None:
+                payload = json.dumps({"solver": solver_name, "cost": cost, "tour": tour}).encode("utf-8")
+                self._atomic_write(path, lambda file: file.write(payload))
+            self._memory_put(key, (cost, tuple(tour)), 64 + 8 * len(tour))
+        return cost, tour, matrix
+
+    def tsp(
+        self,
+        formatted_planet_list: List[BasePlanetNode],
+        spaceship: SpaceshipNode,
+        shipName: str,
+        solver_name: str = "held_karp",
+    ):
+        """
+        Cached solve returning the usual (shipName, legs, tour_time, summary) tuple.
+        Counts one hit or miss per call, for the tour; the matrix it formats with is not counted.
+        """
+        _, tour, matrix = self._order(formatted_planet_list, spaceship, solver_name, None)
+        if matrix is None:
+            matrix = self._time_matrix(formatted_planet_list, spaceship, record=False)
+        return TspUtils.format_tour_result(
+            time_metrix=matrix,
+            formatted_planet_list=formatted_planet_list,
+            shipName=shipName,
+            tour_order=tour,
+        )
+
+    def clear_memory(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
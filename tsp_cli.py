@@ -0,0 +1,370 @@
+"""
+Command line entry point: `python -m tsp_cli <command> [options]`.
+
+    feasibility   which ships can exit and land on every planet of a scenario
+    solve         best tour for each reliable ship (or --ship), headless
+    rank          fleet ranking on the shared tour
+    render        solve, then draw the fastest ship's tour (to files with --output-dir)
+    results       query a --results-dir written by the other commands, without solving
+
+Scenarios are the built-in booster profiles (extreme, realistic, minimal) or the profiles
+of a `--data-dir` read by `ScenarioLoader`. Only the standard library is imported at start-up;
+every command imports what it needs, so a headless `solve` never loads matplotlib.
+"""
+import argparse
+from contextlib import contextmanager
+import json
+import os
+import sys
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Type
+
+BUILTIN_SCENARIOS = ("extreme", "realistic", "minimal")
+SOLVERS = ("held_karp", "brute_force", "branch_and_bound", "heuristic", "anytime")
+INPUT_ERRORS: Tuple[Type[Exception], ...] = (KeyError, FileNotFoundError, ImportError, ValueError)
+"""
+what loading the arguments and the data raises for a bad value, a missing file or package
+"""
+
+
+class UsageError(Exception):
+    """
+    Bad arguments or input data: `main` prints the message and exits with status 2.
+    """
+
+
+@contextmanager
+def invalid_input(errors: Tuple[Type[Exception], ...] = INPUT_ERRORS) -> Iterator[None]:
+    """
+    Turns `errors` raised while loading arguments or data into a UsageError. Only wrap the
+    loading: the same exception types raised by a solve are bugs and must propagate.
+    """
+    try:
+        yield
+    except errors as e:
+        raise UsageError(e.args[0] if e.args else str(e)) from e
+
+
+def load_scenarios(scenario: str, data_dir: Optional[str]) -> Tuple[List[Tuple[str, Sequence]], Sequence]:
+    """
+    Returns ([(scenario name, planets)], ships) for `scenario` ("all" for every profile).
+    Built-in scenarios give planet and ship lists, a data directory gives a catalogue and a Fleet.
+
+    Raises:
+        KeyError: for an unknown scenario name.
+    """
+    if data_dir is not None:
+        from scenario_loader import ScenarioLoader
+
+        data = ScenarioLoader.load_directory(data_dir)
+        for kind, report in data.reports.items():
+            if not report.ok:
+                print(f"{kind}: {report}", file=sys.stderr)
+        scenarios = list(data.scenarios())
+        ships = data.fleet
+    else:
+        from scenarios import Scenarios
+
+        profiles = {
+            "extreme": Scenarios.super_boosters_extreme,
+            "realistic": Scenarios.super_boosters_realistic,
+            "minimal": Scenarios.super_boosters_minimal,
+        }
+        names = BUILTIN_SCENARIOS if scenario == "all" else (scenario,)
+        scenarios = [(name, Scenarios.construct_planets_with_boosters(boosters=profiles[name]())) for name in names if name in profiles]
+        ships = Scenarios.construct_spaceships(spaceshipData=Scenarios.spaceshipData())
+    if scenario != "all":
+        scenarios = [(name, planets) for name, planets in scenarios if name == scenario]
+        if not scenarios:
+            raise KeyError(f"unknown scenario {scenario}")
+    return scenarios, ships
+
+
+def from_starting_node(planets: Sequence, starting_node: str) -> Sequence:
+    from planet_catalog import PlanetCatalog
+    from tsp_utils import TspUtils
+
+    if isinstance(planets, PlanetCatalog):
+        return planets.starting_at(starting_node)
+    return TspUtils.format_planet_list_from_starting_node(planet_list=list(planets), starting_node=starting_node)
+
+
+def solver_function(name: str, deadline_s: float) -> Callable:
+    """
+    Maps a solver name to a function time_matrix -> (cost in seconds, closed tour from 0).
+    """
+    if name == "held_karp":
+        from tsp_utils import TspUtils
+        return TspUtils.held_karp_order
+    if name == "brute_force":
+        from tsp_utils import TspUtils
+        return TspUtils.brute_force_order
+    if name == "branch_and_bound":
+        from tsp_branch_and_bound import TspBranchAndBound
+        return TspBranchAndBound.branch_and_bound_order
+    if name == "heuristic":
+        from tsp_heuristics import TspHeuristics
+        return TspHeuristics.heuristic_order
+    from tsp_metaheuristics import TspMetaheuristics
+
+    def anytime(time_metrix):
+        best = None
+        for best in TspMetaheuristics.iterate(time_metrix=time_metrix, deadline_s=deadline_s):
+            pass
+        return best.cost, list(best.tour)
+    return anytime
+
+
+def reliable_ship_names(ships: Sequence, planets: Sequence, wanted: Optional[List[str]]) -> List[str]:
+    from feasibility import FeasibilityEngine
+
+    reliable = FeasibilityEngine.evaluate_planet_list(spaceships=ships, planet_list=planets).reliable_ships("default")
+    if not wanted:
+        return reliable
+    for name in wanted:
+        if name not in reliable:
+            print(f"skipping {name}: unknown, or cannot exit or land on every planet", file=sys.stderr)
+    return [name for name in wanted if name in reliable]
+
+
+def open_store(args: argparse.Namespace):
+    if getattr(args, "results_dir", None) is None:
+        return None
+    from results_store import ResultsStore
+    return ResultsStore(args.results_dir)
+
+
+def solve_scenario(args: argparse.Namespace, planets: Sequence, ships: Sequence, scenario: str = "default", store=None) -> List[tuple]:
+    """
+    (shipName, legs, tour_time, summary) per reliable ship, fastest first.
+    With a `ResultsStore` as `store`, every result is appended to it under `scenario`.
+    """
+    import time
+
+    from tsp_utils import TspUtils
+
+    with invalid_input():
+        formatted_planet_list = from_starting_node(planets, args.start)
+    cache = None
+    if args.cache_dir is not None:
+        from tsp_cache import TspCache
+        cache = TspCache(cache_dir=args.cache_dir)
+    solver = solver_function(args.solver, args.deadline)
+
+    results = []
+    for name in reliable_ship_names(ships, formatted_planet_list, args.ship):
+        spaceship = TspUtils.check_ship_is_valid(ship_name=name, ship_list=ships)
+        started = time.perf_counter()
+        if cache is not None and args.solver in cache.SOLVERS:
+            results.append(cache.tsp(formatted_planet_list=formatted_planet_list, spaceship=spaceship, shipName=name, solver_name=args.solver))
+        else:
+            time_metrix = TspUtils.build_time_matrix(formatted_planet_list=formatted_planet_list, spaceship=spaceship)
+            _, tour = solver(time_metrix)
+            results.append(TspUtils.format_tour_result(time_metrix=time_metrix, formatted_planet_list=formatted_planet_list, shipName=name, tour_order=tour))
+        if store is not None:
+            store.append_solve(scenario, results[-1], solver=args.solver, runtime_s=time.perf_counter() - started)
+    return sorted(results, key=lambda result: result[2].total_seconds())
+
+
+def command_feasibility(args: argparse.Namespace) -> int:
+    from feasibility import FeasibilityEngine
+
+    with invalid_input():
+        scenarios, ships = load_scenarios(args.scenario, args.data_dir)
+        store = open_store(args)
+    for name, planets in scenarios:
+        report = FeasibilityEngine.evaluate_planet_list(spaceships=ships, planet_list=planets, scenario=name)
+        if store is not None:
+            store.append_feasibility(report)
+        print(f"### {name}")
+        print(report.to_dataframe(scenario=name))
+        print(f"reliable ships: {report.reliable_ships(name)}\n")
+    if store is not None:
+        store.close()
+    return 0
+
+
+def command_solve(args: argparse.Namespace) -> int:
+    with invalid_input():
+        scenarios, ships = load_scenarios(args.scenario, args.data_dir)
+        store = open_store(args)
+    for name, planets in scenarios:
+        print(f"### {name} ({args.solver})")
+        for result in solve_scenario(args, planets, ships, scenario=name, store=store):
+            print(result[-1])
+        print()
+    if store is not None:
+        store.close()
+    return 0
+
+
+def command_rank(args: argparse.Namespace) -> int:
+    from feasibility import FeasibilityEngine
+    from tsp_utils import TspUtils
+
+    with invalid_input():
+        scenarios, ships = load_scenarios(args.scenario, args.data_dir)
+    for name, planets in scenarios:
+        print(f"### {name}")
+        feasible = FeasibilityEngine.evaluate_planet_list(spaceships=ships, planet_list=planets).to_dataframe("default")
+        reliable = feasible[feasible.all(axis=1)]
+        if reliable.empty:
+            print("no ship can exit and land on every planet\n")
+            continue
+        TspUtils.construct_fleet_ranking(
+            chosen_planet_list=list(planets),
+            reliable_ships=reliable,
+            starting_node=args.start,
+            global_ship_list=ships,
+        )
+    return 0
+
+
+def planet_distances(planets: Sequence) -> Dict[str, float]:
+    from planet_catalog import PlanetCatalog
+
+    if isinstance(planets, PlanetCatalog):
+        return dict(zip(planets.names, planets.distance_from_the_sun.tolist()))
+    return {planet.name: planet.distance_from_the_sun for planet in planets}
+
+
+def command_render(args: argparse.Namespace) -> int:
+    """
+    Without --output-dir every scenario opens a window in turn. With it, the scenarios are
+    solved one after the other while a background `TspRenderer` writes the images.
+    """
+    from tsp_render import TspRenderer
+    from tsp_utils import TspUtils
+
+    with invalid_input():
+        scenarios, ships = load_scenarios(args.scenario, args.data_dir)
+        store = open_store(args)
+    renderer = TspRenderer(args.output_dir, file_format=args.format) if args.output_dir is not None else None
+    rendered = []
+    for name, planets in scenarios:
+        results = solve_scenario(args, planets, ships, scenario=name, store=store)
+        if not results:
+            print(f"### {name}: no ship can exit and land on every planet")
+            continue
+        print(f"### {name}\n{results[0][-1]}")
+        if renderer is None:
+            TspUtils.show_graph(bruit_force_result=results[0], distances=planet_distances(planets))
+        else:
+            rendered.append(renderer.submit(results[0], name=f"{name} {results[0][0]}", distances=planet_distances(planets)))
+    if store is not None:
+        store.close()
+    if renderer is not None:
+        renderer.close()
+        for future in rendered:
+            print(f"wrote {future.result()}")
+    return 0
+
+
+def command_results(args: argparse.Namespace) -> int:
+    """
+    Reads a results directory part by part; nothing is solved again.
+    """
+    import pandas as pd
+
+    from results_store import SCHEMAS, ResultsStore
+
+    if not os.path.isdir(args.results_dir):
+        raise UsageError(f"no results directory {args.results_dir}")
+    columns = args.columns.split(",") if args.columns else None
+    unknown = [name for name in columns or () if name not in SCHEMAS[args.table]]
+    if unknown:
+        raise UsageError(f"unknown columns {', '.join(unknown)} of {args.table}, expected some of {', '.join(SCHEMAS[args.table])}")
+    store = ResultsStore(args.results_dir)
+    filters = {name: value for name, value in (("scenario", args.scenario), ("ship", args.ship)) if value is not None}
+    if args.export is not None:
+        with invalid_input((ImportError,)):
+            path = store.export_parquet(args.table, args.export)
+        print(f"wrote {path}")
+        return 0
+    if args.fastest:
+        table = store.fastest(**filters)
+    else:
+        table = store.read(args.table, columns, **filters)
+    with pd.option_context("display.max_rows", args.limit, "display.width", 200):
+        print(table)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m tsp_cli", description="Space travel TSP: feasibility, solving, ranking and rendering.")
+    parser.add_argument("--instrument", default=None, metavar="SPEC", help='phases to time, e.g. "all", "solve:profile,build_time_matrix" or "feasibility:memory" (default: $TSP_INSTRUMENT, off)')
+    parser.add_argument("--instrument-report", default=None, metavar="PATH", help="instrumentation report, .jsonl appends one line per run (default: $TSP_INSTRUMENT_REPORT)")
+    parser.add_argument("--log-level", default=None, help="level of the events written to --log-jsonl (default: $TSP_LOG_LEVEL, INFO); stderr only shows warnings")
+    parser.add_argument("--log-jsonl", default=None, metavar="PATH", help="append the physics and solver events to this JSON Lines file (default: $TSP_LOG_JSONL)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_scenario_arguments(command: argparse.ArgumentParser) -> None:
+        command.add_argument("--scenario", default="all", help=f"booster profile, one of {', '.join(BUILTIN_SCENARIOS)} for the built-in data, or all (default)")
+        command.add_argument("--data-dir", default=None, help="directory with planets.*, boosters.* and fleet.* files instead of the built-in data")
+
+    def add_solve_arguments(command: argparse.ArgumentParser) -> None:
+        command.add_argument("--start", default="Earth", help="starting planet (default Earth)")
+        command.add_argument("--ship", action="append", default=None, help="ship name, repeat for several (default: every reliable ship)")
+        command.add_argument("--solver", choices=SOLVERS, default="held_karp")
+        command.add_argument("--deadline", type=float, default=2.0, help="seconds for the anytime solver")
+        command.add_argument("--cache-dir", default=None, help="reuse time matrices and tours stored in this directory")
+        command.add_argument("--results-dir", default=None, help="append every solve to the columnar results store in this directory")
+
+    feasibility = commands.add_parser("feasibility", help="which ships can fly each scenario")
+    add_scenario_arguments(feasibility)
+    feasibility.add_argument("--results-dir", default=None, help="append the feasibility cube to the columnar results store in this directory")
+    feasibility.set_defaults(handler=command_feasibility)
+
+    solve = commands.add_parser("solve", help="best tour per ship, no plotting")
+    add_scenario_arguments(solve)
+    add_solve_arguments(solve)
+    solve.set_defaults(handler=command_solve)
+
+    rank = commands.add_parser("rank", help="fleet ranking on the shared tour")
+    add_scenario_arguments(rank)
+    rank.add_argument("--start", default="Earth", help="starting planet (default Earth)")
+    rank.set_defaults(handler=command_rank)
+
+    render = commands.add_parser("render", help="solve and draw the fastest ship's tour")
+    add_scenario_arguments(render)
+    add_solve_arguments(render)
+    render.add_argument("--output-dir", default=None, help="write one image per scenario here instead of opening windows")
+    render.add_argument("--format", choices=("png", "svg"), default="png", help="image format for --output-dir (default png)")
+    render.set_defaults(handler=command_render)
+
+    results = commands.add_parser("results", help="query a results store without solving again")
+    results.add_argument("results_dir", help="directory given as --results-dir to the other commands")
+    results.add_argument("--table", choices=("solves", "feasibility"), default="solves")
+    results.add_argument("--scenario", default=None, help="only this scenario")
+    results.add_argument("--ship", default=None, help="only this ship")
+    results.add_argument("--columns", default=None, help="comma separated columns to read (default: all)")
+    results.add_argument("--fastest", action="store_true", help="fastest solve per scenario")
+    results.add_argument("--export", default=None, metavar="PATH", help="write the table to one Parquet file (needs pyarrow)")
+    results.add_argument("--limit", type=int, default=60, help="rows to print before truncating (default 60)")
+    results.set_defaults(handler=command_results)
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    from event_log import configure_logging, shutdown_logging
+    from instrumentation import INSTRUMENTATION
+
+    args = build_parser().parse_args(argv)
+    try:
+        with invalid_input():
+            configure_logging(level=args.log_level, jsonl_path=args.log_jsonl)
+            if args.instrument is not None:
+                INSTRUMENTATION.configure(args.instrument)
+        status = args.handler(args)
+    except UsageError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    finally:
+        shutdown_logging()
+    report = INSTRUMENTATION.write_report(args.instrument_report, command=args.command, argv=list(argv) if argv is not None else sys.argv[1:])
+    if report is None and INSTRUMENTATION.enabled:
+        print(json.dumps(INSTRUMENTATION.snapshot(), indent=2), file=sys.stderr)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
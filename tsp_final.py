@@ -1,66 +1,40 @@
-from asyncio import run, sleep
 import asyncio
-from typing import List
-import networkx as nx
-import numpy as np
-import matplotlib.pyplot as plt
-from itertools import permutations
-from datetime import timedelta
-from custom_exception import MechanicalError
-from node import*
-from spaceship_node import SpaceshipNode
-from scenarios import Scenarios
-import pandas  as pd
-
-from tsp_utils import TspUtils
-
-# Assuming the classes are already defined as provided in the question
+from concurrent.futures import ProcessPoolExecutor
+import os
+import time
+from typing import Callable, Dict, List, Optional, Tuple
 
-# Step 1: Create instances of planets with static boost station forces in 'Scenarios'class
+import pandas as pd
 
+from event_log import configure_logging, shutdown_logging
+from feasibility import FeasibilityEngine
+from instrumentation import INSTRUMENTATION, phase
+from node import BasePlanetNode
+from results_store import ResultsStore
+from scenarios import Scenarios
+from ship_physics import ShipPhysics
+from spaceship_node import SpaceshipNode
+from tsp_cache import CacheStats, TspCache
+from tsp_render import TspRenderer
+from tsp_utils import TspUtils
 
-extreme_boosters_planet_list: List[BasePlanetNode] = Scenarios.construct_planets_with_boosters(boosters=Scenarios.super_boosters_extreme())
-advanced_boosters_planet_list: List[BasePlanetNode] = Scenarios.construct_planets_with_boosters(boosters=Scenarios.super_boosters_realistic())
-minimal_boosters_planet_list: List[BasePlanetNode] = Scenarios.construct_planets_with_boosters(boosters=Scenarios.super_boosters_minimal())
-
-# Step 2: Create instances of spaceships with static data in 'Scenarios' class
-spaceship_list: List[SpaceshipNode] = Scenarios.construct_spaceships(spaceshipData=Scenarios.spaceshipData())
+# Importing this module runs nothing: `python tsp_final.py` runs the full three-scenario
+# report (TSP_WORKERS caps the process pool, TSP_CACHE_DIR moves the cache, TSP_RENDER_DIR
+# writes the tours as PNG files instead of opening windows, TSP_INSTRUMENT and
+# TSP_INSTRUMENT_REPORT time the phases, TSP_LOG_LEVEL and TSP_LOG_JSONL write the physics
+# and solver events to a JSON Lines file, TSP_RESULTS_DIR appends every solve and feasibility
+# cube to a columnar `ResultsStore`), and `python -m tsp_cli` runs single steps
+# (feasibility, solve, rank, render).
 
-# Step 3: Create DataFrames to store spaceship capabilities for each booster scenario
-spaceships_capable_of_travelling_in_extreme_boosters_planet_list = pd.DataFrame(
-    columns=[planet.name for planet in extreme_boosters_planet_list]
-)
-spaceships_capable_of_travelling_in_advanced_boosters_planet_list = pd.DataFrame(
-    columns=[planet.name for planet in advanced_boosters_planet_list]
-)
-spaceships_capable_of_travelling_in_minimal_boosters_planet_list = pd.DataFrame(
-    columns=[planet.name for planet in minimal_boosters_planet_list]
-)
 
-def spaceship_capability_comparaison(dataFrame: pd.DataFrame, planetList: List[BasePlanetNode])-> pd.DataFrame:
+def spaceship_capability_comparaison(planetList: List[BasePlanetNode], spaceship_list: List[SpaceshipNode], scenario: str = "default", store: Optional[ResultsStore] = None)-> pd.DataFrame:
     """_summary_
     conduct analysis before journey to define which ships are best suited for space travel
     """
-    i=0
-    while i <=(len(spaceship_list)-1):
-        testResult:List=[]
-        j = 0
-        while j <=(len(extreme_boosters_planet_list)-1):
-            try:
-                spaceship_list[i].get_time_needed_to_cross_the_atmosphere_of_planet(planet= planetList[j])
-                spaceship_list[i].get_time_needed_to_land_on_the_planet_from_its_atmosphere(planet= planetList[j])
-                testResult.append(True)
-                j+=1
-               
-
-            except MechanicalError as e:    
-                testResult.append(False)
-                j+=1
-            except Exception as f:
-                print(f)
-                
-        dataFrame.loc[spaceship_list[i].name]=testResult
-        i+=1
+    report = FeasibilityEngine.evaluate_planet_list(spaceships=spaceship_list, planet_list=planetList)
+    if store is not None:
+        store.append_feasibility(report, scenarios=[scenario])
+    dataFrame = report.to_dataframe(scenario="default")
         
     print(dataFrame)
     print('\n')     
@@ -81,49 +55,149 @@ def get_list_of_safe_spaceships(dataFrame: pd.DataFrame) -> pd.DataFrame:
 
 
     
-async def main():
-   
-    print("\n ##### 🔥 Simulated Mecanical Report 🔥 ########")  
-    print("\n ######################################### With Extreme Boosters!! 🚀💥🔥")
-    extreme_boost_reliable_ships=spaceship_capability_comparaison(dataFrame=spaceships_capable_of_travelling_in_extreme_boosters_planet_list,planetList=extreme_boosters_planet_list)
-   
-    print("\n ######################################### With Advanced Boosters: 🚀✨⚡")
-    advanced_boost_reliable_ships=spaceship_capability_comparaison(dataFrame=spaceships_capable_of_travelling_in_advanced_boosters_planet_list,planetList=advanced_boosters_planet_list)
-    
-    print("\n ######################################### With Minimal Boosters: 🚀🌱")
-    minimal_boost_reliable_ships=spaceship_capability_comparaison(dataFrame=spaceships_capable_of_travelling_in_minimal_boosters_planet_list,planetList=minimal_boosters_planet_list,)
-    
-    print("scenario EXTREME 1 -------------------------------")
-    fastest_ship=TspUtils.construct_brute_force_algorithm(
-        chosen_planet_list=extreme_boosters_planet_list,
-        reliable_ships=extreme_boost_reliable_ships,
-        global_ship_list= spaceship_list,
-        starting_node="Earth"
-        )
-    TspUtils.show_graph(bruit_force_result=fastest_ship,)
-    print("scenario EXTREME 1 complete ... starting new simulation ⌛⌛⌛")
-    await sleep(delay=1)
-    print("scenario Advanced 2 -------------------------------")
-    fastest_ship2=TspUtils.construct_brute_force_algorithm(
-        chosen_planet_list=advanced_boosters_planet_list,
-        reliable_ships=advanced_boost_reliable_ships,
-        global_ship_list= spaceship_list,
-        starting_node="Earth"
-        )
-    TspUtils.show_graph(bruit_force_result=fastest_ship2,)
-    print("scenario Advanced 2 complete ... starting new simulation ⌛⌛⌛")
-    await sleep(delay=1)
-    
-    print("scenario Minimal 3 -------------------------------")
-    fastest_ship3=TspUtils.construct_brute_force_algorithm(
-        chosen_planet_list=minimal_boosters_planet_list,
-        reliable_ships=minimal_boost_reliable_ships,
-        global_ship_list= spaceship_list,
-        starting_node="Earth"
-        )
-    TspUtils.show_graph(bruit_force_result=fastest_ship3,)
-    print("scenario Advanced 2 complete ... starting new simulation")
-    
-    
-   
-asyncio.run(main())
\ No newline at end of file
+def solve_ship(scenario: str, planet_list: List[BasePlanetNode], spaceship: ShipPhysics, starting_node: str, cache_dir: Optional[str]) -> Tuple[str, tuple, CacheStats, Dict, float]:
+    """
+    One (scenario, ship) brute-force solve, run in a worker process on the ship's
+    immutable `ShipPhysics`, which is all the physics and the cache key depend on.
+    Workers share the on-disk tier of the cache, so finished jobs are reused across runs.
+    The job's instrumentation snapshot and its runtime in seconds are sent back to the parent.
+    """
+    started = time.perf_counter()
+    # a forked worker starts with a copy of the parent's measurements
+    INSTRUMENTATION.reset()
+    formatted_planet_list = TspUtils.format_planet_list_from_starting_node(planet_list=list(planet_list), starting_node=starting_node)
+    cache = TspCache(cache_dir=cache_dir)
+    result = cache.tsp(formatted_planet_list=formatted_planet_list, spaceship=spaceship, shipName=spaceship.name, solver_name="brute_force")
+    return scenario, result, cache.stats, INSTRUMENTATION.snapshot() if INSTRUMENTATION.enabled else {}, time.perf_counter() - started
+
+
+async def report_results(queue: asyncio.Queue, jobs_per_scenario: Dict[str, int], render: Optional[Callable[[str, tuple], None]]) -> Dict[str, tuple]:
+    """_summary_
+    Consumer stage: prints results as they arrive and, once every ship of a scenario is
+    done, prints its ranking and renders the fastest ship. Returns the fastest result per scenario.
+    """
+    remaining = dict(jobs_per_scenario)
+    results: Dict[str, list] = {scenario: [] for scenario in jobs_per_scenario}
+    fastest: Dict[str, tuple] = {}
+    while True:
+        item = await queue.get()
+        if item is None:
+            return fastest
+        scenario, result = item
+        remaining[scenario] -= 1
+        if isinstance(result, Exception):
+            print(f"❌ {scenario}: {result}")
+        else:
+            print(f"✅ {scenario}: {result[-1]}")
+            results[scenario].append(result)
+        if remaining[scenario] == 0 and results[scenario]:
+            print(f"############################################## 👨‍🚀!! TSP analysis result: {scenario} !!👨‍🚀##############################################")
+            sorted_list = sorted(results[scenario], key=lambda x: x[2].total_seconds(), reverse=True)
+            for ranked in sorted_list:
+                print(f"\n{ranked[-1]}\n")
+            fastest[scenario] = sorted_list[-1]
+            if render is not None:
+                render(scenario, fastest[scenario])
+
+
+async def main(max_workers: Optional[int] = None, render: bool = True, render_dir: Optional[str] = None, results_dir: Optional[str] = None) -> Dict[str, tuple]:
+    """
+    Every (scenario, reliable ship) solve is submitted to a process pool at once and the
+    results are handed to the reporting stage as they complete, so the run takes about as
+    long as the slowest job instead of the sum of all of them.
+    With `render_dir` the fastest tours are written there as PNG files by a background
+    `TspRenderer` while the remaining solves run; otherwise `render` opens a window per scenario
+    once every solve is done, since `plt.show()` blocks and must not stall the event loop.
+    With `results_dir` the feasibility cubes and every solve are appended to a `ResultsStore`.
+    """
+    # Step 1: Create instances of planets with static boost station forces in 'Scenarios'class
+    with phase("planets"):
+        scenarios: Dict[str, List[BasePlanetNode]] = {
+            "EXTREME 1": Scenarios.construct_planets_with_boosters(boosters=Scenarios.super_boosters_extreme()),
+            "Advanced 2": Scenarios.construct_planets_with_boosters(boosters=Scenarios.super_boosters_realistic()),
+            "Minimal 3": Scenarios.construct_planets_with_boosters(boosters=Scenarios.super_boosters_minimal()),
+        }
+
+    # Step 2: Create instances of spaceships with static data in 'Scenarios' class
+    spaceship_list: List[SpaceshipNode] = Scenarios.construct_spaceships(spaceshipData=Scenarios.spaceshipData())
+
+    # time matrices and tours of unchanged scenarios are read back from here on the next run
+    cache_dir = os.environ.get("TSP_CACHE_DIR", ".tsp_cache")
+    store = ResultsStore(results_dir) if results_dir is not None else None
+
+    print("\n ##### 🔥 Simulated Mecanical Report 🔥 ########")
+    reliable_ships: Dict[str, pd.DataFrame] = {}
+    for scenario, planet_list in scenarios.items():
+        print(f"\n ######################################### {scenario} 🚀")
+        reliable_ships[scenario] = spaceship_capability_comparaison(planetList=planet_list, spaceship_list=spaceship_list, scenario=scenario, store=store)
+
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    jobs_per_scenario = {scenario: len(reliable.index) for scenario, reliable in reliable_ships.items()}
+    renderer = TspRenderer(render_dir) if render_dir is not None else None
+    rendered = []
+    # windows block until closed and need the main thread: they are shown after the solves
+    windows: List[Tuple[tuple, Dict[str, float]]] = []
+
+    def render_tour(scenario: str, result: tuple) -> None:
+        distances = {planet.name: planet.distance_from_the_sun for planet in scenarios[scenario]}
+        if renderer is not None:
+            rendered.append(renderer.submit(result, name=f"{scenario} {result[0]}", distances=distances))
+        else:
+            windows.append((result, distances))
+
+    consumer = asyncio.create_task(report_results(queue, jobs_per_scenario, render_tour if render or renderer is not None else None))
+    cache_stats = CacheStats()
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+
+        async def run_job(scenario: str, spaceship: SpaceshipNode):
+            try:
+                return await loop.run_in_executor(executor, solve_ship, scenario, scenarios[scenario], spaceship.physics, "Earth", cache_dir)
+            except Exception as e:
+                return scenario, e, None, {}, 0.0
+
+        jobs = [
+            run_job(scenario, TspUtils.check_ship_is_valid(ship_name=name, ship_list=spaceship_list))
+            for scenario, reliable in reliable_ships.items()
+            for name in reliable.index
+        ]
+        print(f"processing ⏳... {len(jobs)} solves on up to {max_workers or os.cpu_count()} workers")
+        for finished in asyncio.as_completed(jobs):
+            scenario, result, stats, measurements, runtime_s = await finished
+            INSTRUMENTATION.merge(measurements)
+            if store is not None and not isinstance(result, Exception):
+                store.append_solve(scenario, result, solver="brute_force", runtime_s=runtime_s)
+            if stats is not None:
+                for counter in ("memory_hits", "disk_hits", "misses", "evictions"):
+                    setattr(cache_stats, counter, getattr(cache_stats, counter) + getattr(stats, counter))
+            await queue.put((scenario, result))
+        await queue.put(None)
+        fastest = await consumer
+
+    if renderer is not None:
+        renderer.close()
+        for future in rendered:
+            print(f"tour 🖼️: {future.result()}")
+    for result, distances in windows:
+        TspUtils.show_graph(bruit_force_result=result, distances=distances)
+    for scenario in scenarios:
+        if scenario not in fastest:
+            print(f"{scenario}: no ship can make the journey")
+    print(f"cache 🗄️: {cache_stats}")
+    if store is not None:
+        store.close()
+        print(f"results 🗃️: {store.directory}")
+    report = INSTRUMENTATION.write_report(command="tsp_final")
+    if report is not None:
+        print(f"instrumentation 📈: {report}")
+    return fastest
+
+
+if __name__ == "__main__":
+    workers = os.environ.get("TSP_WORKERS")
+    configure_logging()
+    try:
+        asyncio.run(main(max_workers=int(workers) if workers else None, render_dir=os.environ.get("TSP_RENDER_DIR"), results_dir=os.environ.get("TSP_RESULTS_DIR")))
+    finally:
+        shutdown_logging()
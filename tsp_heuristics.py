@@ -0,0 +1,523 @@
+from abc import ABC
+from collections import deque
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from instrumentation import instrumented
+from node import BasePlanetNode
+from tsp_utils import TspUtils
+
+
+INSERTION_NEIGHBOURS = 16
+"""
+neighbour list width of the insertion constructions in `heuristic_order`
+"""
+
+
+class TspHeuristics(ABC):
+    """_summary_
+    Construction + local-search heuristics for planet sets far beyond what the exact
+    solvers can handle. Every move keeps track of leg direction, so asymmetric matrices
+    such as the `build_time_matrix` output are handled exactly.
+
+    Tours are open NumPy index arrays (the closing leg back to the first node is implied)
+    until `tsp_heuristic` formats them from node 0.
+    """
+
+    CONSTRUCTIONS = ("nearest_neighbour", "cheapest_insertion", "farthest_insertion")
+    IMPROVEMENTS = ("two_opt", "or_opt", "three_opt")
+
+    ########################### neighbour lists
+    @staticmethod
+    def neighbour_lists(matrix: np.ndarray, k: int = 8, incoming: bool = False, block_rows: int = 1024, sample_size: int = 1024) -> np.ndarray:
+        """
+        (n, k) array of each node's k cheapest successors (or predecessors when `incoming`),
+        cheapest first, ties in node order. Rows are processed in blocks to bound temporary memory.
+
+        Nothing is partitioned at full width: the k-th cheapest of about `sample_size` evenly
+        spaced columns bounds the row's k cheapest from above, so one comparison pass over the
+        block keeps about k * n / sample_size candidates per row, and only those are sorted.
+        Rows left with fewer than k candidates (NaN entries) are sorted in full.
+        """
+        n = matrix.shape[0]
+        k = max(1, min(k, n - 1))
+        neighbours = np.empty((n, k), dtype=np.intp)
+        step = max(1, n // sample_size)
+        for start in range(0, n, block_rows):
+            stop = min(n, start + block_rows)
+            size = stop - start
+            nodes = np.arange(start, stop)
+            probe = np.array(matrix[::step, start:stop].T if incoming else matrix[start:stop, ::step], dtype=np.float64, order="C")
+            sampled_self = nodes % step == 0
+            probe[np.flatnonzero(sampled_self), nodes[sampled_self] // step] = np.inf
+            if probe.shape[1] > k:
+                threshold = np.partition(probe, k - 1, axis=1)[:, k - 1]
+            else:
+                threshold = np.full(size, np.inf)
+
+            if incoming:
+                mask = matrix[:, start:stop] <= threshold[None, :]
+                mask[nodes, np.arange(size)] = False
+                other, row = np.divmod(np.flatnonzero(mask), size)
+                # group by row, keeping the candidates of a row in node order
+                grouped = np.argsort(row, kind="stable")
+                row, other = row[grouped], other[grouped]
+                values = matrix[other, row + start]
+            else:
+                mask = matrix[start:stop] <= threshold[:, None]
+                mask[np.arange(size), nodes] = False
+                row, other = np.divmod(np.flatnonzero(mask), n)
+                values = matrix[row + start, other]
+
+            counts = np.bincount(row, minlength=size)
+            width = max(int(counts.max(initial=0)), k)
+            slot = np.arange(len(row)) - (np.cumsum(counts) - counts)[row]
+            candidates = np.full((size, width), np.inf)
+            candidates[row, slot] = values
+            candidate_nodes = np.zeros((size, width), dtype=np.intp)
+            candidate_nodes[row, slot] = other
+            ranked = np.argsort(candidates, axis=1, kind="stable")[:, :k]
+            neighbours[start:stop] = np.take_along_axis(candidate_nodes, ranked, axis=1)
+
+            for i in np.flatnonzero(counts < k):
+                node = start + int(i)
+                full = np.array(matrix[:, node] if incoming else matrix[node], dtype=np.float64)
+                ranked_row = np.argsort(np.where(np.isnan(full), np.inf, full), kind="stable")
+                neighbours[node] = ranked_row[ranked_row != node][:k]
+        return neighbours
+
+    @staticmethod
+    def tour_cost(matrix: np.ndarray, order: np.ndarray) -> float:
+        order = np.asarray(order)
+        return float(matrix[order, np.roll(order, -1)].sum())
+
+    ########################### constructions
+    @staticmethod
+    def nearest_neighbour(matrix: np.ndarray, start: int = 0) -> np.ndarray:
+        n = matrix.shape[0]
+        order = np.empty(n, dtype=np.intp)
+        visited = np.zeros(n, dtype=bool)
+        current = start
+        for position in range(n):
+            order[position] = current
+            visited[current] = True
+            if position == n - 1:
+                break
+            row = np.where(visited, np.inf, matrix[current])
+            current = int(np.argmin(row))
+        return order
+
+    @staticmethod
+    def _insertion(
+        matrix: np.ndarray,
+        start: int,
+        farthest: bool,
+        neighbour_count: int,
+        neighbours: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+    ) -> np.ndarray:
+        n = matrix.shape[0]
+        if n < 3:
+            return np.arange(n, dtype=np.intp)
+        succ = np.full(n, -1, dtype=np.intp)
+        pred = np.full(n, -1, dtype=np.intp)
+        in_tour = np.zeros(n, dtype=bool)
+        rows = np.arange(n)
+        if neighbours is None:
+            neighbours = (
+                TspHeuristics.neighbour_lists(matrix, k=neighbour_count),
+                TspHeuristics.neighbour_lists(matrix, k=neighbour_count, incoming=True),
+            )
+        successors, predecessors = (lists[:, :neighbour_count] for lists in neighbours)
+        # cheapest leg leaving each node: matrix[k, j] >= row_floor[k] for every j != k, so a
+        # column entry is only read when even that floor could beat what the node has already
+        row_floor = matrix[rows, successors[:, 0]]
+
+        # with infinite legs inf - inf gives NaN insertion costs: expected, not worth a warning
+        with np.errstate(invalid="ignore"):
+            # start from the cheapest 2-cycle through `start`
+            others = np.flatnonzero(rows != start)
+            partner = int(others[np.argmin(matrix[start, others] + matrix[others, start])])
+            succ[start], succ[partner] = partner, start
+            pred[start], pred[partner] = partner, start
+            in_tour[[start, partner]] = True
+            tour_nodes = [start, partner]
+
+            # best insertion edge (by its tail) and cost for every node outside the tour
+            tails = np.array(tour_nodes)
+            heads = succ[tails]
+            insertion = matrix[tails].T + matrix[:, heads] - matrix[tails, heads][None, :]
+            best_index = np.argmin(insertion, axis=1)
+            best_tail = tails[best_index]
+            best_cost = insertion[rows, best_index]
+            distance_to_tour = np.minimum(matrix[tails].min(axis=0), matrix[:, tails].min(axis=1))
+
+            def rescan(stale: np.ndarray) -> None:
+                # edges leaving a tour predecessor of the node, or entering a tour successor of it
+                candidate_tails = np.concatenate((predecessors[stale], pred[successors[stale]]), axis=1)
+                valid = np.concatenate((in_tour[predecessors[stale]], in_tour[successors[stale]]), axis=1)
+                candidate_heads = succ[candidate_tails]
+                costs = matrix[candidate_tails, stale[:, None]] + matrix[stale[:, None], candidate_heads] - matrix[candidate_tails, candidate_heads]
+                costs = np.where(valid & np.isfinite(costs), costs, np.inf)
+                index = np.argmin(costs, axis=1)
+                found = np.isfinite(costs[np.arange(len(stale)), index])
+                best_tail[stale] = np.where(found, candidate_tails[np.arange(len(stale)), index], pred[start])
+                best_cost[stale] = np.where(
+                    found,
+                    costs[np.arange(len(stale)), index],
+                    matrix[pred[start], stale] + matrix[stale, start] - matrix[pred[start], start],
+                )
+                # nodes with no finite candidate are appended (inserted before `start`) unless a
+                # new edge does better; nodes with no neighbour in the tour yet are far from it,
+                # they pick up the new edges below, and the edges around their neighbours once
+                # those are inserted
+
+            outside = np.flatnonzero(~in_tour)
+            for _ in range(n - 2):
+                if farthest:
+                    node = int(outside[np.argmax(distance_to_tour[outside])])
+                else:
+                    node = int(outside[np.argmin(best_cost[outside])])
+                tail = int(best_tail[node])
+                head = int(succ[tail])
+                succ[tail], succ[node] = node, head
+                pred[head], pred[node] = node, tail
+                in_tour[node] = True
+                tour_nodes.append(node)
+
+                outside = np.flatnonzero(~in_tour)
+                if len(outside) == 0:
+                    break
+                if farthest:
+                    distance = np.minimum(distance_to_tour[outside], matrix[node, outside])
+                    closer = row_floor[outside] < distance
+                    distance[closer] = np.minimum(distance[closer], matrix[outside[closer], node])
+                    distance_to_tour[outside] = distance
+                # nodes whose best edge (tail -> head) disappeared are rescanned
+                stale = outside[best_tail[outside] == tail]
+                if len(stale):
+                    rescan(stale)
+                # the two new edges tail -> node and node -> head
+                for new_tail in (tail, node):
+                    new_head = succ[new_tail]
+                    leaving = matrix[new_tail, outside]
+                    keep = leaving + row_floor[outside] - matrix[new_tail, new_head] <= best_cost[outside]
+                    candidates = outside[keep]
+                    costs = leaving[keep] + matrix[candidates, new_head] - matrix[new_tail, new_head]
+                    better = costs < best_cost[candidates]
+                    best_cost[candidates[better]] = costs[better]
+                    best_tail[candidates[better]] = new_tail
+
+        order = np.empty(n, dtype=np.intp)
+        current = start
+        for position in range(n):
+            order[position] = current
+            current = succ[current]
+        return order
+
+    @staticmethod
+    def cheapest_insertion(
+        matrix: np.ndarray,
+        start: int = 0,
+        neighbour_count: int = INSERTION_NEIGHBOURS,
+        neighbours: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+    ) -> np.ndarray:
+        """
+        Repeatedly inserts the node with the cheapest c(i,k) + c(k,j) - c(i,j) insertion.
+        New tour edges are checked against every outside node, reading the matrix column
+        only for nodes the edge could still improve; when a node's best edge is split, only
+        edges next to its `neighbour_count` nearest planets are rescanned, so this is the
+        neighbour-list variant used for large planet sets. Precomputed (successor, predecessor)
+        `neighbours` lists at least `neighbour_count` wide are used instead of building them.
+        """
+        return TspHeuristics._insertion(matrix, start, farthest=False, neighbour_count=neighbour_count, neighbours=neighbours)
+
+    @staticmethod
+    def farthest_insertion(
+        matrix: np.ndarray,
+        start: int = 0,
+        neighbour_count: int = INSERTION_NEIGHBOURS,
+        neighbours: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+    ) -> np.ndarray:
+        """
+        Repeatedly inserts the node farthest from the tour at its cheapest position,
+        tracked the same way as `cheapest_insertion`.
+        """
+        return TspHeuristics._insertion(matrix, start, farthest=True, neighbour_count=neighbour_count, neighbours=neighbours)
+
+    ########################### improvements
+    @staticmethod
+    def _dont_look_queue(order: np.ndarray, active_nodes: Optional[Sequence[int]]) -> Tuple[deque, np.ndarray]:
+        """
+        Queue of nodes whose don't-look bit is cleared, and the matching membership mask.
+        """
+        queued = np.zeros(len(order), dtype=bool)
+        active = deque(order.tolist() if active_nodes is None else dict.fromkeys(int(node) for node in active_nodes))
+        queued[list(active)] = True
+        return active, queued
+
+    @staticmethod
+    def two_opt(
+        matrix: np.ndarray,
+        order: np.ndarray,
+        neighbours: np.ndarray,
+        max_moves: Optional[int] = None,
+        active_nodes: Optional[Sequence[int]] = None,
+    ) -> np.ndarray:
+        """
+        2-opt with neighbour lists and don't-look bits. Reversing a segment flips the direction
+        of its legs, so the forward and backward cost of every segment is read from prefix sums.
+        After a move only the legs of the reversed segment are read again from the matrix; the
+        sums after it shift by a constant. Only `active_nodes` start with their bit cleared when
+        given (all nodes otherwise).
+        """
+        order = np.array(order, dtype=np.intp)
+        n = len(order)
+        if n < 4:
+            return order
+        position = np.empty(n, dtype=np.intp)
+        position[order] = np.arange(n)
+
+        def prefix_sums() -> Tuple[np.ndarray, np.ndarray]:
+            nxt = np.roll(order, -1)
+            forward = np.concatenate(([0.0], np.cumsum(matrix[order, nxt])))
+            backward = np.concatenate(([0.0], np.cumsum(matrix[nxt, order])))
+            return forward, backward
+
+        def update_prefix_sums(first: int, last: int) -> None:
+            # legs first-1 .. last changed (first >= 1, no wrap): rebuild their sums, shift the rest
+            legs = order[first - 1:last + 2] if last + 1 < n else np.append(order[first - 1:], order[0])
+            for prefix, costs in ((forward, matrix[legs[:-1], legs[1:]]), (backward, matrix[legs[1:], legs[:-1]])):
+                shift = prefix[first - 1] + costs.sum() - prefix[last + 1]
+                prefix[first:last + 2] = prefix[first - 1] + np.cumsum(costs)
+                prefix[last + 2:] += shift
+
+        def segment(prefix: np.ndarray, first: int, last: int) -> float:
+            # legs inside the cyclic segment first..last (positions), in one direction
+            if first <= last:
+                return prefix[last] - prefix[first]
+            return prefix[n] - prefix[first] + prefix[last]
+
+        forward, backward = prefix_sums()
+        active, queued = TspHeuristics._dont_look_queue(order, active_nodes)
+        moves = 0
+        while active and (max_moves is None or moves < max_moves):
+            a = active.popleft()
+            queued[a] = False
+            improved = False
+            for variant in (0, 1):
+                for c in neighbours[a]:
+                    if variant == 0:
+                        # new leg a -> c with a = o[i], c = o[j]
+                        i, j = position[a], position[c]
+                    else:
+                        # new leg a -> c with a = o[i+1], c = o[j+1]
+                        i, j = (position[a] - 1) % n, (position[c] - 1) % n
+                    if j == i or j == (i + 1) % n:
+                        continue
+                    oi, oi1, oj, oj1 = order[i], order[(i + 1) % n], order[j], order[(j + 1) % n]
+                    first, last = (i + 1) % n, j
+                    delta = (
+                        matrix[oi, oj] + matrix[oi1, oj1] - matrix[oi, oi1] - matrix[oj, oj1]
+                        + segment(backward, first, last) - segment(forward, first, last)
+                    )
+                    if delta < -1e-9 * max(1.0, abs(forward[n])):
+                        if 0 < first <= last:
+                            order[first:last + 1] = order[first:last + 1][::-1].copy()
+                            position[order[first:last + 1]] = np.arange(first, last + 1)
+                            update_prefix_sums(first, last)
+                        else:
+                            # the segment wraps around (or starts the array): every position moves
+                            order = np.roll(order, -first)
+                            length = (last - first) % n + 1
+                            order[:length] = order[:length][::-1].copy()
+                            position[order] = np.arange(n)
+                            forward, backward = prefix_sums()
+                        for node in (oi, oi1, oj, oj1):
+                            if not queued[node]:
+                                queued[node] = True
+                                active.append(node)
+                        improved = True
+                        moves += 1
+                        break
+                if improved:
+                    break
+        return order
+
+    @staticmethod
+    def _exchange_segments(order: np.ndarray, i: int, j: int, k: int) -> np.ndarray:
+        """
+        Orientation-preserving 3-opt move: ... o[i] | A = o[i+1..j] | B = o[j+1..k] | o[k+1] ...
+        becomes ... o[i] B A o[k+1] ... (positions cyclic, offsets from i increasing).
+        """
+        n = len(order)
+        rolled = np.roll(order, -(i + 1))
+        length_a = (j - i) % n
+        length_b = (k - j) % n
+        return np.concatenate((rolled[length_a:length_a + length_b], rolled[:length_a], rolled[length_a + length_b:]))
+
+    @staticmethod
+    def three_opt(
+        matrix: np.ndarray,
+        order: np.ndarray,
+        neighbours: np.ndarray,
+        incoming_neighbours: np.ndarray,
+        max_segment: Optional[int] = None,
+        max_moves: Optional[int] = None,
+        active_nodes: Optional[Sequence[int]] = None,
+    ) -> np.ndarray:
+        """
+        Segment-exchange 3-opt (the variant that keeps every leg's direction) with neighbour
+        lists and don't-look bits. The new legs o[i] -> o[j+1] and o[k] -> o[i+1] are drawn
+        from the successor and predecessor lists. `max_segment` requires one of the two
+        exchanged segments to be at most that long; 1 to 3 gives Or-opt.
+        Only `active_nodes` start with their bit cleared when given (all nodes otherwise).
+        """
+        order = np.array(order, dtype=np.intp)
+        n = len(order)
+        if n < 4:
+            return order
+        position = np.empty(n, dtype=np.intp)
+        position[order] = np.arange(n)
+        active, queued = TspHeuristics._dont_look_queue(order, active_nodes)
+        moves = 0
+        while active and (max_moves is None or moves < max_moves):
+            a = active.popleft()
+            queued[a] = False
+            i = position[a]
+            oi1 = order[(i + 1) % n]
+            move = None
+            for c in neighbours[a]:
+                j = (position[c] - 1) % n
+                offset_j = (j - i) % n
+                if offset_j == 0:
+                    continue
+                oj, oj1 = order[j], c
+                gain_first = matrix[a, oi1] + matrix[oj, oj1] - matrix[a, oj1]
+                if not gain_first > 0:
+                    continue
+                for ok in incoming_neighbours[oi1]:
+                    k = position[ok]
+                    offset_k = (k - i) % n
+                    if offset_k <= offset_j:
+                        continue
+                    if max_segment is not None and offset_j > max_segment and offset_k - offset_j > max_segment:
+                        continue
+                    ok1 = order[(k + 1) % n]
+                    delta = matrix[ok, oi1] + matrix[oj, ok1] - matrix[ok, ok1] - gain_first
+                    if delta < -1e-9 * max(1.0, abs(matrix[a, oi1])):
+                        move = (i, j, k, (a, oi1, oj, oj1, ok, ok1))
+                        break
+                if move is not None:
+                    break
+            if move is None:
+                continue
+            i, j, k, touched = move
+            order = TspHeuristics._exchange_segments(order, i, j, k)
+            position[order] = np.arange(n)
+            for node in touched:
+                if not queued[node]:
+                    queued[node] = True
+                    active.append(node)
+            moves += 1
+        return order
+
+    @staticmethod
+    def or_opt(
+        matrix: np.ndarray,
+        order: np.ndarray,
+        neighbours: np.ndarray,
+        incoming_neighbours: np.ndarray,
+        max_moves: Optional[int] = None,
+        active_nodes: Optional[Sequence[int]] = None,
+    ) -> np.ndarray:
+        """
+        Or-opt: relocates segments of 1 to 3 planets without reversing them.
+        """
+        return TspHeuristics.three_opt(
+            matrix, order, neighbours, incoming_neighbours, max_segment=3, max_moves=max_moves, active_nodes=active_nodes,
+        )
+
+    ########################### driver
+    @staticmethod
+    @instrumented("solve")
+    def heuristic_order(
+        time_metrix: np.ndarray,
+        construction: str = "nearest_neighbour",
+        improvements: Sequence[str] = ("two_opt", "or_opt"),
+        neighbour_count: int = 8,
+        rounds: int = 3,
+    ) -> Tuple[float, List[int]]:
+        """
+        Builds a tour with `construction` then applies `improvements` in turn, repeating
+        until a round brings no gain (at most `rounds` times).
+
+        Returns:
+            Tuple[float, List[int]]: the tour cost in seconds and the closed tour from node 0.
+        """
+        if construction not in TspHeuristics.CONSTRUCTIONS:
+            raise ValueError(f"unknown construction {construction}, expected one of {TspHeuristics.CONSTRUCTIONS}")
+        unknown = set(improvements) - set(TspHeuristics.IMPROVEMENTS)
+        if unknown:
+            raise ValueError(f"unknown improvements {sorted(unknown)}, expected any of {TspHeuristics.IMPROVEMENTS}")
+        matrix = np.asarray(time_metrix, dtype=np.float64)
+        n = matrix.shape[0]
+        if n < 2:
+            return (float(matrix[0, 0]) if n else 0.0), [0, 0]
+
+        if construction == "nearest_neighbour":
+            order = TspHeuristics.nearest_neighbour(matrix, start=0)
+            lists = None
+        else:
+            # the lists are ranked (cost, node), so the insertion lists' first columns are the
+            # improvement lists: both directions are built once, as wide as either needs
+            width = max(neighbour_count, INSERTION_NEIGHBOURS)
+            lists = (TspHeuristics.neighbour_lists(matrix, k=width), TspHeuristics.neighbour_lists(matrix, k=width, incoming=True))
+            order = getattr(TspHeuristics, construction)(matrix, start=0, neighbour_count=INSERTION_NEIGHBOURS, neighbours=lists)
+        if improvements:
+            if lists is not None:
+                successors, predecessors = (side[:, :neighbour_count] for side in lists)
+            else:
+                successors = TspHeuristics.neighbour_lists(matrix, k=neighbour_count)
+                predecessors = TspHeuristics.neighbour_lists(matrix, k=neighbour_count, incoming=True) if set(improvements) & {"or_opt", "three_opt"} else None
+            cost = TspHeuristics.tour_cost(matrix, order)
+            for _ in range(rounds):
+                for improvement in improvements:
+                    if improvement == "two_opt":
+                        order = TspHeuristics.two_opt(matrix, order, successors)
+                    else:
+                        order = getattr(TspHeuristics, improvement)(matrix, order, successors, predecessors)
+                new_cost = TspHeuristics.tour_cost(matrix, order)
+                if not new_cost < cost:
+                    break
+                cost = new_cost
+
+        order = np.roll(order, -int(np.flatnonzero(order == 0)[0])).tolist()
+        tour = order + [0]
+        return TspHeuristics.tour_cost(matrix, np.array(order)), tour
+
+    @staticmethod
+    def tsp_heuristic(
+        time_metrix: np.ndarray,
+        formatted_planet_list: List[BasePlanetNode],
+        shipName: str,
+        construction: str = "nearest_neighbour",
+        improvements: Sequence[str] = ("two_opt", "or_opt"),
+        neighbour_count: int = 8,
+    ):
+        """
+        Same inputs and (shipName, legs, tour_time, summary) output as `TspUtils.tsp_brute_force`,
+        so `show_graph` and `construct_brute_force_algorithm` keep working, but not guaranteed optimal.
+        """
+        _, tour = TspHeuristics.heuristic_order(
+            time_metrix=time_metrix,
+            construction=construction,
+            improvements=improvements,
+            neighbour_count=neighbour_count,
+        )
+        return TspUtils.format_tour_result(
+            time_metrix=time_metrix,
+            formatted_planet_list=formatted_planet_list,
+            shipName=shipName,
+            tour_order=tour,
+        )
@@ -0,0 +1,174 @@
+import asyncio
+from abc import ABC
+from dataclasses import dataclass
+import math
+import time
+from typing import AsyncIterator, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from instrumentation import instrumented
+from node import BasePlanetNode
+from tsp_heuristics import TspHeuristics
+from tsp_utils import TspUtils
+
+
+@dataclass(frozen=True)
+class Incumbent:
+    tour: Tuple[int, ...]
+    """
+    closed tour order starting and ending at node 0
+    """
+    cost: float
+    """
+    tour time in seconds
+    """
+    elapsed_s: float
+    iteration: int
+
+
+class TspMetaheuristics(ABC):
+    """_summary_
+    Anytime iterated local search with simulated-annealing acceptance.
+    A double-bridge kick (which keeps every leg's direction) is followed by 2-opt / Or-opt
+    around the kicked edges; worse tours are accepted with probability exp(-delta / T).
+    The search runs until a wall-clock deadline and streams every improved incumbent,
+    so callers get a good tour within a fixed latency instead of a proven optimum.
+    """
+
+    @staticmethod
+    def _double_bridge(order: np.ndarray, rng: np.random.Generator) -> Tuple[np.ndarray, List[int]]:
+        """
+        A B C D -> A C B D, returns the new order and the nodes around the three cuts.
+        """
+        n = len(order)
+        cuts = np.sort(rng.choice(np.arange(1, n), size=3, replace=False))
+        first, second, third = (int(cut) for cut in cuts)
+        new_order = np.concatenate((order[:first], order[second:third], order[first:second], order[third:]))
+        touched = [order[cut - 1] for cut in cuts] + [order[cut] for cut in cuts] + [order[-1], order[0]]
+        return new_order, touched
+
+    @staticmethod
+    def _closed_from_zero(order: np.ndarray) -> Tuple[int, ...]:
+        start = int(np.flatnonzero(order == 0)[0])
+        return tuple(int(node) for node in np.roll(order, -start)) + (0,)
+
+    @staticmethod
+    def _search(
+        time_metrix: np.ndarray,
+        deadline_s: float,
+        seed: Optional[int],
+        initial_temperature: Optional[float],
+        cooling: float,
+        neighbour_count: int,
+    ) -> Iterator[Optional[Incumbent]]:
+        """
+        Yields an Incumbent whenever the best tour improves and None after every other
+        iteration, so async callers get a cancellation point per iteration.
+        """
+        started = time.perf_counter()
+        matrix = np.asarray(time_metrix, dtype=np.float64)
+        n = matrix.shape[0]
+        best_cost, best_tour = TspHeuristics.heuristic_order(matrix, neighbour_count=neighbour_count)
+        iteration = 0
+        yield Incumbent(tour=tuple(best_tour), cost=best_cost, elapsed_s=time.perf_counter() - started, iteration=iteration)
+        if n < 5:
+            return
+
+        rng = np.random.default_rng(seed)
+        successors = TspHeuristics.neighbour_lists(matrix, k=neighbour_count)
+        predecessors = TspHeuristics.neighbour_lists(matrix, k=neighbour_count, incoming=True)
+        current = np.array(best_tour[:-1], dtype=np.intp)
+        current_cost = best_cost
+        temperature = initial_temperature if initial_temperature is not None else 0.05 * best_cost / n
+
+        while time.perf_counter() - started < deadline_s:
+            iteration += 1
+            candidate, touched = TspMetaheuristics._double_bridge(current, rng)
+            candidate = TspHeuristics.two_opt(matrix, candidate, successors, active_nodes=touched)
+            candidate = TspHeuristics.or_opt(matrix, candidate, successors, predecessors, active_nodes=touched)
+            candidate_cost = TspHeuristics.tour_cost(matrix, candidate)
+
+            delta = candidate_cost - current_cost
+            if delta < 0 or (temperature > 0 and rng.random() < math.exp(-delta / temperature)):
+                current, current_cost = candidate, candidate_cost
+            temperature *= cooling
+
+            # ignore float noise from summing the same cycle in another rotation
+            if current_cost < best_cost - 1e-12 * abs(best_cost):
+                best_cost = current_cost
+                yield Incumbent(
+                    tour=TspMetaheuristics._closed_from_zero(current),
+                    cost=best_cost,
+                    elapsed_s=time.perf_counter() - started,
+                    iteration=iteration,
+                )
+            else:
+                yield None
+
+    @staticmethod
+    def iterate(
+        time_metrix: np.ndarray,
+        deadline_s: float = 2.0,
+        seed: Optional[int] = None,
+        initial_temperature: Optional[float] = None,
+        cooling: float = 0.995,
+        neighbour_count: int = 8,
+    ) -> Iterator[Incumbent]:
+        """
+        Generator of improving incumbents (cost in seconds, elapsed time) until `deadline_s`
+        seconds have passed; the first one is the NN + 2-opt + Or-opt starting tour.
+        Closing the generator stops the search.
+        """
+        for incumbent in TspMetaheuristics._search(time_metrix, deadline_s, seed, initial_temperature, cooling, neighbour_count):
+            if incumbent is not None:
+                yield incumbent
+
+    @staticmethod
+    async def iterate_async(
+        time_metrix: np.ndarray,
+        deadline_s: float = 2.0,
+        seed: Optional[int] = None,
+        initial_temperature: Optional[float] = None,
+        cooling: float = 0.995,
+        neighbour_count: int = 8,
+        cancel_event: Optional[asyncio.Event] = None,
+    ) -> AsyncIterator[Incumbent]:
+        """
+        Async version of `iterate` for the `asyncio` loop in `tsp_final.main`.
+        It yields control to the loop after every iteration, so cancelling the consuming task
+        or setting `cancel_event` stops the search within one iteration.
+        """
+        search = TspMetaheuristics._search(time_metrix, deadline_s, seed, initial_temperature, cooling, neighbour_count)
+        try:
+            for incumbent in search:
+                if incumbent is not None:
+                    yield incumbent
+                await asyncio.sleep(0)
+                if cancel_event is not None and cancel_event.is_set():
+                    return
+        finally:
+            search.close()
+
+    @staticmethod
+    @instrumented("solve")
+    def tsp_anytime(
+        time_metrix: np.ndarray,
+        formatted_planet_list: List[BasePlanetNode],
+        shipName: str,
+        deadline_s: float = 2.0,
+        seed: Optional[int] = None,
+    ):
+        """
+        Runs `iterate` to its deadline and returns the best tour as the usual
+        (shipName, legs, tour_time, summary) tuple.
+        """
+        best = None
+        for best in TspMetaheuristics.iterate(time_metrix=time_metrix, deadline_s=deadline_s, seed=seed):
+            pass
+        return TspUtils.format_tour_result(
+            time_metrix=time_metrix,
+            formatted_planet_list=formatted_planet_list,
+            shipName=shipName,
+            tour_order=best.tour,
+        )
@@ -0,0 +1,172 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+import math
+import os
+import re
+import threading
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from instrumentation import instrumented
+
+FILE_FORMATS = ("png", "svg")
+
+_layout_cache: Dict[Tuple[Tuple[str, float], ...], Dict[str, Tuple[float, float]]] = {}
+_layout_lock = threading.Lock()
+
+
+class TspRenderer:
+    """_summary_
+    Headless tour rendering: draws solver results with matplotlib's Agg canvas (no window,
+    no pyplot state) and writes PNG or SVG files from a background thread, so plotting
+    overlaps with solving instead of blocking on `plt.show()`.
+
+    Nodes are placed by `layout`, which is deterministic: the same planet set always gets
+    the same picture, and files are byte-for-byte reproducible. Edges are drawn as one
+    vectorised quiver instead of one patch per edge; node and edge labels are only drawn
+    up to `label_limit` nodes, which keeps 1000-node tours fast.
+    """
+
+    def __init__(self, output_dir: str, file_format: str = "png", dpi: int = 100, label_limit: int = 40, max_workers: int = 1):
+        """
+        Raises:
+            ValueError: for a file format other than png or svg.
+        """
+        if file_format not in FILE_FORMATS:
+            raise ValueError(f"unsupported image format {file_format}, expected one of {FILE_FORMATS}")
+        self.output_dir = output_dir
+        self.file_format = file_format
+        self.dpi = dpi
+        self.label_limit = label_limit
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tsp-render")
+
+    def __enter__(self) -> "TspRenderer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Waits for the queued renders to finish.
+        """
+        self._executor.shutdown(wait=True)
+
+    @staticmethod
+    def file_name(name: str, file_format: str) -> str:
+        return f"{re.sub(r'[^A-Za-z0-9._-]+', '_', name).strip('_') or 'tour'}.{file_format}"
+
+    @staticmethod
+    def duration_label(cost) -> str:
+        """
+        Edge label of a leg cost (timedelta or float seconds): hours under two days,
+        days above, e.g. "7.45 hours" or "3.12 days". Legs take hours to days, so years
+        would print as 0.00.
+        """
+        seconds = cost.total_seconds() if hasattr(cost, "total_seconds") else float(cost)
+        if seconds < 2 * 24 * 3600:
+            return f"{seconds / 3600:.2f} hours"
+        return f"{seconds / (24 * 3600):.2f} days"
+
+    @staticmethod
+    def layout(names: Sequence[str], distances: Optional[Mapping[str, float]] = None) -> Dict[str, Tuple[float, float]]:
+        """
+        Node positions on the unit disc, O(n) and cached per planet set.
+
+        With `distances` (distance_from_the_sun per name) bodies sit on a spiral ordered by
+        that distance: the radius grows with the log of the distance and the angle with the
+        rank, so the sun is in the middle, the orbits keep their order and the inner planets
+        are not squeezed together.
+        Without it the nodes are spread on a circle in the order given.
+        """
+        if distances is None:
+            key = tuple((name, float(i)) for i, name in enumerate(names))
+        else:
+            key = tuple(sorted(((name, float(distances[name])) for name in set(names)), key=lambda item: (item[1], item[0])))
+        with _layout_lock:
+            cached = _layout_cache.get(key)
+        if cached is not None:
+            return cached
+
+        n = max(len(key), 1)
+        values = np.array([value for _, value in key], dtype=np.float64)
+        angles = np.pi / 2 - 2 * np.pi * np.arange(len(key)) / n
+        if distances is None:
+            radii = np.ones(len(key))
+        else:
+            scaled = np.log1p(values - values.min()) if len(key) else values
+            top = scaled.max() if len(key) else 0.0
+            radii = 0.15 + 0.85 * (scaled / top if top > 0 else np.ones(len(key)))
+        positions = {name: (float(r * math.cos(a)), float(r * math.sin(a))) for (name, _), r, a in zip(key, radii, angles)}
+        with _layout_lock:
+            _layout_cache[key] = positions
+        return positions
+
+    @staticmethod
+    def draw(result: Tuple[str, List[Dict], object, str], distances: Optional[Mapping[str, float]] = None, dpi: int = 100, label_limit: int = 40):
+        """
+        Draws one (shipName, legs, tour_time, summary) result on a new matplotlib Figure
+        attached to an Agg canvas; nothing touches pyplot, so it is safe off the main thread.
+        """
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        legs = result[-3]
+        names = list(dict.fromkeys(leg["source"] for leg in legs))
+        positions = TspRenderer.layout(names, distances)
+        xy = np.array([positions[name] for name in names]).reshape(-1, 2)
+        start = np.array([positions[leg["source"]] for leg in legs]).reshape(-1, 2)
+        end = np.array([positions[leg["destination"]] for leg in legs]).reshape(-1, 2)
+        labels = len(names) <= label_limit
+
+        figure = Figure(figsize=(10, 10), dpi=dpi)
+        FigureCanvasAgg(figure)
+        axes = figure.add_subplot()
+        axes.set_title(f"fastest ship :: name {result[0]}")
+        figure.text(0.5, 0.04, f"Making a Hamiltonian cycle in {result[-1]}", ha="center", va="center", fontsize=12 if labels else 8, wrap=True)
+        axes.quiver(
+            start[:, 0], start[:, 1], end[:, 0] - start[:, 0], end[:, 1] - start[:, 1],
+            angles="xy", scale_units="xy", scale=1, color="green", width=0.002, headwidth=6, headlength=8, zorder=1,
+        )
+        axes.scatter(xy[:, 0], xy[:, 1], s=1000 if labels else 20, c="lightblue", zorder=2)
+        if labels:
+            for name, (x, y) in zip(names, xy):
+                axes.annotate(name, (x, y), ha="center", va="center", fontsize=10, fontweight="bold", zorder=3)
+            for leg, a, b in zip(legs, start, end):
+                axes.annotate(TspRenderer.duration_label(leg["cost"]), (a + b) / 2, ha="center", va="center", color="red", fontsize=8, zorder=3)
+        axes.set_xlim(-1.15, 1.15)
+        axes.set_ylim(-1.15, 1.15)
+        axes.set_aspect("equal")
+        axes.axis("off")
+        return figure
+
+    @staticmethod
+    @instrumented("render")
+    def render(result: Tuple[str, List[Dict], object, str], path: str, distances: Optional[Mapping[str, float]] = None, dpi: int = 100, label_limit: int = 40) -> str:
+        """
+        Draws `result` and writes it to `path` (format from the extension). Returns `path`.
+        """
+        from matplotlib import rc_context
+
+        figure = TspRenderer.draw(result, distances, dpi, label_limit)
+        file_format = os.path.splitext(path)[1].lstrip(".").lower()
+        # no timestamps or random ids, so the same tour always gives the same bytes
+        metadata = {"Date": None} if file_format == "svg" else {"Software": None}
+        with rc_context({"svg.hashsalt": "space_travel_TSP"}):
+            figure.savefig(path, format=file_format, metadata=metadata)
+        return path
+
+    def submit(self, result: Tuple[str, List[Dict], object, str], name: Optional[str] = None, distances: Optional[Mapping[str, float]] = None) -> "Future[str]":
+        """
+        Queues one render; the future holds the written path. `name` defaults to the ship name.
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, TspRenderer.file_name(name or result[0], self.file_format))
+        return self._executor.submit(TspRenderer.render, result, path, distances, self.dpi, self.label_limit)
+
+    def render_all(self, results: Iterable[Tuple[str, Tuple[str, List[Dict], object, str]]], distances: Optional[Mapping[str, float]] = None) -> List[str]:
+        """
+        Renders every (name, result) pair in one pass and returns the written paths in order.
+        """
+        futures = [self.submit(result, name=name, distances=distances) for name, result in results]
+        return [future.result() for future in futures]
@@ -0,0 +1,123 @@
+from abc import ABC
+from functools import partial
+import heapq
+from itertools import count
+from typing import Callable, FrozenSet, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from custom_exception import NoTourError
+from instrumentation import instrumented
+from node import BasePlanetNode
+from tsp_utils import TspUtils
+
+Edge = Tuple[int, int]
+
+
+class TspTopK(ABC):
+    """_summary_
+    k cheapest Hamiltonian cycles from node 0, in increasing cost order, using Lawler's
+    partitioning (as in Murty's ranking of assignments) on top of an exact solver.
+
+    Each popped tour e_1..e_n spawns sub-problems "e_1..e_{t-1} forced, e_t forbidden", which
+    split the remaining tours of its parent without overlap. Only the best
+    k - (tours already output) candidates are kept, so memory grows with k, not with n!.
+    """
+
+    @staticmethod
+    def constrained_matrix(matrix: np.ndarray, forced: Sequence[Edge], forbidden: FrozenSet[Edge]) -> np.ndarray:
+        """
+        Copy of `matrix` where forbidden legs and legs competing with a forced one are np.inf.
+        """
+        constrained = np.array(matrix, dtype=np.float64)
+        for source, destination in forbidden:
+            constrained[source, destination] = np.inf
+        for source, destination in forced:
+            keep = constrained[source, destination]
+            constrained[source, :] = np.inf
+            constrained[:, destination] = np.inf
+            constrained[source, destination] = keep
+        return constrained
+
+    @staticmethod
+    @instrumented("solve")
+    def k_best_orders(
+        time_metrix: np.ndarray,
+        k: int,
+        solver: Optional[Callable[[np.ndarray], Tuple[float, List[int]]]] = None,
+    ) -> List[Tuple[float, List[int]]]:
+        """
+        Args:
+            time_metrix (np.ndarray): n x n matrix of seconds.
+            k (int): number of tours wanted; fewer come back when fewer cycles exist.
+            solver (Callable): exact solver mapping a matrix (np.inf = forbidden) to
+                (cost, closed tour from 0), float64 Held-Karp by default. A sub-problem
+                without a tour returns an infinite cost or raises NoTourError.
+
+        Returns:
+            List[Tuple[float, List[int]]]: (cost in seconds, closed tour) cheapest first.
+
+        Raises:
+            ValueError: for more than `TspUtils.HELD_KARP_MAX_NODES` nodes with the default solver.
+        """
+        matrix = np.asarray(time_metrix, dtype=np.float64)
+        if solver is None:
+            # checked once here: inside the search, only a missing tour may drop a sub-problem
+            if matrix.shape[0] > TspUtils.HELD_KARP_MAX_NODES:
+                raise ValueError(f"Held-Karp supports at most {TspUtils.HELD_KARP_MAX_NODES} nodes but got {matrix.shape[0]}, pass a solver for larger matrices")
+            solver = partial(TspUtils.held_karp_order, cost_dtype=np.float64)
+        tie_breaker = count()
+
+        def solve(forced: Tuple[Edge, ...], forbidden: FrozenSet[Edge]):
+            try:
+                cost, tour = solver(TspTopK.constrained_matrix(matrix, forced, forbidden))
+            except NoTourError:
+                return None
+            if not np.isfinite(cost):
+                return None
+            # re-price on the original matrix, the constrained copy only steers the search
+            cost = float(sum(matrix[tour[i], tour[i + 1]] for i in range(len(tour) - 1)))
+            return (cost, next(tie_breaker), tour, forced, forbidden)
+
+        results: List[Tuple[float, List[int]]] = []
+        root = solve((), frozenset())
+        candidates = [root] if root is not None and k > 0 else []
+        while candidates and len(results) < k:
+            cost, _, tour, forced, forbidden = heapq.heappop(candidates)
+            results.append((cost, tour))
+
+            forced_set = set(forced)
+            free_edges = [edge for edge in zip(tour[:-1], tour[1:]) if edge not in forced_set]
+            prefix: Tuple[Edge, ...] = forced
+            for edge in free_edges:
+                child = solve(prefix, forbidden | {edge})
+                if child is not None:
+                    heapq.heappush(candidates, child)
+                prefix = prefix + (edge,)
+
+            remaining = k - len(results)
+            if len(candidates) > remaining:
+                candidates = heapq.nsmallest(remaining, candidates)
+                heapq.heapify(candidates)
+        return results
+
+    @staticmethod
+    def tsp_top_k(
+        time_metrix: np.ndarray,
+        formatted_planet_list: List[BasePlanetNode],
+        shipName: str,
+        k: int = 3,
+    ) -> List[tuple]:
+        """
+        The k best alternative tours for a ship, each as the usual
+        (shipName, legs, tour_time, summary) tuple, fastest first.
+        """
+        return [
+            TspUtils.format_tour_result(
+                time_metrix=time_metrix,
+                formatted_planet_list=formatted_planet_list,
+                shipName=shipName,
+                tour_order=tour,
+            )
+            for _, tour in TspTopK.k_best_orders(time_metrix=time_metrix, k=k)
+        ]
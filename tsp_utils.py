@@ -1,81 +1,478 @@
 from abc import ABC
+from concurrent.futures import ProcessPoolExecutor
 from datetime import timedelta
-from itertools import permutations
-from typing import Dict, List, Tuple
-from matplotlib import pyplot as plt
+from itertools import islice, permutations
+import math
+import os
+import shutil
+import tempfile
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple, Union
 import numpy as np
-import pandas as pd
+from custom_exception import MechanicalError, NoTourError
+from event_log import event, get_logger
+from fleet import Fleet
+from instrumentation import INSTRUMENTATION, count, instrumented
+from mission import Mission
 from node import BasePlanetNode
+from physics_kernel import PhysicsKernel
+from ship_physics import ShipPhysics
 from spaceship_node import SpaceshipNode
-import networkx as nx
+
+if TYPE_CHECKING:
+    # pandas, matplotlib and networkx are only imported by the code paths that use them
+    import pandas as pd
+
+logger = get_logger("solve")
+
+_shared_time_matrix: np.ndarray = None
+"""
+time matrix installed once per worker process by `_install_shared_time_matrix`
+"""
+
+
+def _install_shared_time_matrix(time_matrix: np.ndarray) -> None:
+    global _shared_time_matrix
+    _shared_time_matrix = time_matrix
+
+
+def _brute_force_shard(prefix: Tuple[int, ...], chunk_size: int) -> Tuple[float, Tuple[int, ...], int]:
+    """
+    Scores every tour starting with `prefix` (which starts at node 0) against the shared
+    time matrix, `chunk_size` permutations at a time, and returns the shard's best
+    (cost, closed tour) and the number of tours scored, which the parent process adds to
+    the `permutations_scored` counter. Ties keep the lexicographically first tour; a shard
+    whose tours are all infinite returns (inf, ()).
+    """
+    matrix = _shared_time_matrix
+    n = matrix.shape[0]
+    prefix_cost = sum(matrix[prefix[i]][prefix[i + 1]] for i in range(len(prefix) - 1))
+    remaining = [node for node in range(n) if node not in prefix]
+    if not remaining:
+        return prefix_cost + matrix[prefix[-1]][0], prefix + (0,), 1
+
+    best_cost, best_tail, scored = np.inf, None, 0
+    tails = permutations(remaining)
+    while True:
+        chunk = np.array(list(islice(tails, chunk_size)), dtype=np.intp)
+        if len(chunk) == 0:
+            break
+        scored += len(chunk)
+        costs = matrix[prefix[-1], chunk[:, 0]] + matrix[chunk[:, -1], 0]
+        for i in range(chunk.shape[1] - 1):
+            costs += matrix[chunk[:, i], chunk[:, i + 1]]
+        best = int(np.argmin(costs))
+        if costs[best] < best_cost:
+            best_cost, best_tail = float(costs[best]), tuple(int(node) for node in chunk[best])
+    if best_tail is None:
+        return np.inf, (), scored
+    return prefix_cost + best_cost, prefix + best_tail + (0,), scored
 
 
 class TspUtils(ABC):
+    HELD_KARP_MAX_NODES = 32
+    """
+    subsets of the n - 1 inner nodes are uint32 bitmasks
+    """
+
     # brute force
     @staticmethod
+    @instrumented("build_time_matrix")
     def build_time_matrix(formatted_planet_list:List[BasePlanetNode], spaceship:SpaceshipNode,)-> np.ndarray:
         
+        if TspUtils.has_separable_cost_model(spaceship):
+            time_tensor, infeasible = TspUtils.build_time_tensor(formatted_planet_list=formatted_planet_list, spaceships=[spaceship])
+            if infeasible.any():
+                i, j = np.argwhere(infeasible[0])[0]
+                raise MechanicalError(f"The spaceship '{spaceship.name}' cannot travel from {formatted_planet_list[i].name} to {formatted_planet_list[j].name}")
+            return time_tensor[0]
+
         n= len(formatted_planet_list)
+        count("matrix_cells", n * n)
         time_matrix = np.zeros((n,n))
         for i in range(n): 
             for j in range(n):
-                time_matrix[i][j]=spaceship.calculate_total_journey_time_from_planetA_to_planetB(planetA=formatted_planet_list[i],planetB= formatted_planet_list[j]).total_seconds()    
+                time_matrix[i][j]=spaceship.calculate_total_journey_seconds_from_planetA_to_planetB(planetA=formatted_planet_list[i],planetB= formatted_planet_list[j])    
         return time_matrix
-    
+
+    @staticmethod
+    def build_time_tensor(formatted_planet_list: List[BasePlanetNode], spaceships: Sequence[SpaceshipNode]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Batched `build_time_matrix` for a whole fleet.
+
+        Exit times, landing times and pairwise distances are each computed once as
+        broadcast arrays, so there is no per-cell Python call.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: a (ships, n, n) float64 tensor of seconds, where
+            tensor[s] drops straight into the solvers, and a boolean mask of the same shape
+            marking infeasible legs (those entries are np.inf).
+        """
+        boost, altitude, distance, gravity = PhysicsKernel.planet_columns(formatted_planet_list)
+        mass, thrust, friction = PhysicsKernel.fleet_columns(spaceships, formatted_planet_list)
+        exit_seconds, landing_seconds = PhysicsKernel.exit_and_landing_seconds(
+            mass=mass, thrust=thrust, friction=friction, boost=boost, altitude=altitude, gravity=gravity,
+        )
+        scale = PhysicsKernel.travel_time_scale(mass=mass, thrust=thrust)
+        gaps = np.sqrt(np.abs(distance[:, None] - distance[None, :]))
+
+        time_tensor = exit_seconds[:, :, None] + scale[:, None, None] * gaps[None, :, :] + landing_seconds[:, None, :]
+        infeasible = np.isinf(exit_seconds)[:, :, None] | np.isinf(landing_seconds)[:, None, :]
+        if INSTRUMENTATION.enabled:
+            count("matrix_cells", time_tensor.size)
+            count("infeasible_legs", int(infeasible.sum()))
+        return time_tensor, infeasible
+
     @staticmethod
     def check_ship_is_valid(ship_name:str, ship_list:list[SpaceshipNode])->SpaceshipNode:
-      
-        res : SpaceshipNode = None
-        for i in range(len(ship_list)):
-            if ship_name == ship_list[i].name: 
-                res = ship_list[i]
-        if res == None:
-           raise TypeError(f"ship {ship_name} is not a known ship name")
-        else :
-            return res    
+        """
+        Finds a ship by name: O(1) when `ship_list` is a `fleet.Fleet`, otherwise a scan
+        that stops at the first match.
+        """
+        if isinstance(ship_list, Fleet):
+            if ship_name not in ship_list:
+                raise TypeError(f"ship {ship_name} is not a known ship name")
+            return ship_list[ship_name]
+        for ship in ship_list:
+            if ship_name == ship.name:
+                return ship
+        raise TypeError(f"ship {ship_name} is not a known ship name")
     
     @staticmethod
-    def tsp_brute_force(time_metrix: np.ndarray,formatted_planet_list : List[BasePlanetNode], shipName:str,):
-        
-        best_tour_order: List[int]=[]
-        number_of_planets: int= len(formatted_planet_list) 
-        node_edges: List[timedelta] = None
-        tour_time:timedelta = timedelta.max
+    @instrumented("solve")
+    def brute_force_order(time_metrix: np.ndarray) -> Tuple[float, List[int]]:
+        """
+        Scores every tour from index 0 and returns (cost in seconds, closed tour order),
+        (inf, []) when every tour uses a forbidden leg.
+        """
+        best_tour_order: Tuple[int, ...] = ()
+        number_of_planets: int = len(time_metrix)
+        tour_seconds: float = math.inf
+        # plain float seconds in the hot loop, timedelta only when formatting the result
+        matrix: List[List[float]] = np.asarray(time_metrix, dtype=np.float64).tolist()
         
-        for perm in permutations(range(number_of_planets)):
-            total_time= timedelta()
-            test_edges=[]
-            
+        # the tour starts and ends at index 0, only the order of the other planets varies
+        for rest in permutations(range(1, number_of_planets)):
+            perm = (0,) + rest
+            total_seconds = matrix[perm[-1]][0]
             for i in range(number_of_planets-1):
-                total_time += timedelta(time_metrix[perm[i]][perm[i+1]])
-                test_edges.append(timedelta(time_metrix[perm[i]][perm[i+1]]))
-            total_time+= timedelta((time_metrix[perm[-1]][perm[0]]))
-            test_edges.append(timedelta(time_metrix[perm[-1]][perm[0]]))
+                total_seconds += matrix[perm[i]][perm[i+1]]
             
-            if total_time < tour_time:
-                tour_time = total_time
-                node_edges= test_edges
+            if total_seconds < tour_seconds:
+                tour_seconds = total_seconds
                 best_tour_order = perm + (0,)
-        formatted_best_tour_output= []
-        for i in range(len(best_tour_order)-1):
-            if i == (len(best_tour_order)-2):
-                break 
-            formatted_best_tour_output.append({
-                "source":formatted_planet_list[i].name,
-                "destination" : formatted_planet_list[i+1].name,
-                "cost": node_edges[i]  
+        count("permutations_scored", math.factorial(max(number_of_planets - 1, 0)))
+        return tour_seconds, list(best_tour_order)
+
+    @staticmethod
+    def tsp_brute_force(time_metrix: np.ndarray,formatted_planet_list : List[BasePlanetNode], shipName:str,):
+        
+        _, best_tour_order = TspUtils.brute_force_order(time_metrix)
+        return TspUtils.format_tour_result(
+            time_metrix=time_metrix,
+            formatted_planet_list=formatted_planet_list,
+            shipName=shipName,
+            tour_order=best_tour_order,
+        )
+        
+    @staticmethod
+    @instrumented("solve")
+    def tsp_brute_force_parallel(
+        time_metrix: np.ndarray,
+        formatted_planet_list: List[BasePlanetNode],
+        shipName: str,
+        max_workers: Optional[int] = None,
+        chunk_size: int = 50_000,
+        prefix_length: int = 2,
+    ):
+        """
+        Exhaustive oracle like `tsp_brute_force`, sharded over a process pool.
+
+        The start node is fixed at index 0 and the remaining (n-1)! orders are split by their
+        next `prefix_length` nodes into shards. Each worker receives the time matrix once,
+        scores its shard in vectorised chunks of `chunk_size` permutations and returns only
+        its local best. Shards are merged in prefix order with ties broken on the tour, so
+        the result does not depend on the worker count or completion order.
+
+        Returns the same (shipName, legs, tour_time, summary) tuple as `tsp_brute_force`.
+
+        Raises:
+            NoTourError: when every tour uses a forbidden leg.
+        """
+        matrix = np.ascontiguousarray(time_metrix, dtype=np.float64)
+        n = matrix.shape[0]
+        prefix_length = max(0, min(prefix_length, n - 2))
+        prefixes = [(0,) + tail for tail in permutations(range(1, n), prefix_length)]
+
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_install_shared_time_matrix, initargs=(matrix,)) as executor:
+            shard_results = list(executor.map(_brute_force_shard, prefixes, [chunk_size] * len(prefixes)))
+
+        count("permutations_scored", sum(scored for _, _, scored in shard_results))
+        _, best_tour = min((cost, tour) for cost, tour, _ in shard_results)
+        return TspUtils.format_tour_result(
+            time_metrix=matrix,
+            formatted_planet_list=formatted_planet_list,
+            shipName=shipName,
+            tour_order=best_tour,
+        )
+
+    @staticmethod
+    def format_tour_result(time_metrix: np.ndarray, formatted_planet_list: List[BasePlanetNode], shipName: str, tour_order: Sequence[int]):
+        """
+        Builds the (shipName, legs, tour_time, summary) tuple returned by every solver
+        from a closed tour order such as (0, 3, 1, 2, 0), reading leg costs in seconds
+        from the time matrix.
+
+        Raises:
+            NoTourError: for an empty tour or one using a forbidden leg, so an infeasible
+                ship never ranks as the fastest.
+        """
+        leg_seconds = [float(time_metrix[tour_order[i]][tour_order[i + 1]]) for i in range(len(tour_order) - 1)]
+        return TspUtils.format_tour_legs(
+            leg_seconds=leg_seconds,
+            formatted_planet_list=formatted_planet_list,
+            shipName=shipName,
+            tour_order=tour_order,
+        )
+
+    @staticmethod
+    def format_tour_legs(leg_seconds: Sequence[float], formatted_planet_list: List[BasePlanetNode], shipName: str, tour_order: Sequence[int]):
+        """
+        Same as `format_tour_result` when the leg costs (in seconds) are already known.
+        Seconds are only converted to timedelta here, at the reporting edge.
+
+        Raises:
+            NoTourError: for an empty tour or one using a forbidden leg.
+        """
+        if len(tour_order) < 2 or not all(math.isfinite(seconds) for seconds in leg_seconds[:len(tour_order) - 1]):
+            raise NoTourError(f"no finite tour for {shipName}: every tour uses a forbidden leg")
+        legs = []
+        total_seconds = 0.0
+        for i in range(len(tour_order) - 1):
+            total_seconds += leg_seconds[i]
+            legs.append({
+                "source": formatted_planet_list[tour_order[i]].name,
+                "destination": formatted_planet_list[tour_order[i + 1]].name,
+                "cost": timedelta(seconds=leg_seconds[i])
             })
-        formatted_best_tour_output.append({
-            "source": formatted_planet_list[-1].name,
-            "destination": formatted_planet_list[0].name,
-            "cost":node_edges[-1]
-        })
+        tour_time = timedelta(seconds=total_seconds)
         return (
             shipName,
-            formatted_best_tour_output,
+            legs,
             tour_time,
-            f"ship name 🛸: {shipName} Best Order 🗺️:: {[formatted_planet_list[i].name for i in best_tour_order]} optimal travel time ⌛: {tour_time}" )
-        
+            f"ship name 🛸: {shipName} Best Order 🗺️:: {[formatted_planet_list[i].name for i in tour_order]} optimal travel time ⌛: {tour_time}" )
+
+    @staticmethod
+    @instrumented("solve")
+    def held_karp_order(
+        time_metrix: np.ndarray,
+        cost_dtype: type = np.float32,
+        chunk_size: int = 1 << 16,
+        spill_dir: Optional[str] = None,
+        spill_threshold_bytes: int = 64 * 1024 * 1024,
+    ) -> Tuple[float, List[int]]:
+        """
+        Exact Held-Karp bitmask dynamic program over a (possibly asymmetric) time matrix.
+
+        The start node is index 0. Subsets of the remaining n-1 nodes are processed layer
+        by layer (by subset size) so only two cost layers live in memory at once; costs are
+        stored as `cost_dtype` and parent pointers as int8.
+
+        Args:
+            time_metrix (np.ndarray): n x n matrix of travel times in seconds, np.inf for forbidden legs.
+            cost_dtype (type): dtype of the DP cost table, float32 keeps 20-25 nodes in RAM.
+            chunk_size (int): number of subsets relaxed per vectorised step, bounds temporary memory.
+            spill_dir (str): when set, parent layers larger than `spill_threshold_bytes` are
+                written to memory-mapped files in this directory instead of RAM.
+            spill_threshold_bytes (int): size above which a parent layer is spilled to disk.
+
+        Returns:
+            Tuple[float, List[int]]: the optimal tour cost in seconds (recomputed in float64)
+            and the closed tour order starting and ending at 0.
+
+        Raises:
+            ValueError: for more than `HELD_KARP_MAX_NODES` nodes.
+            NoTourError: when every tour uses a forbidden leg.
+        """
+        matrix = np.asarray(time_metrix, dtype=np.float64)
+        n = matrix.shape[0]
+        if n < 2:
+            return 0.0, [0, 0]
+        if n > TspUtils.HELD_KARP_MAX_NODES:
+            raise ValueError(f"Held-Karp supports at most {TspUtils.HELD_KARP_MAX_NODES} nodes but got {n}, use a heuristic solver instead")
+
+        m = n - 1  # nodes 1..n-1 are encoded as bits 0..m-1
+        cost = matrix.astype(cost_dtype)
+        inner = cost[1:, 1:]
+        # a parent is one of the m <= 31 inner nodes
+        parent_dtype = np.int8
+
+        all_masks = np.arange(1 << m, dtype=np.uint32)
+        popcount = np.zeros(all_masks.shape, dtype=np.uint8)
+        for bit in range(m):
+            popcount += ((all_masks >> bit) & 1).astype(np.uint8)
+        order = np.argsort(popcount, kind="stable")
+        layer_bounds = np.searchsorted(popcount[order], np.arange(m + 2))
+        sorted_masks = all_masks[order]
+        del all_masks, popcount, order
+
+        spill_tmp = None
+        if spill_dir is not None:
+            os.makedirs(spill_dir, exist_ok=True)
+            spill_tmp = tempfile.mkdtemp(prefix="held_karp_", dir=spill_dir)
+
+        parents: List[np.ndarray] = [None] * (m + 1)
+        previous_masks = None
+        previous_cost = None
+        try:
+            for size in range(1, m + 1):
+                masks = sorted_masks[layer_bounds[size]:layer_bounds[size + 1]]
+                layer_cost = np.full((len(masks), m), np.inf, dtype=cost_dtype)
+                layer_bytes = len(masks) * m * np.dtype(parent_dtype).itemsize
+                if spill_tmp is not None and layer_bytes > spill_threshold_bytes:
+                    layer_parent = np.lib.format.open_memmap(
+                        os.path.join(spill_tmp, f"parent_{size}.npy"), mode="w+", dtype=parent_dtype, shape=(len(masks), m))
+                    layer_parent[:] = -1
+                else:
+                    layer_parent = np.full((len(masks), m), -1, dtype=parent_dtype)
+
+                for start in range(0, len(masks), chunk_size):
+                    chunk = masks[start:start + chunk_size]
+                    for j in range(m):
+                        bit = np.uint32(1 << j)
+                        rows = np.nonzero(chunk & bit)[0]
+                        if len(rows) == 0:
+                            continue
+                        if size == 1:
+                            layer_cost[start + rows, j] = cost[0, j + 1]
+                            continue
+                        previous_rows = np.searchsorted(previous_masks, chunk[rows] ^ bit)
+                        candidates = previous_cost[previous_rows] + inner[:, j]
+                        best = np.argmin(candidates, axis=1)
+                        layer_cost[start + rows, j] = candidates[np.arange(len(rows)), best]
+                        layer_parent[start + rows, j] = best
+
+                parents[size] = layer_parent
+                previous_masks, previous_cost = masks, layer_cost
+
+            closing = previous_cost[0] + cost[1:, 0]
+            last = int(np.argmin(closing))
+            if not np.isfinite(closing[last]):
+                raise NoTourError("no Hamiltonian cycle exists with the given time matrix")
+
+            tour = [0]
+            mask = np.uint32((1 << m) - 1)
+            for size in range(m, 0, -1):
+                tour.append(last + 1)
+                masks = sorted_masks[layer_bounds[size]:layer_bounds[size + 1]]
+                previous = int(parents[size][np.searchsorted(masks, mask), last])
+                mask ^= np.uint32(1 << last)
+                last = previous
+            tour.append(0)
+            tour = [0] + tour[1:-1][::-1] + [0]
+        finally:
+            parents.clear()
+            if spill_tmp is not None:
+                shutil.rmtree(spill_tmp, ignore_errors=True)
+
+        total = float(sum(matrix[tour[i]][tour[i + 1]] for i in range(len(tour) - 1)))
+        return total, tour
+
+    @staticmethod
+    def tsp_held_karp(
+        time_metrix: np.ndarray,
+        formatted_planet_list: List[BasePlanetNode],
+        shipName: str,
+        spill_dir: Optional[str] = None,
+    ):
+        """
+        Exact O(n^2 * 2^n) alternative to `tsp_brute_force`, practical up to 20-25 planets.
+        Takes the same inputs and returns the same (shipName, legs, tour_time, summary) tuple.
+        """
+        _, tour = TspUtils.held_karp_order(time_metrix=time_metrix, spill_dir=spill_dir)
+        return TspUtils.format_tour_result(
+            time_metrix=time_metrix,
+            formatted_planet_list=formatted_planet_list,
+            shipName=shipName,
+            tour_order=tour,
+        )
+
+    @staticmethod
+    def line_tour_order(formatted_planet_list: List[BasePlanetNode]) -> List[int]:
+        """
+        Closed tour visiting the planets in order of `distance_from_the_sun`, rotated so it
+        starts and ends at index 0.
+
+        For a cost sqrt(|d_i - d_j|) between points sorted on a line the matrix is a
+        Kalmanson matrix (sqrt is concave and increasing), and the sorted cyclic order is an
+        optimal tour. Ties keep their list order.
+        """
+        distances = np.array([planet.distance_from_the_sun for planet in formatted_planet_list], dtype=np.float64)
+        order = np.argsort(distances, kind="stable").tolist()
+        start = order.index(0)
+        order = order[start:] + order[:start]
+        return order + [0]
+
+    @staticmethod
+    def separable_decomposition(
+        time_metrix: np.ndarray,
+        formatted_planet_list: List[BasePlanetNode],
+        rtol: float = 1e-6,
+    ) -> Optional[Tuple[np.ndarray, np.ndarray, float]]:
+        """
+        Detects whether the matrix follows the SpaceshipNode cost model
+        time[i][j] = exit[i] + scale * sqrt(|d_i - d_j|) + landing[j].
+
+        Returns:
+            Optional[Tuple[np.ndarray, np.ndarray, float]]: (exit, landing, scale) when the matrix
+            matches within `rtol`, None otherwise. Only exit + landing per planet is identifiable,
+            which is all a tour needs since every planet is exited and landed on exactly once.
+        """
+        matrix = np.asarray(time_metrix, dtype=np.float64)
+        if matrix.ndim != 2 or matrix.shape[0] != len(formatted_planet_list) or not np.all(np.isfinite(matrix)):
+            return None
+        distances = np.array([planet.distance_from_the_sun for planet in formatted_planet_list], dtype=np.float64)
+        gaps = np.sqrt(np.abs(distances[:, None] - distances[None, :]))
+
+        diagonal = np.diag(matrix)
+        symmetric_travel = matrix + matrix.T - diagonal[:, None] - diagonal[None, :]
+        denominator = 2.0 * np.sum(gaps * gaps)
+        scale = float(np.sum(symmetric_travel * gaps) / denominator) if denominator > 0 else 0.0
+        if scale < 0:
+            return None
+
+        exit_part = matrix[:, 0] - scale * gaps[:, 0]
+        landing_part = matrix[0, :] - scale * gaps[0, :] - exit_part[0]
+        rebuilt = exit_part[:, None] + landing_part[None, :] + scale * gaps
+        if not np.allclose(rebuilt, matrix, rtol=rtol, atol=rtol * float(np.max(np.abs(matrix), initial=0.0))):
+            return None
+        return exit_part, landing_part, scale
+
+    @staticmethod
+    @instrumented("solve")
+    def tsp_separable(
+        time_metrix: np.ndarray,
+        formatted_planet_list: List[BasePlanetNode],
+        shipName: str,
+        rtol: float = 1e-6,
+    ):
+        """
+        Exact solver for matrices built from the separable SpaceshipNode cost model.
+
+        The exit and landing terms add the same constant (the matrix trace) to every
+        Hamiltonian cycle, so only the symmetric travel term decides the order, and that is
+        solved in O(n log n) by `line_tour_order`. Matrices that do not match the model fall
+        back to `tsp_held_karp`.
+        """
+        if TspUtils.separable_decomposition(time_metrix=time_metrix, formatted_planet_list=formatted_planet_list, rtol=rtol) is None:
+            return TspUtils.tsp_held_karp(time_metrix=time_metrix, formatted_planet_list=formatted_planet_list, shipName=shipName)
+        return TspUtils.format_tour_result(
+            time_metrix=time_metrix,
+            formatted_planet_list=formatted_planet_list,
+            shipName=shipName,
+            tour_order=TspUtils.line_tour_order(formatted_planet_list),
+        )
+
     @staticmethod
     def format_planet_list_from_starting_node(planet_list:List[BasePlanetNode], starting_node:str)-> List[BasePlanetNode]:
         updatedList : List[BasePlanetNode]=[]
@@ -89,25 +486,35 @@ class TspUtils(ABC):
         return updatedList
     
     @staticmethod
-    def construct_brute_force_algorithm(chosen_planet_list:List[BasePlanetNode],reliable_ships: pd.DataFrame, starting_node:str, global_ship_list:List[SpaceshipNode] ):
+    def construct_brute_force_algorithm(chosen_planet_list:List[BasePlanetNode],reliable_ships: "pd.DataFrame", starting_node:str, global_ship_list:List[SpaceshipNode], cache=None, store=None, scenario: str = "default"):
+        """
+        Brute-force solve for every reliable ship and return the fastest result.
+        Pass a `tsp_cache.TspCache` as `cache` to reuse time matrices and tours of unchanged scenarios,
+        and a `results_store.ResultsStore` as `store` to keep every ship's result under `scenario`.
+        """
         results = []
+        formatted_planet_list = TspUtils.format_planet_list_from_starting_node(planet_list=chosen_planet_list,starting_node=starting_node)
         
         for i in reliable_ships.index:
-            print(f"simulating :📈 {i}")
-            print("processing ⏳...")
+            event(logger, "solve.ship_started", f"simulating {i}", ship=i, planets=len(formatted_planet_list))
+            spaceship = TspUtils.check_ship_is_valid(ship_list=global_ship_list, ship_name=i,)
+            started = time.perf_counter()
             
-            results.append(
-                TspUtils.tsp_brute_force(
-                    formatted_planet_list=TspUtils.format_planet_list_from_starting_node(planet_list=chosen_planet_list,starting_node=starting_node),
-                    shipName= i,
-                    time_metrix= TspUtils.build_time_matrix(
-                        formatted_planet_list=TspUtils.format_planet_list_from_starting_node(planet_list=chosen_planet_list,starting_node=starting_node),
-                        spaceship=TspUtils.check_ship_is_valid(
-                            ship_list=global_ship_list,
-                            ship_name=i,),
+            if cache is not None:
+                results.append(cache.tsp(formatted_planet_list=formatted_planet_list, spaceship=spaceship, shipName=i, solver_name="brute_force"))
+            else:
+                results.append(
+                    TspUtils.tsp_brute_force(
+                        formatted_planet_list=formatted_planet_list,
+                        shipName= i,
+                        time_metrix= TspUtils.build_time_matrix(
+                            formatted_planet_list=formatted_planet_list,
+                            spaceship=spaceship,
+                            )
                         )
-                    )
-            )
+                )
+            if store is not None:
+                store.append_solve(scenario, results[-1], solver="brute_force", runtime_s=time.perf_counter() - started)
         print("############################################## 👨‍🚀!! TSP analysis result !!👨‍🚀####################################################TSP#########################")
         
         sorted_list = sorted(results, key=lambda x: x[2].total_seconds(), reverse=True)
@@ -119,7 +526,103 @@ class TspUtils(ABC):
         return fastestShipRes
                     
     @staticmethod
-    def show_graph(bruit_force_result: Tuple[str, Dict, timedelta, str]):
+    def has_separable_cost_model(spaceship: SpaceshipNode) -> bool:
+        """
+        True when the ship uses the stock SpaceshipNode physics, i.e. its legs are
+        exit + scale * sqrt(distance) + landing and the line tour is optimal for it.
+        Subclasses overriding any of the leg computations break that invariance.
+        A `ShipPhysics` snapshot always has the stock physics.
+        """
+        if isinstance(spaceship, ShipPhysics):
+            return True
+        ship_class = type(spaceship)
+        return all(
+            getattr(ship_class, method) is getattr(SpaceshipNode, method)
+            for method in (
+                "get_seconds_needed_to_cross_the_atmosphere_of_planet",
+                "get_seconds_needed_to_land_on_the_planet_from_its_atmosphere",
+                "calculate_the_seconds_needed_to_travel_between_two_planets",
+                "calculate_total_journey_seconds_from_planetA_to_planetB",
+                "get_travel_time_scale",
+            )
+        )
+
+    @staticmethod
+    def score_ship_on_tour(formatted_planet_list: List[BasePlanetNode], tour_order: Sequence[int], spaceship: Union[SpaceshipNode, ShipPhysics], shipName: str):
+        """
+        Scores a ship on a fixed tour in O(n) by flying it as a `Mission`, without building
+        its time matrix.
+        """
+        mission = Mission(spaceship=spaceship)
+        mission.fly_tour(formatted_planet_list, tour_order)
+        return TspUtils.format_tour_legs(
+            leg_seconds=[leg.seconds for leg in mission.legs],
+            formatted_planet_list=formatted_planet_list,
+            shipName=shipName,
+            tour_order=tour_order,
+        )
+
+    @staticmethod
+    def construct_fleet_ranking(chosen_planet_list: List[BasePlanetNode], reliable_ships: "pd.DataFrame", starting_node: str, global_ship_list: List[SpaceshipNode]):
+        """
+        Fleet-wide alternative to `construct_brute_force_algorithm`.
+
+        Under the stock physics every ship shares the same optimal visiting order (the line
+        tour), so the tour is computed once per planet list and each ship is scored in O(n).
+        Ships whose cost model breaks that invariance are solved on their own time matrix
+        with `tsp_held_karp`.
+        """
+        formatted_planet_list = TspUtils.format_planet_list_from_starting_node(planet_list=chosen_planet_list, starting_node=starting_node)
+        shared_tour = TspUtils.line_tour_order(formatted_planet_list)
+        results = []
+
+        for i in reliable_ships.index:
+            event(logger, "rank.ship_started", f"ranking {i}", ship=i, planets=len(formatted_planet_list))
+            spaceship = TspUtils.check_ship_is_valid(ship_list=global_ship_list, ship_name=i)
+            if TspUtils.has_separable_cost_model(spaceship):
+                results.append(TspUtils.score_ship_on_tour(
+                    formatted_planet_list=formatted_planet_list,
+                    tour_order=shared_tour,
+                    spaceship=spaceship,
+                    shipName=i,
+                ))
+            else:
+                event(logger, "rank.custom_cost_model", f"{i} has a custom cost model, solving on its own matrix", ship=i)
+                results.append(TspUtils.tsp_held_karp(
+                    time_metrix=TspUtils.build_time_matrix(formatted_planet_list=formatted_planet_list, spaceship=spaceship),
+                    formatted_planet_list=formatted_planet_list,
+                    shipName=i,
+                ))
+        print("############################################## 👨‍🚀!! TSP fleet ranking !!👨‍🚀####################################################TSP#########################")
+
+        sorted_list = sorted(results, key=lambda x: x[2].total_seconds(), reverse=True)
+        for i in range(len(sorted_list)):
+            print(f"\n{sorted_list[i][-1]}")
+            print("\n")
+        return sorted_list[-1]
+
+    @staticmethod
+    def show_graph(bruit_force_result: Tuple[str, Dict, timedelta, str], output_path: Optional[str] = None, distances: Optional[Dict[str, float]] = None) -> Optional[str]:
+        """
+        Draws the tour of a solver result in a window, or, with `output_path` (.png or .svg),
+        writes it headless through `TspRenderer.render` and returns the path.
+        Nodes are placed by the deterministic `TspRenderer.layout`; `distances`
+        (distance_from_the_sun per planet name) orders them outwards from the sun.
+        """
+        from tsp_render import TspRenderer
+
+        if output_path is not None:
+            return TspRenderer.render(bruit_force_result, output_path, distances)
+        TspUtils._show_window(bruit_force_result, distances)
+        return None
+
+    @staticmethod
+    @instrumented("render")
+    def _show_window(bruit_force_result: Tuple[str, Dict, timedelta, str], distances: Optional[Dict[str, float]]) -> None:
+        from matplotlib import pyplot as plt
+        from tsp_render import TspRenderer
+        import networkx as nx
+
         G = nx.DiGraph()    
         for objects in bruit_force_result[-3]:
             G.add_node(objects["source"])
@@ -127,11 +630,10 @@ class TspUtils(ABC):
    
         for obj in bruit_force_result[-3]:
         
-            total_years = obj["cost"].total_seconds() / (24 * 3600 * 365)
-            G.add_edge(u_of_edge=obj["source"], v_of_edge=obj['destination'], weight=total_years)
+            G.add_edge(u_of_edge=obj["source"], v_of_edge=obj['destination'], weight=obj["cost"].total_seconds())
 
         
-        pos = nx.spring_layout(G)
+        pos = TspRenderer.layout(list(G.nodes), distances)
         plt.figure(figsize=(10, 10))  
         plt.title(f'fastest ship :: name {bruit_force_result[0]}')
         plt.text(0.5, 1.05, f"Making a Hamiltonian cycle in {bruit_force_result[-1]}", 
@@ -153,7 +655,7 @@ class TspUtils(ABC):
         nx.draw_networkx_edge_labels(
             G,
             pos,
-            edge_labels={k: f"{v:.2f} years" for k, v in labels.items()},
+            edge_labels={k: TspRenderer.duration_label(v) for k, v in labels.items()},
             font_color='red',  
         )
 
@@ -19,10 +19,13 @@ def is_valid_dict_of_air_friction_forces(func):
         dict_value= kwargs.get('value',args[0]if len(args)>0 else None)
         if not isinstance(dict_value, dict):
             raise TypeError(f"in function {func.__name__} expected a dictionary with key : str and val :int or float but got {type(dict_value).__name__}")
-        if len(dict_value) != 10:
-            raise TypeError(f"in function {func.__name__} we must have 10 planet names and values but we got {len(dict_value)}")
+        if len(dict_value) == 0:
+            raise TypeError(f"in function {func.__name__} we must have at least one planet name and value but we got none")
+        # any set of bodies is allowed, the planet names come from the catalogue in use
         for key,value in dict_value.items():
-            if key not in {"Sun","Mercury","Earth","Mars","Jupiter","Saturn","Uranus","Neptune","Pluto","Venus" }:
-                raise ValueError(f"in function {func.__name__} we have got an unknown planet {key}")        
+            if not isinstance(key, str):
+                raise TypeError(f"in function {func.__name__} expected planet names as str but got {type(key).__name__}")
+            if isinstance(value, bool) or not isinstance(value, (float, int)):
+                raise TypeError(f"in function {func.__name__} expected an int or float air friction for {key} but got {type(value).__name__}")
         return func(*args, **kwargs)
     return wrapper    
\ No newline at end of file